@@ -0,0 +1,463 @@
+# ✅ backend/api/puzzles.py
+"""
+Read API for base puzzles.
+
+Single puzzles: rendered responses are kept in a bounded LRU/TTL cache keyed by puzzle id
+together with a strong ETag over the body, so a conditional request for a
+cached puzzle is answered with 304 without a database round trip.
+
+Catalogue: GET /puzzles pages with a keyset cursor over (created_at, id)
+and GET /puzzles/export streams every puzzle as NDJSON from a server-side
+cursor, so neither depends on the size of the table. ?kind=content does
+the same for content puzzles, whose export carries their kept cells.
+
+Hints: POST /puzzles/<id>/hint answers from a cache keyed by puzzle,
+occupied mask and placed pieces, so a position many players reach is
+solved once.
+
+Similar: GET /puzzles/<id>/similar ranks every indexed solution of the
+puzzle's size by cell agreement in any orientation (backend/solution_index.py).
+
+Meshes: GET /puzzles/<id>/mesh.glb sends the greedy-meshed GLB of the
+board (backend/mesh.py) straight from its content-addressed cache file.
+"""
+import base64
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime
+
+from flask import Blueprint, Response, jsonify, request, send_file, stream_with_context
+from sqlalchemy import select, tuple_
+
+from backend import metrics
+from backend.board import board_dims, pack_board, solution_dims, solution_from_cells
+from backend.cache import TTLCache
+from backend.db import get_session
+from backend.master_data import registry
+from backend.mesh import mesh_path
+from backend.models.content_puzzle import ContentPuzzle
+from backend.models.content_puzzle_cell import ContentPuzzleCell
+from backend.models.master_base_puzzle import MasterBasePuzzle
+from backend.models.master_base_puzzle_cell import MasterBasePuzzleCell
+from backend.solver.hints import next_hint, parse_placements
+from backend.solver.placements import load_index
+
+bp = Blueprint("puzzles", __name__, url_prefix="/puzzles")
+
+# puzzle id -> (etag, body)
+puzzle_cache = TTLCache(
+    maxsize=int(os.environ.get("PUZZLE_CACHE_SIZE", 1024)),
+    ttl=float(os.environ.get("PUZZLE_CACHE_TTL", 300)),
+)
+# name -> puzzle id
+name_cache = TTLCache(maxsize=puzzle_cache.maxsize, ttl=puzzle_cache.ttl)
+# (puzzle id, occupied mask, placed pieces) -> hint result
+hint_cache = TTLCache(
+    maxsize=int(os.environ.get("HINT_CACHE_SIZE", 4096)),
+    ttl=float(os.environ.get("HINT_CACHE_TTL", 3600)),
+)
+# puzzle id -> (mesh hash, mesh file)
+mesh_cache = TTLCache(maxsize=puzzle_cache.maxsize, ttl=puzzle_cache.ttl)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 500
+
+
+def cells_query(puzzle_ids):
+    # Only columns of ix_master_base_puzzle_cell_board, so PostgreSQL answers it index-only.
+    return (
+        select(MasterBasePuzzleCell.base_puzzle_id, MasterBasePuzzleCell.x, MasterBasePuzzleCell.y,
+               MasterBasePuzzleCell.z, MasterBasePuzzleCell.value)
+        .where(MasterBasePuzzleCell.base_puzzle_id.in_(list(puzzle_ids)))
+    )
+
+
+def content_cells_query(puzzle_ids):
+    # Only columns of ix_content_puzzle_cell_board, so PostgreSQL answers it index-only.
+    return (
+        select(ContentPuzzleCell.puzzle_id, ContentPuzzleCell.x, ContentPuzzleCell.y,
+               ContentPuzzleCell.z, ContentPuzzleCell.piece_id)
+        .where(ContentPuzzleCell.puzzle_id.in_(list(puzzle_ids)))
+    )
+
+
+def load_cells(session, puzzle_ids, query=cells_query):
+    """
+    Cell rows of several puzzles in one query: {puzzle_id: [(x, y, z, piece)]}.
+    `query` is cells_query (base puzzles) or content_cells_query.
+    """
+    cells = {puzzle_id: [] for puzzle_id in puzzle_ids}
+    if not cells:
+        return cells
+    rows = session.execute(query(cells))
+    for puzzle_id, x, y, z, value in rows:
+        cells[puzzle_id].append((x, y, z, value))
+    return cells
+
+
+def puzzle_payload(session, puzzle, cells=None):
+    """
+    JSON-ready dict for a base puzzle. The board comes from the packed
+    column; puzzles imported before it existed fall back to their cell rows
+    (`cells`, or one query when not given).
+    """
+    if puzzle.board is not None:
+        dims = puzzle.board_dims
+        solution = solution_from_cells(puzzle.board_cells())
+    else:
+        if cells is None:
+            cells = load_cells(session, [puzzle.id])[puzzle.id]
+        solution = solution_from_cells(cells)
+        dims = solution_dims(solution)
+
+    return {
+        "id": str(puzzle.id),
+        "name": puzzle.name,
+        "description": puzzle.description,
+        "puzzle_type_id": str(puzzle.puzzle_type_id),
+        "created_at": puzzle.created_at.isoformat() if puzzle.created_at else None,
+        "dims": list(dims),
+        "pieces": solution,
+    }
+
+
+def base_summary(puzzle):
+    return {
+        "id": str(puzzle.id),
+        "name": puzzle.name,
+        "description": puzzle.description,
+        "puzzle_type_id": str(puzzle.puzzle_type_id),
+        "solution_hash": puzzle.solution_hash,
+        "created_at": puzzle.created_at.isoformat(),
+    }
+
+
+def content_summary(puzzle):
+    return {
+        "id": str(puzzle.id),
+        "code": puzzle.code,
+        "title": puzzle.title,
+        "description": puzzle.description,
+        "base_puzzle_id": str(puzzle.base_puzzle_id),
+        "difficulty_id": str(puzzle.difficulty_id),
+        "puzzle_type_id": str(puzzle.puzzle_type_id),
+        "author_id": str(puzzle.author_id),
+        "solver_nodes": puzzle.solver_nodes,
+        "created_at": puzzle.created_at.isoformat(),
+    }
+
+
+def content_payload(puzzle, base_name, cells):
+    """
+    JSON-ready dict for a content puzzle: its summary, the dims of its base
+    puzzle's board and the cells it keeps, grouped per piece.
+    """
+    solution = solution_from_cells(cells)
+    # Base puzzles are named <size>_<index> by the importer.
+    dims = board_dims(base_name.rsplit("_", 1)[0], solution)
+    return dict(content_summary(puzzle), dims=list(dims), pieces=solution)
+
+
+def render(payload):
+    """
+    Returns (etag, body): the body is canonical JSON so equal content always
+    yields the same strong ETag.
+    """
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(body).hexdigest()[:32], body
+
+
+def _respond(entry, cache_status):
+    etag, body = entry
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Cache"] = cache_status
+    return response
+
+
+def _load(puzzle_id):
+    entry = puzzle_cache.get(puzzle_id)
+    if entry is not None:
+        return entry, "HIT"
+
+    session = get_session()
+    puzzle = session.get(MasterBasePuzzle, puzzle_id)
+    if puzzle is None:
+        return None, "MISS"
+    entry = render(puzzle_payload(session, puzzle))
+    puzzle_cache.set(puzzle_id, entry)
+    return entry, "MISS"
+
+
+@bp.get("/<uuid:puzzle_id>")
+def get_puzzle(puzzle_id):
+    entry, cache_status = _load(puzzle_id)
+    if entry is None:
+        return jsonify(error="puzzle not found"), 404
+    return _respond(entry, cache_status)
+
+
+@bp.get("/by-name/<slug>")
+def get_puzzle_by_name(slug):
+    puzzle_id = name_cache.get(slug)
+    if puzzle_id is None:
+        puzzle_id = get_session().scalar(
+            select(MasterBasePuzzle.id)
+            .where(MasterBasePuzzle.name == slug)
+            .order_by(MasterBasePuzzle.created_at, MasterBasePuzzle.id)
+            .limit(1)
+        )
+        if puzzle_id is None:
+            return jsonify(error="puzzle not found"), 404
+        name_cache.set(slug, puzzle_id)
+
+    entry, cache_status = _load(puzzle_id)
+    if entry is None:
+        name_cache.pop(slug)
+        return jsonify(error="puzzle not found"), 404
+    return _respond(entry, cache_status)
+
+
+@bp.get("/<uuid:puzzle_id>/mesh.glb")
+def get_puzzle_mesh(puzzle_id):
+    entry = mesh_cache.get(puzzle_id)
+    cache_status = "HIT"
+    if entry is None or not os.path.exists(entry[1]):
+        cache_status = "MISS"
+        session = get_session()
+        puzzle = session.get(MasterBasePuzzle, puzzle_id)
+        if puzzle is None:
+            return jsonify(error="puzzle not found"), 404
+        board = puzzle.board
+        if board is None:
+            solution = solution_from_cells(load_cells(session, [puzzle.id])[puzzle.id])
+            board = pack_board(solution, solution_dims(solution))
+        entry = mesh_path(board)
+        mesh_cache.set(puzzle_id, entry)
+
+    digest, path = entry
+    # A file path lets the WSGI server hand the file to sendfile().
+    response = send_file(path, mimetype="model/gltf-binary", etag=digest, conditional=True, max_age=None)
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Cache"] = cache_status
+    return response
+
+
+def encode_cursor(puzzle):
+    raw = f"{puzzle.created_at.isoformat()}|{puzzle.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Returns (created_at, id) for a cursor from encode_cursor(); ValueError
+    when it is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, puzzle_id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(puzzle_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _after(stmt, cursor, model=MasterBasePuzzle):
+    if not cursor:
+        return stmt
+    return stmt.where(tuple_(model.created_at, model.id) > decode_cursor(cursor))
+
+
+def _catalogue(model=MasterBasePuzzle):
+    return select(model).order_by(model.created_at, model.id)
+
+
+# ?kind= -> (model, summary of a listed row)
+CATALOGUES = {
+    "base": (MasterBasePuzzle, base_summary),
+    "content": (ContentPuzzle, content_summary),
+}
+
+
+def _kind():
+    kind = request.args.get("kind", "base")
+    if kind not in CATALOGUES:
+        raise ValueError(f"Unknown kind: {kind} (expected one of {', '.join(CATALOGUES)})")
+    return kind
+
+
+@bp.get("")
+def list_puzzles():
+    """
+    One page of puzzle summaries after `after` (a cursor from a previous
+    page's `next`), at most `limit` long. `next` is null on the last page.
+    ?kind=content lists content puzzles instead of base puzzles.
+    """
+    try:
+        model, summary = CATALOGUES[_kind()]
+        limit = min(max(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        stmt = _after(_catalogue(model), request.args.get("after"), model)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    # One extra row tells whether another page follows.
+    puzzles = get_session().scalars(stmt.limit(limit + 1)).all()
+    page = puzzles[:limit]
+    return jsonify(
+        items=[summary(puzzle) for puzzle in page],
+        next=encode_cursor(page[-1]) if len(puzzles) > limit else None,
+    )
+
+
+def _export_base(session, stmt):
+    result = session.scalars(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for batch in result.partitions():
+        # Puzzles without a packed board get their cells in one query per batch.
+        cells = load_cells(session, [puzzle.id for puzzle in batch if puzzle.board is None])
+        yield batch, [puzzle_payload(session, puzzle, cells.get(puzzle.id)) for puzzle in batch]
+
+
+def _export_content(session, stmt):
+    stmt = stmt.add_columns(MasterBasePuzzle.name) \
+        .join(MasterBasePuzzle, MasterBasePuzzle.id == ContentPuzzle.base_puzzle_id)
+    result = session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for rows in result.partitions():
+        # The kept cells of the whole batch in one query.
+        cells = load_cells(session, [puzzle.id for puzzle, _ in rows], content_cells_query)
+        yield ([puzzle for puzzle, _ in rows],
+               [content_payload(puzzle, name, cells[puzzle.id]) for puzzle, name in rows])
+
+
+@bp.get("/export")
+def export_puzzles():
+    """
+    Streams every puzzle (optionally after a cursor) as one JSON document
+    per line, in catalogue order. ?kind=content streams content puzzles
+    with their kept cells.
+    """
+    try:
+        kind = _kind()
+        model, _ = CATALOGUES[kind]
+        stmt = _after(_catalogue(model), request.args.get("after"), model)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    export = _export_content if kind == "content" else _export_base
+
+    def generate():
+        session = get_session()
+        for puzzles, payloads in export(session, stmt):
+            lines = [json.dumps(payload, separators=(",", ":")) for payload in payloads]
+            # Keep the identity map from growing with the table. Not expunge_all(),
+            # which would invalidate the map the result is still loading into.
+            for puzzle in puzzles:
+                session.expunge(puzzle)
+            yield "\n".join(lines) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@bp.post("/<uuid:puzzle_id>/hint")
+def get_hint(puzzle_id):
+    """
+    Body: {"placements": [{"piece": "X", "cells": [[x, y, z], ...]}, ...]}.
+    Returns the next piece to place, from the stored solution when the
+    placements agree with it and from a bounded search otherwise.
+    """
+    entry, _ = _load(puzzle_id)
+    if entry is None:
+        return jsonify(error="puzzle not found"), 404
+    puzzle = json.loads(entry[1])
+    # Base puzzles are named <size>_<index> by the importer.
+    size = puzzle["name"].rsplit("_", 1)[0]
+
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify(error="body must be a JSON object"), 400
+    try:
+        index = load_index(size)
+        occupied, placements = parse_placements(index, body.get("placements") or [])
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    key = (puzzle_id, occupied, tuple(sorted(placements)))
+    result = hint_cache.get(key)
+    cache_status = "HIT"
+    if result is None:
+        cache_status = "MISS"
+        result = next_hint(size, placements, puzzle["pieces"])
+        hint_cache.set(key, result)
+    metrics.hint_results.inc(result=result.get("source", result["status"]))
+
+    response = jsonify(result)
+    response.headers["X-Cache"] = cache_status
+    return response
+
+
+@bp.post("/matching")
+def matching_puzzles():
+    """
+    Body: {"size": "6x10", "placements": [{"piece", "cells"}, ...], "limit": 100}.
+    Base puzzles whose solution contains every placement (in any board
+    orientation), from the solution placement index.
+    """
+    from backend.solution_index import load_solution_index
+
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify(error="body must be a JSON object"), 400
+    try:
+        index = load_solution_index(str(body.get("size", "")))
+        _, placements = parse_placements(index.placements, body.get("placements") or [])
+        limit = min(max(int(body.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except (TypeError, ValueError) as e:
+        return jsonify(error=str(e)), 400
+
+    numbers = index.matching(placements)
+    return jsonify(count=int(len(numbers)), indexed=len(index),
+                   puzzle_ids=[str(puzzle_id) for puzzle_id in index.puzzle_ids(numbers[:limit])])
+
+
+@bp.get("/<uuid:puzzle_id>/similar")
+def similar_puzzles(puzzle_id):
+    """
+    ?k=10. The base puzzles of the same size whose solution agrees with
+    this one on the most cells, allowing for rotations and reflections.
+    """
+    from backend.solution_index import load_solution_index
+
+    entry, _ = _load(puzzle_id)
+    if entry is None:
+        return jsonify(error="puzzle not found"), 404
+    puzzle = json.loads(entry[1])
+    size = puzzle["name"].rsplit("_", 1)[0]
+    try:
+        k = min(max(int(request.args.get("k", 10)), 1), MAX_PAGE_SIZE)
+        index = load_solution_index(size)
+        if not len(index):
+            return jsonify(error=f"no solution index for {size}"), 404
+        row = index.cell_row(puzzle["pieces"])
+        number = index.number_of(puzzle_id)
+        found = index.similar(row, k, exclude=[] if number is None else [number])
+        puzzle_ids = index.puzzle_ids(n for n, _ in found)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    except OSError as e:
+        # Index files missing or unreadable, e.g. mid-deploy; retry later.
+        return jsonify(error=f"solution index for {size} unavailable: {e.strerror or e}"), 503
+    return jsonify(indexed=len(index), cells=index.grid.open_cells,
+                   items=[{"id": str(similar_id), "agreeing_cells": score}
+                          for similar_id, (_, score) in zip(puzzle_ids, found)])
+
+
+@bp.get("/cache-stats")
+def cache_stats():
+    hint_results = {key[0]: count for key, count in metrics.hint_results.values().items()}
+    return jsonify(puzzles=puzzle_cache.stats(), names=name_cache.stats(),
+                   hints=dict(hint_cache.stats(), results=hint_results), meshes=mesh_cache.stats(),
+                   master_data=registry.stats())
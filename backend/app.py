@@ -1,10 +1,70 @@
+import os
+import sys
+
 from flask import Flask
 
-app = Flask(__name__)
+# `python backend/app.py` puts backend/ on sys.path; the modules import as backend.*
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend import db, metrics
+from backend.api.puzzles import bp as puzzles_bp
+from backend.master_data import registry
+
+
+def preload_master_data(app):
+    """
+    Loads the master tables (backend/master_data.py) while the worker starts
+    instead of on its first request. A database that is not reachable yet
+    only logs a warning; the registry then loads on first use.
+    """
+    from sqlalchemy.exc import SQLAlchemyError
+
+    try:
+        registry.reload(db.get_session())
+    except SQLAlchemyError as e:
+        app.logger.warning("Master data not preloaded: %s", e)
+    finally:
+        db.Session.remove()
+
+
+def create_app(config=None):
+    """
+    App factory. `config` overrides settings such as DATABASE_URL; the
+    engine itself is shared by every app in the process (backend/db.py).
+    The master data is loaded here unless PRELOAD_MASTER_DATA=0.
+
+        gunicorn -w 4 'backend.app:create_app()'
+
+    With --preload the imports and the master data are paid once in the
+    gunicorn master; forked workers inherit them and drop its connections.
+    benchmarks/bench_startup.py measures a cold worker without it.
+    """
+    app = Flask(__name__)
+    app.config["DATABASE_URL"] = os.environ.get("DATABASE_URL")
+    app.config["PRELOAD_MASTER_DATA"] = os.environ.get("PRELOAD_MASTER_DATA", "1") != "0"
+    app.config.update(config or {})
+
+    db.init_app(app)
+    metrics.init_app(app)
+    app.register_blueprint(puzzles_bp)
+    if app.config["DATABASE_URL"] and app.config["PRELOAD_MASTER_DATA"]:
+        preload_master_data(app)
+
+    @app.route('/')
+    def hello():
+        return "Hello from backend!"
+
+    return app
+
+
+def __getattr__(name):
+    # `backend.app:app` (flask run, servers given an instance) is built on
+    # first access, so importing the module for create_app() builds no app.
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-@app.route('/')
-def hello():
-    return "Hello from backend!"
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', port=5000)
@@ -0,0 +1,184 @@
+# ✅ backend/board.py
+"""
+Board geometry shared by the importer, models and solver.
+
+A board is a W x H x D box of voxels. Voxel (x, y, z) lives at offset
+(z * H + y) * W + x, the same layout tools/pentomino/solver.rb uses for its
+bitboards.
+
+Packed boards (master_base_puzzle.board) are three dimension bytes followed
+by one piece letter per voxel in that order, EMPTY for holes.
+"""
+import hashlib
+import itertools
+import re
+from functools import lru_cache
+from operator import itemgetter
+
+EMPTY = "."
+
+_SIZE_RE = re.compile(r"^(\d+)\D(\d+)(?:\D(\d+))?(h?)$", re.IGNORECASE)
+
+
+def parse_size(size):
+    """
+    Parses a solver size string ('6x10', '5x4x3', '8x8h') into (W, H, D).
+    Follows solver.rb: a 2D size whose area is below 60 gets the depth that
+    makes 60 cells ('5x4' -> 5x4x3).
+    """
+    m = _SIZE_RE.match(size.strip())
+    if not m:
+        raise ValueError(f"Wrong size: {size}")
+    w, h = int(m.group(1)), int(m.group(2))
+    if m.group(3):
+        d = int(m.group(3))
+    else:
+        d = 1 if w * h >= 60 else 60 // (w * h)
+    if w * h * d not in (60, 63, 64):
+        raise ValueError(f"Wrong size: {size}")
+    return w, h, d
+
+
+def is_holed(size):
+    """
+    True for the '8x8h' / '7x9h' variants with a hole in the middle.
+    """
+    return size.strip().lower().endswith("h")
+
+
+def solution_dims(solution):
+    """
+    Bounding box (W, H, D) of a solution given as [{piece, cells}].
+    """
+    w = h = d = 0
+    for piece_data in solution:
+        for cell in piece_data["cells"]:
+            w = max(w, cell[0] + 1)
+            h = max(h, cell[1] + 1)
+            d = max(d, (cell[2] if len(cell) > 2 else 0) + 1)
+    return w, h, d
+
+
+def board_dims(size, solution):
+    """
+    Dimensions for a solution of the given size slug, falling back to the
+    bounding box of its cells when the slug is not a solver size.
+    """
+    try:
+        return parse_size(size)
+    except ValueError:
+        return solution_dims(solution)
+
+
+def solution_from_cells(cells):
+    """
+    Rebuilds [{piece, cells}] from (x, y, z, piece) rows.
+    """
+    pieces = {}
+    for x, y, z, piece in cells:
+        pieces.setdefault(piece, []).append([x, y, z])
+    return [{"piece": piece, "cells": piece_cells} for piece, piece_cells in sorted(pieces.items())]
+
+
+def solution_grid(solution, dims):
+    """
+    Returns the board as bytes, one piece letter per voxel (EMPTY for holes).
+    """
+    w, h, d = dims
+    grid = bytearray(EMPTY.encode() * (w * h * d))
+    for piece_data in solution:
+        letter = ord(piece_data["piece"])
+        for cell in piece_data["cells"]:
+            z = cell[2] if len(cell) > 2 else 0
+            grid[(z * h + cell[1]) * w + cell[0]] = letter
+    return bytes(grid)
+
+
+def pack_board(solution, dims):
+    """
+    Packs a solution into the bytes stored in master_base_puzzle.board.
+    """
+    return bytes(dims) + solution_grid(solution, dims)
+
+
+def unpack_board(data):
+    """
+    Returns ((W, H, D), grid) for a packed board.
+    """
+    data = bytes(data)
+    dims = tuple(data[:3])
+    w, h, d = dims
+    if len(data) != 3 + w * h * d:
+        raise ValueError(f"Packed board has {len(data)} bytes, expected {3 + w * h * d}")
+    return dims, data[3:]
+
+
+def board_cells(data):
+    """
+    Decodes a packed board into (x, y, z, piece) tuples, skipping holes.
+    """
+    (w, h, _), grid = unpack_board(data)
+    empty = ord(EMPTY)
+    return [
+        (offset % w, offset // w % h, offset // (w * h), chr(value))
+        for offset, value in enumerate(grid)
+        if value != empty
+    ]
+
+
+def board_array(data):
+    """
+    Decodes a packed board into a (D, H, W) uint8 NumPy array of piece
+    letters (ord(EMPTY) for holes), indexed as array[z, y, x].
+    """
+    import numpy as np
+
+    (w, h, d), grid = unpack_board(data)
+    return np.frombuffer(grid, dtype=np.uint8).reshape(d, h, w)
+
+
+@lru_cache(maxsize=None)
+def symmetries(dims):
+    """
+    Every rotation/reflection of the box as (target_dims, index getter).
+    Only transforms onto the sorted dims are kept, so a board and its 90°
+    rotation share one orientation and the set stays small (8 for a
+    6x10 board, 16 for 8x8).
+    """
+    target = tuple(sorted(dims))
+    transforms = []
+    for axes in itertools.permutations(range(3)):
+        if tuple(dims[a] for a in axes) != target:
+            continue
+        for flips in itertools.product((False, True), repeat=3):
+            tw, th, td = target
+            source = []
+            for tz in range(td):
+                for ty in range(th):
+                    for tx in range(tw):
+                        point = [0, 0, 0]
+                        for value, axis, flip in zip((tx, ty, tz), axes, flips):
+                            point[axis] = dims[axis] - 1 - value if flip else value
+                        x, y, z = point
+                        source.append((z * dims[1] + y) * dims[0] + x)
+            transforms.append((target, itemgetter(*source)))
+    return tuple(transforms)
+
+
+def canonical_grid(grid, dims):
+    """
+    Smallest image of the grid over all board symmetries.
+    """
+    return min(bytes(getter(grid)) for _, getter in symmetries(tuple(dims)))
+
+
+def canonical_fingerprint(solution, dims=None):
+    """
+    SHA-256 hex digest identifying a solution up to rotation and reflection.
+    Pieces are compared by letter on the voxel grid, so the order of the
+    pieces and of their cells in the input does not matter.
+    """
+    dims = tuple(dims or solution_dims(solution))
+    grid = solution_grid(solution, dims)
+    key = bytes(sorted(dims)) + canonical_grid(grid, dims)
+    return hashlib.sha256(key).hexdigest()
@@ -0,0 +1,131 @@
+# ✅ backend/db.py
+"""
+Process-wide database engine and request-scoped sessions.
+
+One pooled engine per process, built lazily from DATABASE_URL. Pool
+settings come from the environment:
+
+    DB_POOL_SIZE (5), DB_MAX_OVERFLOW (10), DB_POOL_RECYCLE (1800 sec),
+    DB_POOL_TIMEOUT (30 sec), DB_QUERY_CACHE_SIZE (500 compiled statements)
+
+Connections are pre-pinged on checkout. After a fork (gunicorn prefork
+workers, multiprocessing) the child drops the inherited pool without
+closing the parent's sockets and opens its own connections.
+"""
+import os
+import threading
+
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from backend import metrics
+
+_lock = threading.Lock()
+_engine = None
+
+# Session() is the session of the current thread / request; Session.remove()
+# closes it. Flask apps get that on teardown through init_app().
+Session = scoped_session(sessionmaker())
+
+
+def database_url():
+    url = os.environ.get("DATABASE_URL")
+    if not url:
+        raise ValueError("DATABASE_URL environment variable not set.")
+    return url
+
+
+def pool_options():
+    return {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+    }
+
+
+def create_db_engine(url=None, **overrides):
+    """
+    Builds an engine with the project defaults. Keyword arguments override
+    them (e.g. pool_size=1 for import workers, poolclass=NullPool for
+    migrations; pool sizing is left out when a poolclass is given).
+    Statements and pool checkouts are timed (backend/metrics.py).
+    """
+    url = make_url(url or database_url())
+    options = {
+        "pool_pre_ping": True,
+        "query_cache_size": int(os.environ.get("DB_QUERY_CACHE_SIZE", 500)),
+    }
+    if "poolclass" not in overrides:
+        options.update(pool_options())
+        if url.get_dialect().get_pool_class(url) is QueuePool:
+            options["poolclass"] = metrics.TimedQueuePool
+    options.update(overrides)
+    return metrics.instrument_engine(create_engine(url, **options))
+
+
+def get_engine():
+    """
+    The engine shared by everything in this process.
+    """
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = create_db_engine()
+                Session.configure(bind=_engine)
+    return _engine
+
+
+def configure(url=None, **overrides):
+    """
+    Replaces the process engine, e.g. for an app created with an explicit
+    DATABASE_URL. Returns the new engine.
+    """
+    global _engine
+    with _lock:
+        Session.remove()
+        if _engine is not None:
+            _engine.dispose()
+        _engine = create_db_engine(url, **overrides)
+        Session.configure(bind=_engine)
+    return _engine
+
+
+def get_session():
+    """
+    The scoped session, bound to the process engine.
+    """
+    get_engine()
+    return Session()
+
+
+def _after_fork_in_child():
+    # Pooled connections belong to the parent. dispose(close=False) forgets
+    # them without sending a terminate over the shared sockets.
+    global _lock
+    _lock = threading.Lock()
+    Session.registry.clear()
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def init_app(app):
+    """
+    Binds the app to the process engine and closes the request's session
+    on teardown.
+    """
+    url = app.config.get("DATABASE_URL")
+    if url and (_engine is None or _engine.url.render_as_string(hide_password=False) != url):
+        configure(url)
+
+    @app.teardown_appcontext
+    def remove_session(exception=None):
+        Session.remove()
+
+    return app
@@ -0,0 +1,180 @@
+# ✅ backend/master_data.py
+"""
+In-process registry of the small master tables (pieces, puzzle types,
+difficulties, users).
+
+All four tables are read with one UNION ALL query into an immutable
+MasterData snapshot; lookups after that cost no round trip. Each snapshot
+carries a version (a digest of its rows). A reload that finds the same
+rows keeps the current snapshot, so anything derived from it and keyed by
+the version stays valid.
+
+A snapshot is reloaded when it is older than MASTER_DATA_TTL seconds
+(300), after invalidate(), and once when ensure() misses a row another
+process may have created. The app loads it at worker start
+(backend/app.py) and the importer before its first file.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from sqlalchemy import String, Text, cast, literal, null, select, union_all
+from sqlalchemy.exc import IntegrityError
+
+from backend.models.all import MasterDifficulty, MasterPiece, MasterPuzzleType, MasterUser
+
+TTL = float(os.environ.get("MASTER_DATA_TTL", 300))
+
+# kind -> (model, natural key column)
+KINDS = {
+    "piece": (MasterPiece, "id"),
+    "puzzle_type": (MasterPuzzleType, "name"),
+    "difficulty": (MasterDifficulty, "name"),
+    "user": (MasterUser, "username"),
+}
+
+
+@dataclass(frozen=True)
+class MasterRow:
+    id: Any
+    name: str
+    description: Optional[str] = None
+    # MasterPiece.shape_json
+    shape: Optional[tuple] = None
+
+
+@dataclass(frozen=True)
+class MasterData:
+    """
+    One snapshot; each mapping goes from the natural key (piece id, name,
+    username) to its MasterRow.
+    """
+    version: str
+    pieces: Mapping[str, MasterRow]
+    puzzle_types: Mapping[str, MasterRow]
+    difficulties: Mapping[str, MasterRow]
+    users: Mapping[str, MasterRow]
+    loaded_at: float
+
+    def rows(self, kind):
+        return getattr(self, {"piece": "pieces", "puzzle_type": "puzzle_types",
+                              "difficulty": "difficulties", "user": "users"}[kind])
+
+    def stats(self):
+        return {"version": self.version, "age": round(time.time() - self.loaded_at, 1),
+                **{kind: len(self.rows(kind)) for kind in KINDS}}
+
+
+def _master_query():
+    # One row shape for all four tables: (kind, id, name, description, shape).
+    none = cast(null(), Text)
+    return union_all(
+        select(literal("piece").label("kind"), cast(MasterPiece.id, String).label("id"),
+               MasterPiece.name.label("name"), none.label("description"),
+               cast(MasterPiece.shape_json, Text).label("shape")),
+        select(literal("puzzle_type"), cast(MasterPuzzleType.id, String), MasterPuzzleType.name,
+               MasterPuzzleType.description, none),
+        select(literal("difficulty"), cast(MasterDifficulty.id, String), MasterDifficulty.name,
+               MasterDifficulty.description, none),
+        select(literal("user"), cast(MasterUser.id, String), MasterUser.username, none, none),
+    )
+
+
+def _freeze(shape):
+    return tuple(tuple(cell) for cell in json.loads(shape))
+
+
+def load(session):
+    """
+    Reads every master table in one query. Returns a MasterData.
+    """
+    rows = sorted(tuple(row) for row in session.execute(_master_query()))
+    digest = hashlib.sha256(json.dumps(rows).encode()).hexdigest()[:16]
+    tables = {kind: {} for kind in KINDS}
+    for kind, row_id, name, description, shape in rows:
+        if kind == "piece":
+            tables[kind][row_id] = MasterRow(row_id, name, description, _freeze(shape))
+        else:
+            tables[kind][name] = MasterRow(uuid.UUID(row_id), name, description)
+    return MasterData(
+        version=digest,
+        pieces=MappingProxyType(tables["piece"]),
+        puzzle_types=MappingProxyType(tables["puzzle_type"]),
+        difficulties=MappingProxyType(tables["difficulty"]),
+        users=MappingProxyType(tables["user"]),
+        loaded_at=time.time(),
+    )
+
+
+class Registry:
+    """
+    The current MasterData of this process.
+    """
+
+    def __init__(self, ttl=TTL):
+        self.ttl = ttl
+        self.loads = 0
+        self._data = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, session):
+        """
+        The current snapshot, (re)loaded when missing or older than ttl.
+        """
+        data = self._data
+        if data is None or time.monotonic() - self._checked > self.ttl:
+            data = self.reload(session)
+        return data
+
+    def peek(self):
+        return self._data
+
+    def reload(self, session):
+        with self._lock:
+            data = load(session)
+            self.loads += 1
+            self._checked = time.monotonic()
+            if self._data is None or self._data.version != data.version:
+                self._data = data
+            return self._data
+
+    def invalidate(self):
+        self._data = None
+
+    def ensure(self, session, kind, rows):
+        """
+        {key: MasterRow} for rows {key: column defaults} of one kind,
+        inserting the missing ones in a single commit. A miss reloads the
+        snapshot first, since another process may have added the row.
+        """
+        data = self.get(session)
+        if any(key not in data.rows(kind) for key in rows):
+            data = self.reload(session)
+        missing = [key for key in rows if key not in data.rows(kind)]
+        if missing:
+            model, key_column = KINDS[kind]
+            session.add_all([model(**{key_column: key, **rows[key]}) for key in missing])
+            try:
+                session.commit()
+            except IntegrityError:
+                # Lost a race with another writer; its rows are as good.
+                session.rollback()
+            data = self.reload(session)
+        return {key: data.rows(kind)[key] for key in rows}
+
+    def ensure_one(self, session, kind, key, **defaults):
+        return self.ensure(session, kind, {key: defaults})[key]
+
+    def stats(self):
+        data = self._data
+        return dict(data.stats() if data else {"version": None}, loads=self.loads, ttl=self.ttl)
+
+
+registry = Registry()
@@ -0,0 +1,249 @@
+# ✅ backend/mesh.py
+"""
+Binary meshes of solved boards for the 3D viewer.
+
+Each piece becomes one mesh: faces between two voxels of the same piece are
+dropped and the remaining coplanar faces are merged into rectangles
+(greedy meshing), so a pentomino is a handful of quads instead of 5 x 6
+cube faces. The result is a GLB (binary glTF 2.0) file with one node and
+mesh per piece, named by the piece letter, in voxel units with the board's
+(0, 0, 0) corner at the origin.
+
+Files are cached under MESH_CACHE_DIR by the content hash of the packed
+board, so equal boards share one file and a file never goes stale:
+
+    python -m backend.mesh --size 6x10
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+
+from backend.board import EMPTY, unpack_board
+
+MESH_FORMAT_VERSION = 1
+MESH_CACHE_DIR = os.environ.get(
+    "MESH_CACHE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "var", "mesh")),
+)
+
+# glTF constants
+_FLOAT = 5126
+_UNSIGNED_SHORT = 5123
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+_TRIANGLES = 4
+
+
+def _quads(dims, grid, piece):
+    """
+    Greedy-merged boundary faces of one piece: [(axis, sign, plane, u0, v0, u1, v1)]
+    where the quad spans [u0, u1] x [v0, v1] on the axes after `axis`.
+    """
+    w, h, d = dims
+    code = ord(piece)
+
+    def at(p):
+        x, y, z = p
+        if 0 <= x < w and 0 <= y < h and 0 <= z < d:
+            return grid[(z * h + y) * w + x]
+        return None
+
+    quads = []
+    for axis in range(3):
+        u_axis, v_axis = (axis + 1) % 3, (axis + 2) % 3
+        size_u, size_v = dims[u_axis], dims[v_axis]
+        for sign in (1, -1):
+            for layer in range(dims[axis]):
+                # mask[v][u]: the voxel is this piece and its neighbour across the face is not
+                mask = [[False] * size_u for _ in range(size_v)]
+                for v in range(size_v):
+                    for u in range(size_u):
+                        p = [0, 0, 0]
+                        p[axis], p[u_axis], p[v_axis] = layer, u, v
+                        if at(p) != code:
+                            continue
+                        p[axis] += sign
+                        mask[v][u] = at(p) != code
+
+                plane = layer + 1 if sign > 0 else layer
+                for v in range(size_v):
+                    u = 0
+                    while u < size_u:
+                        if not mask[v][u]:
+                            u += 1
+                            continue
+                        width = 1
+                        while u + width < size_u and mask[v][u + width]:
+                            width += 1
+                        height = 1
+                        while v + height < size_v and all(mask[v + height][u:u + width]):
+                            height += 1
+                        for row in range(v, v + height):
+                            mask[row][u:u + width] = [False] * width
+                        quads.append((axis, sign, plane, u, v, u + width, v + height))
+                        u += width
+    return quads
+
+
+def _piece_buffers(quads):
+    """
+    (positions, normals, indices) arrays for a piece's quads, wound
+    counter-clockwise seen from outside.
+    """
+    positions, normals, indices = array("f"), array("f"), array("H")
+    for axis, sign, plane, u0, v0, u1, v1 in quads:
+        u_axis, v_axis = (axis + 1) % 3, (axis + 2) % 3
+        corners = [(u0, v0), (u1, v0), (u1, v1), (u0, v1)]
+        if sign < 0:
+            corners.reverse()
+        base = len(positions) // 3
+        normal = [0.0, 0.0, 0.0]
+        normal[axis] = float(sign)
+        for u, v in corners:
+            p = [0.0, 0.0, 0.0]
+            p[axis], p[u_axis], p[v_axis] = plane, u, v
+            positions.extend(p)
+            normals.extend(normal)
+        indices.extend((base, base + 1, base + 2, base, base + 2, base + 3))
+    return positions, normals, indices
+
+
+def _le(data):
+    # glTF buffers are little-endian.
+    if sys.byteorder != "little":
+        data = array(data.typecode, data)
+        data.byteswap()
+    return data.tobytes()
+
+
+def _pad(data, fill):
+    return data + fill * (-len(data) % 4)
+
+
+def board_glb(data):
+    """
+    GLB bytes for a packed board (backend/board.py).
+    """
+    dims, grid = unpack_board(data)
+    pieces = sorted({chr(value) for value in grid} - {EMPTY})
+
+    blobs = {"positions": bytearray(), "normals": bytearray(), "indices": bytearray()}
+    accessors, meshes, nodes = [], [], []
+    for piece in pieces:
+        positions, normals, indices = _piece_buffers(_quads(dims, grid, piece))
+        vertex_count = len(positions) // 3
+        xs, ys, zs = positions[0::3], positions[1::3], positions[2::3]
+        first = len(accessors)
+        accessors.append({"bufferView": 0, "byteOffset": len(blobs["positions"]), "componentType": _FLOAT,
+                          "count": vertex_count, "type": "VEC3",
+                          "min": [min(xs), min(ys), min(zs)], "max": [max(xs), max(ys), max(zs)]})
+        accessors.append({"bufferView": 1, "byteOffset": len(blobs["normals"]), "componentType": _FLOAT,
+                          "count": vertex_count, "type": "VEC3"})
+        accessors.append({"bufferView": 2, "byteOffset": len(blobs["indices"]), "componentType": _UNSIGNED_SHORT,
+                          "count": len(indices), "type": "SCALAR"})
+        blobs["positions"] += _le(positions)
+        blobs["normals"] += _le(normals)
+        blobs["indices"] += _le(indices)
+        meshes.append({"name": piece, "primitives": [
+            {"attributes": {"POSITION": first, "NORMAL": first + 1}, "indices": first + 2, "mode": _TRIANGLES}]})
+        nodes.append({"name": piece, "mesh": len(meshes) - 1})
+
+    binary = bytearray()
+    views = []
+    for name, target in (("positions", _ARRAY_BUFFER), ("normals", _ARRAY_BUFFER),
+                         ("indices", _ELEMENT_ARRAY_BUFFER)):
+        views.append({"buffer": 0, "byteOffset": len(binary), "byteLength": len(blobs[name]), "target": target})
+        binary += _pad(bytes(blobs[name]), b"\0")
+    if views[1]["byteLength"]:
+        views[0]["byteStride"] = views[1]["byteStride"] = 12
+
+    document = {
+        "asset": {"version": "2.0", "generator": "backend.mesh"},
+        "scene": 0,
+        "scenes": [{"nodes": list(range(len(nodes)))}],
+        "nodes": nodes,
+        "meshes": meshes,
+        "accessors": accessors,
+        "bufferViews": views,
+        "buffers": [{"byteLength": len(binary)}],
+        "extras": {"dims": list(dims)},
+    }
+    json_chunk = _pad(json.dumps(document, separators=(",", ":")).encode(), b" ")
+    total = 12 + 8 + len(json_chunk) + 8 + len(binary)
+    return b"".join([
+        struct.pack("<4sII", b"glTF", 2, total),
+        struct.pack("<I4s", len(json_chunk), b"JSON"), json_chunk,
+        struct.pack("<I4s", len(binary), b"BIN\0"), bytes(binary),
+    ])
+
+
+def board_hash(data):
+    """
+    Content hash of a packed board and the mesh format: the cache key.
+    """
+    return hashlib.sha256(f"mesh{MESH_FORMAT_VERSION}:".encode() + bytes(data)).hexdigest()[:32]
+
+
+def mesh_path(data, cache_dir=MESH_CACHE_DIR):
+    """
+    (hash, path) of the cached GLB of a packed board, building it on a miss.
+    """
+    digest = board_hash(data)
+    path = os.path.join(cache_dir, digest[:2], f"{digest}.glb")
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(board_glb(data))
+        os.replace(tmp_path, path)
+    return digest, path
+
+
+def build_all(session, size=None, cache_dir=MESH_CACHE_DIR, batch_size=1000):
+    """
+    Builds the missing meshes of every base puzzle (of a size).
+    Returns (puzzles, built).
+    """
+    from sqlalchemy import select
+
+    from backend.models.master_base_puzzle import MasterBasePuzzle
+
+    stmt = select(MasterBasePuzzle.board).where(MasterBasePuzzle.board.is_not(None))
+    if size:
+        stmt = stmt.where(MasterBasePuzzle.name.like(size.replace("_", r"\_") + r"\_%", escape="\\"))
+    puzzles = built = 0
+    for rows in session.execute(stmt.execution_options(yield_per=batch_size)).partitions():
+        for (board,) in rows:
+            puzzles += 1
+            digest = board_hash(board)
+            if not os.path.exists(os.path.join(cache_dir, digest[:2], f"{digest}.glb")):
+                mesh_path(board, cache_dir)
+                built += 1
+    return puzzles, built
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the GLB meshes of the base puzzles.")
+    parser.add_argument("--size", help="Only puzzles of this board size (e.g., 6x10).")
+    args = parser.parse_args(argv)
+
+    from backend.db import Session, get_session
+
+    started = time.perf_counter()
+    try:
+        puzzles, built = build_all(get_session(), args.size)
+    finally:
+        Session.remove()
+    elapsed = time.perf_counter() - started
+    print(f"SUCCESS: {puzzles} puzzles, {built} new mesh(es) in {elapsed:.2f} sec "
+          f"({built / elapsed if elapsed else 0:.1f} meshes/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
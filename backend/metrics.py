@@ -0,0 +1,319 @@
+# ✅ backend/metrics.py
+"""
+In-process metrics in the Prometheus text format.
+
+    db_statement_seconds{operation,table}     cursor execute latency (SQLAlchemy events)
+    db_pool_checkout_seconds                  wait for a pooled connection
+    db_connect_seconds                        opening a new database connection
+    http_request_seconds{method,endpoint,status}
+    db_queries_per_request{endpoint}          statements per request (N+1 detector)
+    import_rows_total{table}, import_rows_per_second{table}
+    hint_results_total{result}                hint answers by source or status
+
+Flask apps expose the registry at GET /metrics (init_app()); batch jobs can
+write it to a file for the node_exporter textfile collector (write_textfile()).
+Every process has its own registry, so with several gunicorn workers each
+scrape sees one worker.
+
+Slow-query logging is opt-in: with SLOW_QUERY_MS set, statements slower
+than that are printed with their parameters.
+"""
+import contextvars
+import os
+import re
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+SLOW_QUERY_MS = float(os.environ["SLOW_QUERY_MS"]) if os.environ.get("SLOW_QUERY_MS") else None
+
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._samples(key, value))
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self):
+        """
+        {label values: count}, a copy taken under the lock.
+        """
+        with self._lock:
+            return dict(self._values)
+
+    def _samples(self, key, value):
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=SECONDS_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            counts = entry[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            entry[1] += 1
+            entry[2] += value
+
+    def _samples(self, key, entry):
+        counts, count, total = entry
+        lines = []
+        cumulative = 0
+        for bound, bucket in zip(self.buckets, counts):
+            cumulative += bucket
+            le = 'le="%s"' % (_number(bound) if bound == float("inf") else repr(float(bound)))
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [le])} {cumulative}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+statement_seconds = registry.register(Histogram(
+    "db_statement_seconds", "Cursor execute latency by statement type and first table.", ("operation", "table")))
+pool_checkout_seconds = registry.register(Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled connection."))
+connect_seconds = registry.register(Histogram(
+    "db_connect_seconds", "Time to open a new database connection."))
+request_seconds = registry.register(Histogram(
+    "http_request_seconds", "Request latency.", ("method", "endpoint", "status")))
+queries_per_request = registry.register(Histogram(
+    "db_queries_per_request", "SQL statements executed per request.", ("endpoint",), buckets=COUNT_BUCKETS))
+slow_queries = registry.register(Counter(
+    "db_slow_queries_total", "Statements slower than SLOW_QUERY_MS.", ("operation", "table")))
+import_rows = registry.register(Counter(
+    "import_rows_total", "Rows written by the solution importer.", ("table",)))
+import_rate = registry.register(Gauge(
+    "import_rows_per_second", "Rows per second of the last import run.", ("table",)))
+hint_results = registry.register(Counter(
+    "hint_results_total", "Hint answers by source (solution, search) or status.", ("result",)))
+
+
+# --- SQL ---
+_TABLE_RE = re.compile(r'\b(?:FROM|INTO|UPDATE|JOIN|TABLE)\s+"?(\w+)', re.IGNORECASE)
+# Statements seen in the current request, or None outside of one.
+_request_queries = contextvars.ContextVar("request_queries", default=None)
+
+
+def statement_labels(statement):
+    """
+    (operation, table) of a SQL statement, e.g. ('SELECT', 'master_base_puzzle').
+    """
+    stripped = statement.lstrip()
+    operation = stripped.split(None, 1)[0].upper() if stripped else "OTHER"
+    match = _TABLE_RE.search(stripped)
+    return operation, match.group(1).lower() if match else ""
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    operation, table = statement_labels(statement)
+    statement_seconds.observe(elapsed, operation=operation, table=table)
+
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+    if SLOW_QUERY_MS is not None and elapsed * 1000 >= SLOW_QUERY_MS:
+        slow_queries.inc(operation=operation, table=table)
+        print(f"WARN: Slow query ({elapsed * 1000:.1f} ms): {' '.join(statement.split())} "
+              f"-- parameters: {parameters!r}")
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute.
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def _do_connect(dialect, connection_record, cargs, cparams):
+    connection_record.info["connect_started"] = time.perf_counter()
+
+
+def _on_connect(dbapi_connection, connection_record):
+    started = connection_record.info.pop("connect_started", None)
+    if started is not None:
+        connect_seconds.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine):
+    """
+    Records the latency of every statement the engine executes and of every
+    new connection its pool opens.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+        event.listen(engine, "do_connect", _do_connect)
+        event.listen(engine, "connect", _on_connect)
+    return engine
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waits for a connection,
+    including opening one. The pool has no event for the start of a
+    checkout, so this times the public Pool.connect().
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_checkout_seconds.observe(time.perf_counter() - started)
+
+
+# --- Import jobs ---
+def record_import(table, rows, elapsed):
+    import_rows.inc(rows, table=table)
+    import_rate.set(round(rows / elapsed, 1) if elapsed else 0.0, table=table)
+
+
+def write_textfile(path):
+    """
+    Writes the registry for the node_exporter textfile collector.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+
+
+# --- Flask ---
+def init_app(app):
+    """
+    Times every request, counts its SQL statements and serves GET /metrics.
+    A request is recorded at teardown, so one that raised counts as a 500;
+    a streamed body (e.g. /export) is timed until the server closes it.
+    """
+    from flask import Response, g, request
+
+    def observe(started, method, endpoint, status, queries):
+        request_seconds.observe(time.perf_counter() - started, method=method, endpoint=endpoint, status=status)
+        queries_per_request.observe(queries[0], endpoint=endpoint)
+        _request_queries.set(None)
+
+    def labels():
+        endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        return request.method, endpoint
+
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+        g.metrics_queries = [0]
+        _request_queries.set(g.metrics_queries)
+
+    @app.after_request
+    def record_status(response):
+        if "metrics_started" not in g:
+            return response
+        if response.is_streamed:
+            # The body is generated after the request context is gone.
+            timing = (g.pop("metrics_started"), *labels(), response.status_code, g.pop("metrics_queries"))
+            response.call_on_close(lambda: observe(*timing))
+        else:
+            g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def record_request(exception=None):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return
+        observe(started, *labels(), g.pop("metrics_status", 500), g.pop("metrics_queries"))
+
+    @app.get("/metrics")
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+    return app
@@ -0,0 +1,31 @@
+# ✅ backend/models/all.py
+"""
+Every model, so Base.metadata holds the whole schema: foreign keys resolve
+in create_all() and bulk inserts, and Alembic sees every table. Import this
+instead of the models a script happens to reference.
+"""
+from .base import Base
+from .content_puzzle import ContentPuzzle
+from .content_puzzle_cell import ContentPuzzleCell
+from .import_manifest import ImportManifest
+from .import_shard import ImportShard
+from .master_base_puzzle import MasterBasePuzzle
+from .master_base_puzzle_cell import MasterBasePuzzleCell
+from .master_difficulty import MasterDifficulty
+from .master_piece import MasterPiece
+from .master_puzzle_type import MasterPuzzleType
+from .master_user import MasterUser
+
+__all__ = [
+    "Base",
+    "ContentPuzzle",
+    "ContentPuzzleCell",
+    "ImportManifest",
+    "ImportShard",
+    "MasterBasePuzzle",
+    "MasterBasePuzzleCell",
+    "MasterDifficulty",
+    "MasterPiece",
+    "MasterPuzzleType",
+    "MasterUser",
+]
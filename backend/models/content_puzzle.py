@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP, Integer, SmallInteger, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -18,3 +18,23 @@ class ContentPuzzle(Base):
     author_id = Column(UUID(as_uuid=True), ForeignKey("master_user.id"), nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Solver-derived difficulty (backend/solver/metrics.py, backend/scripts/compute_difficulty_metrics.py)
+    solver_nodes = Column(Integer)
+    solver_solutions = Column(Integer)
+    branching_factor = Column(Float)
+    forced_moves = Column(SmallInteger)
+    metrics_version = Column(SmallInteger)
+    # updated_at of the row the metrics were computed for
+    metrics_updated_at = Column(TIMESTAMP)
+
+    __table_args__ = (
+        # Keyset pagination of the catalogue (GET /puzzles?kind=content)
+        Index("ix_content_puzzle_created_at_id", "created_at", "id"),
+        # Listing by difficulty
+        Index("ix_content_puzzle_solver_nodes_id", "solver_nodes", "id"),
+        # Foreign keys (ON DELETE CASCADE from master_base_puzzle, listings per difficulty)
+        Index("ix_content_puzzle_base_puzzle_id", "base_puzzle_id"),
+        Index("ix_content_puzzle_difficulty_id", "difficulty_id"),
+        Index("ix_content_puzzle_puzzle_type_id", "puzzle_type_id"),
+        Index("ix_content_puzzle_author_id", "author_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, SmallInteger, ForeignKey, UniqueConstraint, String
+from sqlalchemy import Column, SmallInteger, ForeignKey, UniqueConstraint, String, Index
 from sqlalchemy.dialects.postgresql import UUID, CHAR
 import uuid
 
@@ -17,4 +17,7 @@ class ContentPuzzleCell(Base):
 
     __table_args__ = (
         UniqueConstraint("puzzle_id", "x", "y", "z", name="uq_content_puzzle_cell"),
+        # Board loads as an index-only scan; the table is CLUSTERed on it (migration c7e2a9d41f58)
+        Index("ix_content_puzzle_cell_board", "puzzle_id", postgresql_include=["x", "y", "z", "piece_id"]),
+        Index("ix_content_puzzle_cell_piece_id", "piece_id"),
     )
@@ -0,0 +1,23 @@
+# ✅ backend/models/import_manifest.py
+from sqlalchemy import Column, String, Integer, Boolean, TIMESTAMP
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+from .base import Base
+
+# One row per imported solutions_<size>.json (backend/scripts/solution_data_import.py)
+class ImportManifest(Base):
+    __tablename__ = "import_manifest"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    file_name = Column(String(255), nullable=False, unique=True)
+    size = Column(String(32), nullable=False)
+    # sha256 of the file contents; a different hash restarts the file
+    file_hash = Column(String(64), nullable=False)
+    # Every solution up to this index is stored or skipped (-1: none yet)
+    last_index = Column(Integer, nullable=False, server_default="-1")
+    total_solutions = Column(Integer)
+    completed = Column(Boolean, nullable=False, server_default="false")
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
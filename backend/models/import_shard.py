@@ -0,0 +1,26 @@
+# ✅ backend/models/import_shard.py
+from sqlalchemy import Column, Integer, Boolean, ForeignKey, TIMESTAMP, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+from .base import Base
+
+# One row per solution range of a --workers import; removed once the whole file is done
+class ImportShard(Base):
+    __tablename__ = "import_shard"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    manifest_id = Column(UUID(as_uuid=True), ForeignKey("import_manifest.id", ondelete="CASCADE"), nullable=False)
+    # Solutions [start, stop) of the file
+    start = Column(Integer, nullable=False)
+    stop = Column(Integer, nullable=False)
+    # Every solution of the range up to this index is stored or skipped
+    last_index = Column(Integer, nullable=False)
+    completed = Column(Boolean, nullable=False, server_default="false")
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("manifest_id", "start", name="uq_import_shard_manifest_id_start"),
+    )
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP, LargeBinary, Index, Integer, SmallInteger, Float
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
 
+from backend.board import board_array, board_cells, unpack_board
 from .base import Base
 
 class MasterBasePuzzle(Base):
@@ -14,3 +15,37 @@ class MasterBasePuzzle(Base):
     puzzle_type_id = Column(UUID(as_uuid=True), ForeignKey("master_puzzle_type.id"), nullable=False)
     author_id = Column(UUID(as_uuid=True), ForeignKey("master_user.id"), nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    # Canonical fingerprint over all board symmetries (backend/board.py)
+    solution_hash = Column(String(64), unique=True, index=True)
+    # Packed board: W, H, D bytes + one piece letter per voxel (backend/board.py)
+    board = Column(LargeBinary)
+    # Solver-derived difficulty with the anchor piece placed (backend/solver/metrics.py)
+    solver_nodes = Column(Integer)
+    solver_solutions = Column(Integer)
+    branching_factor = Column(Float)
+    forced_moves = Column(SmallInteger)
+    metrics_version = Column(SmallInteger)
+
+    __table_args__ = (
+        # Keyset pagination / export order (GET /puzzles)
+        Index("ix_master_base_puzzle_created_at_id", "created_at", "id"),
+        # Listing by difficulty
+        Index("ix_master_base_puzzle_solver_nodes_id", "solver_nodes", "id"),
+        # GET /puzzles/by-name and the importer's "<size>_%" prefix scans
+        Index("ix_master_base_puzzle_name", "name", postgresql_ops={"name": "varchar_pattern_ops"}),
+        # Foreign keys
+        Index("ix_master_base_puzzle_puzzle_type_id", "puzzle_type_id"),
+        Index("ix_master_base_puzzle_author_id", "author_id"),
+    )
+
+    @property
+    def board_dims(self):
+        return unpack_board(self.board)[0] if self.board is not None else None
+
+    def board_array(self):
+        """Board as a (D, H, W) NumPy array of piece letters."""
+        return board_array(self.board)
+
+    def board_cells(self):
+        """Board as a list of (x, y, z, piece) tuples."""
+        return board_cells(self.board)
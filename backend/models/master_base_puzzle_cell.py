@@ -1,4 +1,4 @@
-from sqlalchemy import Column, SmallInteger, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, SmallInteger, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, CHAR
 import uuid
 
@@ -16,4 +16,7 @@ class MasterBasePuzzleCell(Base):
 
     __table_args__ = (
         UniqueConstraint("base_puzzle_id", "x", "y", "z", name="uq_base_puzzle_cell"),
+        # Board loads as an index-only scan; the table is CLUSTERed on it (migration c7e2a9d41f58)
+        Index("ix_master_base_puzzle_cell_board", "base_puzzle_id", postgresql_include=["x", "y", "z", "value"]),
+        Index("ix_master_base_puzzle_cell_value", "value"),
     )
@@ -0,0 +1,28 @@
+# ✅ backend/pieces.py
+"""
+Master piece definitions, the source of master_piece.shape_json.
+
+Shapes are [x, y, z] cells of one canonical orientation, drawn as in the
+PIECE_DEF table of tools/pentomino/solver.rb.
+"""
+
+PIECE_DEFINITIONS = {
+    'F': {'name': 'F', 'shape_json': [[1, 0, 0], [2, 0, 0], [0, 1, 0], [1, 1, 0], [1, 2, 0]]},
+    'I': {'name': 'I', 'shape_json': [[0, 0, 0], [0, 1, 0], [0, 2, 0], [0, 3, 0], [0, 4, 0]]},
+    'L': {'name': 'L', 'shape_json': [[0, 0, 0], [0, 1, 0], [0, 2, 0], [0, 3, 0], [1, 3, 0]]},
+    'P': {'name': 'P', 'shape_json': [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0], [0, 2, 0]]},
+    'N': {'name': 'N', 'shape_json': [[0, 0, 0], [0, 1, 0], [0, 2, 0], [1, 2, 0], [1, 3, 0]]},
+    'T': {'name': 'T', 'shape_json': [[0, 0, 0], [1, 0, 0], [2, 0, 0], [1, 1, 0], [1, 2, 0]]},
+    'U': {'name': 'U', 'shape_json': [[0, 0, 0], [2, 0, 0], [0, 1, 0], [1, 1, 0], [2, 1, 0]]},
+    'V': {'name': 'V', 'shape_json': [[0, 0, 0], [0, 1, 0], [0, 2, 0], [1, 2, 0], [2, 2, 0]]},
+    'W': {'name': 'W', 'shape_json': [[0, 0, 0], [1, 0, 0], [1, 1, 0], [2, 1, 0], [2, 2, 0]]},
+    'X': {'name': 'X', 'shape_json': [[1, 0, 0], [0, 1, 0], [1, 1, 0], [2, 1, 0], [1, 2, 0]]},
+    'Y': {'name': 'Y', 'shape_json': [[1, 0, 0], [0, 1, 0], [1, 1, 0], [1, 2, 0], [1, 3, 0]]},
+    'Z': {'name': 'Z', 'shape_json': [[0, 0, 0], [1, 0, 0], [1, 1, 0], [1, 2, 0], [2, 2, 0]]},
+}
+
+# Fillers for the 64- and 63-cell boards without a hole (8x8, 7x9).
+EXTRA_PIECE_DEFINITIONS = {
+    's': {'name': 's', 'shape_json': [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]]},
+    'b': {'name': 'b', 'shape_json': [[0, 0, 0], [0, 1, 0], [0, 2, 0]]},
+}
@@ -0,0 +1,4 @@
+# ✅ backend/realtime/__init__.py
+from .rooms import Room, blank_room, room_from_content_puzzle
+
+__all__ = ["Room", "blank_room", "room_from_content_puzzle"]
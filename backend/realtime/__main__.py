@@ -0,0 +1,7 @@
+# ✅ backend/realtime/__main__.py
+import sys
+
+from .server import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+# ✅ backend/realtime/loadtest.py
+"""
+Drives N simulated players against the realtime service and reports
+drop -> ack latency and the server-side validation time.
+
+    python -m backend.realtime.loadtest --clients 200 --rooms 20 --drops 50
+    python -m backend.realtime.loadtest --url ws://staging:8765 --clients 1000
+
+Without --url a local server is started in a subprocess; a server given
+with --url must run with --allow-blank. Players drop
+random placements on blank boards, so most drops are rejections; both
+paths run the same validation.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from websockets.asyncio.client import connect
+
+from backend.solver.placements import load_index
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+async def player(url, room, name, drops, index, rng, stats):
+    async with connect(url) as websocket:
+        await websocket.send(json.dumps({"type": "join", "room": room, "player": name}))
+        while json.loads(await websocket.recv())["type"] != "state":
+            pass
+
+        for seq in range(1, drops + 1):
+            i = rng.randrange(len(index))
+            message = {"type": "drop", "seq": seq, "piece": index.piece(i),
+                       "cells": index.mask_to_points(index.masks[i])}
+            started = time.perf_counter()
+            await websocket.send(json.dumps(message))
+            while True:
+                reply = json.loads(await websocket.recv())
+                if reply["type"] == "diff":
+                    stats["diffs"] += 1
+                elif reply["type"] == "ack" and reply["seq"] == seq:
+                    break
+            stats["rtt_ms"].append((time.perf_counter() - started) * 1000)
+            stats["validate_us"].append(reply["validate_us"])
+            stats["accepted"] += reply["ok"]
+
+
+async def run_load(url, clients, rooms, drops, size, seed):
+    index = load_index(size)
+    stats = {"rtt_ms": [], "validate_us": [], "accepted": 0, "diffs": 0}
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        player(url, f"blank:{size}:{n % rooms}", f"p{n}", drops, index, random.Random(rng.random()), stats)
+        for n in range(clients)
+    ))
+    elapsed = time.perf_counter() - started
+    total = len(stats["rtt_ms"])
+    return {
+        "clients": clients,
+        "rooms": rooms,
+        "drops": total,
+        "accepted": stats["accepted"],
+        "diff_messages": stats["diffs"],
+        "seconds": elapsed,
+        "drops_per_sec": total / elapsed if elapsed else 0.0,
+        "rtt_p50_ms": percentile(stats["rtt_ms"], 50),
+        "rtt_p99_ms": percentile(stats["rtt_ms"], 99),
+        "validate_p50_us": percentile(stats["validate_us"], 50),
+        "validate_p99_us": percentile(stats["validate_us"], 99),
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_local_server():
+    port = _free_port()
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    process = subprocess.Popen([sys.executable, "-m", "backend.realtime", "--host", "127.0.0.1",
+                                "--port", str(port), "--allow-blank"], cwd=root)
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, f"ws://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Local realtime server did not start")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the realtime service.")
+    parser.add_argument("--url", help="Service URL (default: start a local server).")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--drops", type=int, default=50, help="Drops per client.")
+    parser.add_argument("--size", default="6x10")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON.")
+    args = parser.parse_args(argv)
+
+    process = None
+    url = args.url
+    if url is None:
+        process, url = start_local_server()
+    try:
+        result = asyncio.run(run_load(url, args.clients, max(1, args.rooms), args.drops, args.size, args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"BENCH: {result['drops']:,} drops from {args.clients} clients in {args.rooms} rooms "
+              f"in {result['seconds']:.2f} sec ({result['drops_per_sec']:,.0f} drops/sec, "
+              f"{result['accepted']} accepted, {result['diff_messages']} diff messages)")
+        print(f"BENCH: round trip p50 {result['rtt_p50_ms']:.2f} ms, p99 {result['rtt_p99_ms']:.2f} ms")
+        print(f"BENCH: validation p50 {result['validate_p50_us']:.1f} us, p99 {result['validate_p99_us']:.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# ✅ backend/realtime/rooms.py
+"""
+Play rooms: one shared board per puzzle being played.
+
+The board is a bitboard in the placement index layout
+(backend/solver/placements.py). A drop is looked up in the index (one dict
+probe for piece + cells) and accepted when a single AND with the board is
+zero and the piece is still unused.
+"""
+import time
+
+from backend.solver.placements import load_index
+
+
+class Room:
+    """
+    A board, the pieces still to place and the moves made so far.
+    Pure state; the server owns the connections and the broadcasting.
+    """
+
+    def __init__(self, key, size, cells=()):
+        """
+        `cells` are pre-placed (x, y, z, piece) voxels; their pieces count
+        as used.
+        """
+        self.key = key
+        self.size = size
+        self.index = load_index(size)
+        self.piece_bits = {piece_id: 1 << p for p, piece_id in enumerate(self.index.piece_ids)}
+
+        self.initial = [[x, y, z, piece] for x, y, z, piece in cells]
+        self.board = self.index.holes | self.index.points_to_mask((x, y, z) for x, y, z, _ in self.initial)
+        self.used = 0
+        for *_, piece_id in self.initial:
+            self.used |= self.piece_bits.get(piece_id, 0)
+        self.moves = []
+
+    @property
+    def solved(self):
+        return self.board == self.index.full
+
+    def remaining(self):
+        return [piece_id for piece_id in self.index.piece_ids if not self.used & self.piece_bits[piece_id]]
+
+    def state(self):
+        return {
+            "type": "state",
+            "room": self.key,
+            "size": self.size,
+            "dims": list(self.index.dims),
+            "cells": self.initial + [list(point) + [move["piece"]]
+                                     for move in self.moves for point in move["cells"]],
+            "pieces": self.remaining(),
+            "solved": self.solved,
+        }
+
+    def drop(self, player, piece_id, cells):
+        """
+        Validates and applies a drop. Returns (move, None) when accepted and
+        (None, reason) when rejected.
+        """
+        bit = self.piece_bits.get(piece_id) if isinstance(piece_id, str) else None
+        if bit is None:
+            return None, "unknown piece"
+        if self.used & bit:
+            return None, "piece already placed"
+        try:
+            # Raises for cells off the board before any work proportional to
+            # their coordinates is done.
+            mask = self.index.points_to_mask(tuple(cell) for cell in cells)
+        except (TypeError, ValueError):
+            return None, "bad cells"
+        placement = self.index.find(piece_id, mask)
+        if placement is None:
+            return None, "not a placement of this piece"
+        if self.board & mask:
+            return None, "overlaps the board"
+
+        self.board |= mask
+        self.used |= bit
+        move = {"player": player, "piece": piece_id,
+                "cells": [list(point) for point in self.index.mask_to_points(mask)],
+                "at": time.time()}
+        self.moves.append(move)
+        return move, None
+
+
+def blank_room(key):
+    """
+    An empty board for a 'blank:<size>' or 'blank:<size>:<name>' room key.
+    """
+    size = key.split(":")[1]
+    return Room(key, size)
+
+
+def room_from_content_puzzle(session, key):
+    """
+    Seeds a room from a ContentPuzzle (by id or code): its cells are
+    pre-placed and their pieces are used up. Returns None when not found.
+    """
+    import uuid
+
+    from sqlalchemy import select
+
+    from backend.models.content_puzzle import ContentPuzzle
+    from backend.models.content_puzzle_cell import ContentPuzzleCell
+    from backend.models.master_base_puzzle import MasterBasePuzzle
+
+    try:
+        condition = ContentPuzzle.id == uuid.UUID(key)
+    except ValueError:
+        condition = ContentPuzzle.code == key
+    row = session.execute(
+        select(ContentPuzzle.id, MasterBasePuzzle.name)
+        .join(MasterBasePuzzle, MasterBasePuzzle.id == ContentPuzzle.base_puzzle_id)
+        .where(condition)
+    ).first()
+    if row is None:
+        return None
+    puzzle_id, base_name = row
+
+    cells = session.execute(
+        select(ContentPuzzleCell.x, ContentPuzzleCell.y, ContentPuzzleCell.z, ContentPuzzleCell.piece_id)
+        .where(ContentPuzzleCell.puzzle_id == puzzle_id)
+    ).all()
+    # Base puzzles are named <size>_<index> by the importer.
+    size = base_name.rsplit("_", 1)[0]
+    return Room(key, size, cells)
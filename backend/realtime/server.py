@@ -0,0 +1,183 @@
+# ✅ backend/realtime/server.py
+"""
+asyncio WebSocket service for realtime play.
+
+    python -m backend.realtime --port 8765
+    python -m backend.realtime --allow-blank      # also serve blank:<size> rooms
+
+Messages are JSON objects:
+
+    -> {"type": "join", "room": "<content puzzle id or code | blank:6x10[:name]>", "player": "..."}
+    <- {"type": "state", ...}                      full board, to the joining player
+    -> {"type": "drop", "seq": 1, "piece": "X", "cells": [[x, y, z], ...]}
+    <- {"type": "ack", "seq": 1, "ok": true, "validate_us": 3.1}
+    <- {"type": "diff", "room": ..., "moves": [...], "solved": false}
+
+Accepted moves are broadcast to everyone in the room in batches, at most
+one diff message per room every BROADCAST_INTERVAL seconds.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from websockets.asyncio.server import broadcast, serve
+from websockets.exceptions import ConnectionClosed
+
+from .rooms import blank_room, room_from_content_puzzle
+
+BROADCAST_INTERVAL = float(os.environ.get("REALTIME_BROADCAST_INTERVAL", 0.05))
+
+
+class RoomChannel:
+    """
+    A room plus its connections and the moves waiting to be broadcast.
+    """
+
+    def __init__(self, room):
+        self.room = room
+        self.connections = set()
+        self.pending = []
+        self._flush_handle = None
+
+    def queue(self, move):
+        self.pending.append(move)
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(BROADCAST_INTERVAL, self.flush)
+
+    def flush(self):
+        self._flush_handle = None
+        if not self.pending:
+            return
+        message = json.dumps({"type": "diff", "room": self.room.key, "moves": self.pending,
+                              "solved": self.room.solved})
+        self.pending = []
+        broadcast(self.connections, message)
+
+
+class RealtimeServer:
+    def __init__(self, allow_blank=False):
+        self.allow_blank = allow_blank
+        self.channels = {}
+        self._loading = {}
+
+    async def _load_room(self, key):
+        if key.startswith("blank:"):
+            if not self.allow_blank:
+                return None
+            return blank_room(key)
+
+        from backend.db import Session, get_session
+
+        def load():
+            try:
+                return room_from_content_puzzle(get_session(), key)
+            finally:
+                Session.remove()
+
+        return await asyncio.to_thread(load)
+
+    async def channel(self, key):
+        """
+        The channel of a room, loading the room once even when several
+        players join at the same time.
+        """
+        channel = self.channels.get(key)
+        if channel is not None:
+            return channel
+        if key not in self._loading:
+            self._loading[key] = asyncio.ensure_future(self._load_room(key))
+        try:
+            room = await self._loading[key]
+        finally:
+            self._loading.pop(key, None)
+        if room is None:
+            return None
+        return self.channels.setdefault(key, RoomChannel(room))
+
+    async def handler(self, websocket):
+        channel = None
+        player = None
+        try:
+            async for raw in websocket:
+                try:
+                    message = json.loads(raw)
+                    kind = message["type"]
+                except (ValueError, KeyError, TypeError):
+                    await websocket.send(json.dumps({"type": "error", "reason": "bad message"}))
+                    continue
+
+                if kind == "join":
+                    if channel is not None:
+                        self._leave(channel, websocket)
+                    try:
+                        channel = await self.channel(str(message["room"]))
+                    except (KeyError, ValueError) as e:
+                        channel = None
+                        print(f"WARN: Could not open room {message.get('room')}: {e}")
+                    except Exception as e:
+                        # Database down or similar: drop this connection only.
+                        channel = None
+                        print(f"ERROR: Loading room {message.get('room')} failed: {e!r}")
+                        await websocket.close(1011, "room unavailable")
+                        return
+                    if channel is None:
+                        await websocket.send(json.dumps({"type": "error", "reason": "unknown room"}))
+                        continue
+                    player = str(message.get("player") or id(websocket))
+                    channel.connections.add(websocket)
+                    await websocket.send(json.dumps(channel.room.state()))
+
+                elif kind == "drop":
+                    if channel is None:
+                        await websocket.send(json.dumps({"type": "error", "reason": "join a room first"}))
+                        continue
+                    started = time.perf_counter()
+                    move, reason = channel.room.drop(player, message.get("piece"), message.get("cells") or ())
+                    elapsed_us = (time.perf_counter() - started) * 1e6
+                    ack = {"type": "ack", "seq": message.get("seq"), "ok": move is not None,
+                           "validate_us": round(elapsed_us, 2)}
+                    if reason:
+                        ack["reason"] = reason
+                    await websocket.send(json.dumps(ack))
+                    if move is not None:
+                        channel.queue(move)
+
+                elif kind == "state" and channel is not None:
+                    await websocket.send(json.dumps(channel.room.state()))
+        except ConnectionClosed:
+            pass
+        finally:
+            if channel is not None:
+                self._leave(channel, websocket)
+
+    def _leave(self, channel, websocket):
+        # A room lives as long as someone is in it.
+        channel.connections.discard(websocket)
+        if not channel.connections:
+            channel.flush()
+            if self.channels.get(channel.room.key) is channel:
+                del self.channels[channel.room.key]
+
+
+async def run(host, port, allow_blank=False):
+    server = RealtimeServer(allow_blank=allow_blank)
+    async with serve(server.handler, host, port) as ws_server:
+        print(f"INFO: Realtime service listening on ws://{host}:{port}")
+        await ws_server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Realtime play WebSocket service.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--allow-blank", action="store_true",
+                        help="Also allow empty 'blank:<size>' rooms (by default only content puzzles).")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run(args.host, args.port, args.allow_blank))
+    except KeyboardInterrupt:
+        pass
+    return 0
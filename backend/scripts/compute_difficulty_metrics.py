@@ -0,0 +1,239 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import sessionmaker
+
+# Allow `python backend/scripts/compute_difficulty_metrics.py` to import the backend package.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.board import board_cells, solution_from_cells
+from backend.db import create_db_engine, database_url
+from backend.models.all import ContentPuzzle, ContentPuzzleCell, MasterBasePuzzle
+from backend.solver import Solver
+from backend.solver.metrics import METRICS_VERSION, path_metrics, tree_metrics
+
+DEFAULT_BATCH_SIZE = 200
+# Base puzzles are measured with only the anchor piece placed; bound that search.
+DEFAULT_MAX_NODES = int(os.environ.get("METRICS_MAX_NODES", 2_000_000))
+
+
+@lru_cache(maxsize=None)
+def _solver(size):
+    # One Solver per worker process and size.
+    return Solver(size)
+
+
+@lru_cache(maxsize=4096)
+def _tree(size, occupied, pieces, max_nodes):
+    # Base puzzles sharing an anchor placement share the whole search tree.
+    return tree_metrics(_solver(size), occupied=occupied, pieces=list(pieces), max_nodes=max_nodes)
+
+
+def _masks(solver, cells):
+    return {piece["piece"]: solver.grid.points_to_mask(tuple(cell) for cell in piece["cells"])
+            for piece in solution_from_cells(cells)}
+
+
+def measure(task):
+    """
+    Worker entry point. task = (kind, row_id, size, board, kept_cells, max_nodes);
+    kept_cells are the (x, y, z, piece) cells of a content puzzle and None for
+    a base puzzle. Returns (row_id, metrics) or (row_id, None) when the row
+    cannot be measured.
+    """
+    kind, row_id, size, board, kept_cells, max_nodes = task
+    try:
+        solver = _solver(size)
+        solution = _masks(solver, board_cells(board))
+        if kind == "base":
+            anchor = solver.piece_ids[0]
+            occupied = solution[anchor]
+        else:
+            occupied = solver.grid.points_to_mask((x, y, z) for x, y, z, _ in kept_cells)
+            placed = {piece for _, _, _, piece in kept_cells}
+            anchor = None
+        pieces = tuple(p for p in solver.piece_ids if p != anchor and (kind == "base" or p not in placed))
+        nodes, solutions = _tree(size, occupied, pieces, max_nodes)
+        branching_factor, forced_moves = path_metrics(
+            solver, {p: solution[p] for p in pieces}, occupied=occupied, pieces=list(pieces))
+    except (KeyError, ValueError) as e:
+        print(f"WARN: Could not measure {kind} puzzle {row_id}: {e}")
+        return row_id, None
+    return row_id, {"solver_nodes": nodes, "solver_solutions": solutions,
+                    "branching_factor": branching_factor, "forced_moves": forced_moves,
+                    "metrics_version": METRICS_VERSION}
+
+
+def _size_filter(size):
+    return MasterBasePuzzle.name.like(size.replace("_", r"\_") + r"\_%", escape="\\")
+
+
+def iter_base_pages(session, size, batch_size):
+    """
+    Yields pages of (id, name, board) for base puzzles without current
+    metrics. Base boards are never rewritten, so only new rows (and rows
+    measured by an older METRICS_VERSION) are pending.
+    """
+    stmt = (
+        select(MasterBasePuzzle.id, MasterBasePuzzle.name, MasterBasePuzzle.board)
+        .where(or_(MasterBasePuzzle.metrics_version.is_(None), MasterBasePuzzle.metrics_version < METRICS_VERSION))
+        .order_by(MasterBasePuzzle.id)
+        .limit(batch_size)
+    )
+    if size:
+        stmt = stmt.where(_size_filter(size))
+    after = None
+    while True:
+        rows = session.execute(stmt if after is None else stmt.where(MasterBasePuzzle.id > after)).all()
+        if not rows:
+            return
+        after = rows[-1].id
+        yield rows
+
+
+def iter_content_pages(session, size, batch_size):
+    """
+    Yields pages of (id, updated_at, base name, base board, kept cells) for
+    content puzzles that are new, changed since they were measured or
+    measured by an older METRICS_VERSION.
+    """
+    stmt = (
+        select(ContentPuzzle.id, ContentPuzzle.updated_at, MasterBasePuzzle.name, MasterBasePuzzle.board)
+        .join(MasterBasePuzzle, MasterBasePuzzle.id == ContentPuzzle.base_puzzle_id)
+        .where(or_(ContentPuzzle.metrics_version.is_(None), ContentPuzzle.metrics_version < METRICS_VERSION,
+                   ContentPuzzle.metrics_updated_at < ContentPuzzle.updated_at))
+        .order_by(ContentPuzzle.id)
+        .limit(batch_size)
+    )
+    if size:
+        stmt = stmt.where(_size_filter(size))
+    after = None
+    while True:
+        rows = session.execute(stmt if after is None else stmt.where(ContentPuzzle.id > after)).all()
+        if not rows:
+            return
+        after = rows[-1].id
+        cells = {row.id: [] for row in rows}
+        for puzzle_id, x, y, z, piece_id in session.execute(
+            select(ContentPuzzleCell.puzzle_id, ContentPuzzleCell.x, ContentPuzzleCell.y, ContentPuzzleCell.z,
+                   ContentPuzzleCell.piece_id)
+            .where(ContentPuzzleCell.puzzle_id.in_(list(cells)))
+        ):
+            cells[puzzle_id].append((x, y, z, piece_id))
+        yield [(row.id, row.updated_at, row.name, row.board, cells[row.id]) for row in rows]
+
+
+def _base_tasks(page, max_nodes):
+    tasks, skipped = [], 0
+    for puzzle_id, name, board in page:
+        if board is None:
+            skipped += 1
+            continue
+        tasks.append(("base", puzzle_id, name.rsplit("_", 1)[0], bytes(board), None, max_nodes))
+    return tasks, {}, skipped
+
+
+def _content_tasks(page, max_nodes):
+    tasks, updated_at, skipped = [], {}, 0
+    for puzzle_id, row_updated_at, name, board, cells in page:
+        if board is None or not cells:
+            skipped += 1
+            continue
+        updated_at[puzzle_id] = row_updated_at
+        tasks.append(("content", puzzle_id, name.rsplit("_", 1)[0], bytes(board), cells, max_nodes))
+    return tasks, updated_at, skipped
+
+
+def _store_content(session, rows):
+    """
+    Writes content metrics only where the row is still the revision that was
+    measured (rows carry read_updated_at); a puzzle edited meanwhile keeps
+    its new updated_at and stays pending. Returns the number of rows written.
+    """
+    table = ContentPuzzle.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"), table.c.updated_at == bindparam("read_updated_at"))
+        # SET updated_at = updated_at: the metrics are not an edit, so no onupdate.
+        .values(updated_at=table.c.updated_at, metrics_updated_at=bindparam("read_updated_at"))
+    )
+    return session.connection().execute(stmt, rows).rowcount
+
+
+def compute(kind, size=None, workers=1, batch_size=DEFAULT_BATCH_SIZE, max_nodes=DEFAULT_MAX_NODES):
+    """
+    Measures every pending row of one table ('base' or 'content') and
+    stores the metrics. Returns the number of rows updated.
+    """
+    model, iter_pages, make_tasks = {
+        "base": (MasterBasePuzzle, iter_base_pages, _base_tasks),
+        "content": (ContentPuzzle, iter_content_pages, _content_tasks),
+    }[kind]
+
+    engine = create_db_engine(database_url())
+    session = sessionmaker(bind=engine)()
+    started = time.perf_counter()
+    measured = skipped = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for page in iter_pages(session, size, batch_size):
+                tasks, updated_at, page_skipped = make_tasks(page, max_nodes)
+                skipped += page_skipped
+                rows = []
+                for row_id, metrics in executor.map(measure, tasks, chunksize=max(1, len(tasks) // (workers * 4))):
+                    if metrics is None:
+                        skipped += 1
+                        continue
+                    if kind == "content":
+                        metrics["row_id"] = row_id
+                        metrics["read_updated_at"] = updated_at[row_id]
+                    else:
+                        metrics["id"] = row_id
+                    rows.append(metrics)
+                written = len(rows)
+                if rows and kind == "content":
+                    written = _store_content(session, rows)
+                    if written < len(rows):
+                        print(f"INFO: {len(rows) - written} content puzzle(s) changed while being measured; "
+                              "left for the next run.")
+                elif rows:
+                    session.execute(update(model), rows)
+                session.commit()
+                measured += written
+
+                elapsed = time.perf_counter() - started
+                print(f"PROGRESS: {measured} {kind} puzzles measured ({skipped} skipped) - "
+                      f"{measured / elapsed:.1f} puzzles/sec")
+    finally:
+        session.close()
+        engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    if skipped:
+        print(f"WARN: {skipped} {kind} puzzle(s) could not be measured (no board or not a tiling).")
+    print(f"SUCCESS: Measured {measured} {kind} puzzles in {elapsed:.2f} sec "
+          f"({measured / elapsed if elapsed else 0:.1f} puzzles/sec)")
+    return measured
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compute solver difficulty metrics for new or changed puzzles.")
+    parser.add_argument("--table", choices=["base", "content", "all"], default="all",
+                        help="Which puzzles to measure.")
+    parser.add_argument("--size", help="Only puzzles of this board size (e.g., 6x10).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Rows per pool batch and update.")
+    parser.add_argument("--max-nodes", type=int, default=DEFAULT_MAX_NODES,
+                        help="Search budget per puzzle; solver_solutions stays NULL when it is hit.")
+    args = parser.parse_args()
+
+    for kind in (["content", "base"] if args.table == "all" else [args.table]):
+        compute(kind, size=args.size, workers=max(1, args.workers), batch_size=args.batch_size,
+                max_nodes=args.max_nodes)
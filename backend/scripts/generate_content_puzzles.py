@@ -0,0 +1,207 @@
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import sessionmaker
+
+# Allow `python backend/scripts/generate_content_puzzles.py` to import the backend package.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.board import board_cells, solution_from_cells
+from backend.db import create_db_engine, database_url
+from backend.master_data import registry
+from backend.models.all import ContentPuzzle, ContentPuzzleCell, MasterBasePuzzle
+from backend.solver import Solver
+from backend.solver.placements import load_index
+
+# Difficulty -> number of pieces the player has to place.
+DIFFICULTY_LEVELS = {
+    "Easy": 3,
+    "Normal": 5,
+    "Hard": 7,
+    "Expert": 9,
+}
+DEFAULT_ATTEMPTS = 20
+DEFAULT_BATCH_SIZE = 200
+
+
+@lru_cache(maxsize=None)
+def _solver(size):
+    # One Solver per worker process and size.
+    return Solver(size)
+
+
+def puzzle_code(base_puzzle_id, removed):
+    """
+    Deterministic 12-character code for a base puzzle with a set of pieces
+    removed, so re-running the generator finds its earlier puzzles.
+    """
+    digest = hashlib.sha256(f"{base_puzzle_id}:{''.join(sorted(removed))}".encode()).hexdigest()
+    return digest[:12].upper()
+
+
+def make_puzzle(task):
+    """
+    Worker entry point. Removes `pieces_to_place` random pieces from a base
+    solution until the rest of the board has exactly one completion.
+    Returns (base_puzzle_id, removed, kept_cells) or None after `attempts`.
+    """
+    base_puzzle_id, size, board, pieces_to_place, attempts, seed = task
+    solution = solution_from_cells(board_cells(board))
+    index = load_index(size)
+    solver = _solver(size)
+    masks = {piece["piece"]: index.points_to_mask(tuple(cell) for cell in piece["cells"]) for piece in solution}
+    piece_ids = sorted(masks)
+    if pieces_to_place > len(piece_ids):
+        return None
+
+    rng = random.Random(seed)
+    tried = set()
+    for _ in range(attempts):
+        removed = tuple(sorted(rng.sample(piece_ids, pieces_to_place)))
+        if removed in tried:
+            continue
+        tried.add(removed)
+        occupied = 0
+        for piece_id, mask in masks.items():
+            if piece_id not in removed:
+                occupied |= mask
+        # Stop at the second completion: only "exactly one" matters.
+        if solver.count(occupied=occupied, pieces=list(removed), limit=2, symmetry=False) == 1:
+            kept = [(x, y, z, piece["piece"]) for piece in solution if piece["piece"] not in removed
+                    for x, y, z in piece["cells"]]
+            return base_puzzle_id, removed, kept
+    return None
+
+
+def get_difficulty(session, name):
+    return registry.ensure_one(session, "difficulty", name,
+                               description=f"{DIFFICULTY_LEVELS[name]} pieces to place.")
+
+
+def iter_task_batches(session, size, pieces_to_place, attempts, seed, batch_size):
+    """
+    Yields lists of (task, (name, puzzle_type_id, author_id)), one task per
+    base puzzle of a size in catalogue order. Pages are read with a keyset
+    on (created_at, id), so no cursor stays open while batches are written.
+    """
+    stmt = (
+        select(MasterBasePuzzle.id, MasterBasePuzzle.name, MasterBasePuzzle.board,
+               MasterBasePuzzle.puzzle_type_id, MasterBasePuzzle.author_id, MasterBasePuzzle.created_at)
+        .where(MasterBasePuzzle.name.like(size.replace("_", r"\_") + r"\_%", escape="\\"))
+        .where(MasterBasePuzzle.board.is_not(None))
+        .order_by(MasterBasePuzzle.created_at, MasterBasePuzzle.id)
+        .limit(batch_size)
+    )
+    after = None
+    while True:
+        page_stmt = stmt if after is None else stmt.where(
+            tuple_(MasterBasePuzzle.created_at, MasterBasePuzzle.id) > after)
+        rows = session.execute(page_stmt).all()
+        if not rows:
+            return
+        after = (rows[-1].created_at, rows[-1].id)
+        yield [
+            ((puzzle_id, size, bytes(board), pieces_to_place, attempts, f"{seed}:{puzzle_id}:{pieces_to_place}"),
+             (name, puzzle_type_id, author_id))
+            for puzzle_id, name, board, puzzle_type_id, author_id, _ in rows
+        ]
+
+
+def insert_batch(session, accepted, base_info, difficulty):
+    """
+    Bulk-inserts accepted puzzles and their cells, skipping codes that
+    already exist. Returns the number of puzzles inserted.
+    """
+    codes = {puzzle_code(base_id, removed): (base_id, removed, kept) for base_id, removed, kept in accepted}
+    existing = set(session.scalars(select(ContentPuzzle.code).where(ContentPuzzle.code.in_(list(codes)))))
+
+    puzzles, cells = [], []
+    for code, (base_id, removed, kept) in codes.items():
+        if code in existing:
+            continue
+        name, puzzle_type_id, author_id = base_info[base_id]
+        puzzle_id = uuid.uuid4()
+        puzzles.append({
+            "id": puzzle_id,
+            "base_puzzle_id": base_id,
+            "code": code,
+            "title": f"{name} {difficulty.name}",
+            "description": f"Place {', '.join(removed)} to complete {name}.",
+            "difficulty_id": difficulty.id,
+            "puzzle_type_id": puzzle_type_id,
+            "author_id": author_id,
+        })
+        cells.extend({"id": uuid.uuid4(), "puzzle_id": puzzle_id, "x": x, "y": y, "z": z, "piece_id": piece}
+                     for x, y, z, piece in kept)
+
+    if puzzles:
+        session.execute(insert(ContentPuzzle), puzzles)
+        session.execute(insert(ContentPuzzleCell), cells)
+    session.commit()
+    return len(puzzles)
+
+
+def generate(size, difficulty_name, count, workers=1, attempts=DEFAULT_ATTEMPTS,
+             batch_size=DEFAULT_BATCH_SIZE, seed=0):
+    if difficulty_name not in DIFFICULTY_LEVELS:
+        raise ValueError(f"Unknown difficulty: {difficulty_name}")
+    pieces_to_place = DIFFICULTY_LEVELS[difficulty_name]
+
+    engine = create_db_engine(database_url())
+    session = sessionmaker(bind=engine)()
+    difficulty = get_difficulty(session, difficulty_name)
+
+    started = time.perf_counter()
+    generated = rejected = checked = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for page in iter_task_batches(session, size, pieces_to_place, attempts, seed, batch_size):
+                if generated >= count:
+                    break
+                batch = [task for task, _ in page]
+                base_info = {task[0]: info for task, info in page}
+
+                results = list(executor.map(make_puzzle, batch, chunksize=max(1, len(batch) // (workers * 4))))
+                checked += len(batch)
+                accepted = [result for result in results if result is not None]
+                rejected += len(batch) - len(accepted)
+                generated += insert_batch(session, accepted[:count - generated], base_info, difficulty)
+
+                elapsed = time.perf_counter() - started
+                print(f"PROGRESS: {generated}/{count} puzzles from {checked} base puzzles "
+                      f"({rejected} without a unique puzzle) - {generated / elapsed:.1f} puzzles/sec")
+    finally:
+        session.close()
+        engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    print(f"SUCCESS: Generated {generated} {difficulty_name} {size} puzzles in {elapsed:.2f} sec "
+          f"({generated / elapsed if elapsed else 0:.1f} puzzles/sec)")
+    return generated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate ContentPuzzles with a unique completion.")
+    parser.add_argument("--size", required=True, help="Board size of the base puzzles (e.g., 6x10).")
+    parser.add_argument("--difficulty", choices=DIFFICULTY_LEVELS, default="Normal",
+                        help="Target difficulty; sets how many pieces the player places.")
+    parser.add_argument("--count", type=int, default=100, help="Number of puzzles to generate.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes for the uniqueness checks.")
+    parser.add_argument("--attempts", type=int, default=DEFAULT_ATTEMPTS,
+                        help="Piece subsets to try per base puzzle.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Base puzzles per pool batch and insert.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; same seed, same puzzles.")
+    args = parser.parse_args()
+
+    generate(args.size, args.difficulty, args.count, workers=max(1, args.workers),
+             attempts=args.attempts, batch_size=args.batch_size, seed=args.seed)
@@ -1,208 +1,728 @@
 import argparse
+import hashlib
+import io
+import itertools
 import json
+import math
 import os
+import sys
+import time
 import uuid
-from sqlalchemy import create_engine, Column, String, Text, ForeignKey, TIMESTAMP, Integer, Boolean
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.dialects.postgresql import UUID, JSONB, CHAR
-from sqlalchemy.sql import func
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from sqlalchemy import delete, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
 
-# Base for declarative models
-Base = declarative_base()
-
-# --- Model Definitions ---
-# NOTE: These definitions must be kept in sync with the main models.
-
-class MasterPiece(Base):
-    __tablename__ = "master_piece"
-    id = Column(String(1), primary_key=True)
-    name = Column(String(32), nullable=False)
-    shape_json = Column(JSONB, nullable=False)
-
-class MasterBasePuzzle(Base):
-    __tablename__ = "master_base_puzzle"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name = Column(String(128), nullable=False, unique=True)
-    description = Column(Text)
-    puzzle_type_id = Column(UUID(as_uuid=True), ForeignKey("master_puzzle_type.id"), nullable=False)
-    author_id = Column(UUID(as_uuid=True), ForeignKey("master_user.id"), nullable=False)
-    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
-
-class MasterBasePuzzleCell(Base):
-    __tablename__ = "master_base_puzzle_cell"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    base_puzzle_id = Column(UUID(as_uuid=True), ForeignKey("master_base_puzzle.id", ondelete="CASCADE"), nullable=False)
-    x = Column(Integer, nullable=False)
-    y = Column(Integer, nullable=False)
-    z = Column(Integer, nullable=False)
-    value = Column(CHAR(1), ForeignKey("master_piece.id"), nullable=False)
-
-class MasterDifficulty(Base):
-    __tablename__ = "master_difficulty"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name = Column(String(50), nullable=False, unique=True)
-    description = Column(String(255), nullable=True)
-
-class MasterPuzzleType(Base):
-    __tablename__ = "master_puzzle_type"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name = Column(String(50), nullable=False, unique=True)
-    description = Column(String(255), nullable=True)
-
-class MasterUser(Base):
-    __tablename__ = "master_user"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    username = Column(String(50), nullable=False, unique=True)
-    email = Column(String(128), nullable=False, unique=True)
-    password_hash = Column(Text)
-    is_active = Column(Boolean, nullable=False, default=True)
-    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
-    updated_at = Column(TIMESTAMP, nullable=False, server_default=func.now(), onupdate=func.now())
-
-# --- Helper Functions ---
-def get_or_create(session, model, defaults=None, **kwargs):
-    """
-    Gets an object or creates it if it does not exist.
-    """
-    instance = session.query(model).filter_by(**kwargs).first()
-    if instance:
-        return instance, False
+# Allow `python backend/scripts/solution_data_import.py` to import the backend package.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.board import board_dims, canonical_fingerprint, pack_board
+from backend import metrics
+from backend.db import create_db_engine
+from backend.master_data import registry
+# The whole model set, so every foreign key of the tables written here resolves.
+from backend.models.all import ImportManifest, ImportShard, MasterBasePuzzle, MasterBasePuzzleCell
+from backend.pieces import PIECE_DEFINITIONS
+from backend.solution_reader import iter_solutions, prefetch
+
+# --- Main Import Logic ---
+IMPORT_MODES = ("orm", "copy")
+DEFAULT_CHUNK_SIZE = 1000
+
+# plan_shards keeps the byte offset of every OFFSET_EVERY-th solution, so a
+# worker seeks close to its shard instead of decoding the file up to it.
+OFFSET_EVERY = 256
+
+PUZZLE_COPY_COLUMNS = ("id", "name", "description", "puzzle_type_id", "author_id", "solution_hash", "board")
+CELL_COPY_COLUMNS = ("id", "base_puzzle_id", "x", "y", "z", "value")
+
+
+@dataclass(frozen=True)
+class ImportOptions:
+    mode: str = "orm"
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    # Rows in master_base_puzzle_cell; the packed board column is always written.
+    write_cells: bool = True
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    Solutions [start, stop) of one file, checkpointed in the import_shard
+    row shard_id. The worker seeks to `offset`, the byte offset of solution
+    `base` (<= start), and decodes from there.
+    """
+    file_size: str
+    filepath: str
+    start: int
+    stop: int
+    base: int = 0
+    offset: int = None
+    shard_id: uuid.UUID = None
+
+
+@dataclass
+class Checkpoint:
+    """
+    Import progress of one file or shard. With a row_id, the last solution
+    index of every commit is written to that row of `model` (import_manifest,
+    or import_shard for a --workers shard) in the same transaction; after a
+    failed row or chunk the checkpoint stops advancing, so the next run
+    resumes before it. read_solutions() sets complete once it reached the end
+    of the file.
+    """
+    row_id: uuid.UUID = None
+    failed: bool = False
+    model: type = ImportManifest
+    complete: bool = False
+
+
+def prepare_master_data(session):
+    """
+    Creates the master rows every imported puzzle depends on. When they all
+    exist this is the registry's single query (backend/master_data.py).
+    Returns (author, puzzle_type, difficulty) as MasterRows.
+    """
+    # 1. Pieces
+    registry.ensure(session, "piece", PIECE_DEFINITIONS)
+
+    # 2. Other Master Data
+    dummy_author = registry.ensure_one(session, "user", "dummy_author",
+                                       email="author@example.com", password_hash="...")
+    dummy_puzzle_type = registry.ensure_one(session, "puzzle_type", "Pentomino",
+                                            description="A pentomino puzzle.")
+    dummy_difficulty = registry.ensure_one(session, "difficulty", "Standard",
+                                           description="Standard difficulty.")
+    return dummy_author, dummy_puzzle_type, dummy_difficulty
+
+
+def iter_solution_files(json_dir, size_filter):
+    """
+    Yields (file_size, filepath) for every solutions_<size>.json matching the filter.
+    """
+    for filename in sorted(os.listdir(json_dir)):
+        if not (filename.startswith("solutions_") and filename.endswith(".json")):
+            continue
+
+        file_size = filename.replace("solutions_", "").replace(".json", "")
+        if size_filter != "all" and file_size != size_filter:
+            continue
+
+        yield file_size, os.path.join(json_dir, filename)
+
+
+def file_hash(filepath):
+    """
+    sha256 of a file's contents, read in 1 MiB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def open_manifest(session, file_size, filepath):
+    """
+    The import_manifest row of a file, (re)started when the file is new or
+    its contents changed. Returns (manifest, unchanged) where unchanged
+    means the file was already imported completely.
+    """
+    file_name = os.path.basename(filepath)
+    digest = file_hash(filepath)
+    manifest = session.query(ImportManifest).filter_by(file_name=file_name).first()
+    if manifest is not None and manifest.file_hash == digest and manifest.size == file_size:
+        return manifest, manifest.completed
+
+    if manifest is None:
+        manifest = ImportManifest(file_name=file_name)
+        session.add(manifest)
     else:
-        params = {**kwargs, **(defaults or {})}
-        instance = model(**params)
-        session.add(instance)
+        if manifest.last_index >= 0:
+            print(f"INFO: {file_name} changed since the last import; starting it over.")
+        # Shard ranges and progress belong to the old contents, whatever
+        # the serial progress was.
+        session.execute(delete(ImportShard).where(ImportShard.manifest_id == manifest.id))
+    manifest.size = file_size
+    manifest.file_hash = digest
+    manifest.last_index = -1
+    manifest.total_solutions = None
+    manifest.completed = False
+    session.commit()
+    return manifest, False
+
+
+def complete_manifest(session, manifest_id, total_solutions):
+    session.execute(
+        update(ImportManifest).where(ImportManifest.id == manifest_id)
+        .values(last_index=total_solutions - 1, total_solutions=total_solutions, completed=True))
+    session.execute(delete(ImportShard).where(ImportShard.manifest_id == manifest_id))
+    session.commit()
+
+
+def counted(solutions, position):
+    """
+    Passes solutions through, keeping the index of the last one read in position[0].
+    """
+    for solution in solutions:
+        position[0] += 1
+        yield solution
+
+
+def read_solutions(filepath, offset=None, checkpoint=None):
+    """
+    Streams the solutions of one file, from the solution at byte `offset`
+    when given. A decoding error ends the stream with a warning; solutions
+    read before it are still imported, but checkpoint.complete stays False.
+    """
+    try:
+        yield from prefetch(iter_solutions(filepath, offset=offset))
+    except json.JSONDecodeError as e:
+        print(f"WARN: Could not decode JSON from {os.path.basename(filepath)}. Skipping the rest of the file. Error: {e}")
+        return
+    if checkpoint is not None:
+        checkpoint.complete = True
+
+
+def iter_solution_cells(solution_pieces):
+    """
+    Yields (x, y, z, piece_id) for every cell of a solution.
+    """
+    for piece_data in solution_pieces:
+        piece_id = piece_data["piece"]
+        for cell_coords in piece_data["cells"]:
+            yield (
+                cell_coords[0],
+                cell_coords[1],
+                cell_coords[2] if len(cell_coords) > 2 else 0,
+                piece_id,
+            )
+
+
+def load_existing_names(session, file_size):
+    """
+    Fetches every slug already stored for a size in a single query.
+    """
+    rows = session.query(MasterBasePuzzle.name).filter(
+        MasterBasePuzzle.name.like(f"{file_size}\\_%", escape="\\"))
+    return {name for (name,) in rows}
+
+
+def load_existing_hashes(session):
+    """
+    Fetches the canonical fingerprint of every stored solution in a single query.
+    """
+    rows = session.query(MasterBasePuzzle.solution_hash).filter(
+        MasterBasePuzzle.solution_hash.isnot(None))
+    return {solution_hash for (solution_hash,) in rows}
+
+
+def iter_new_solutions(file_size, solutions, existing_names, known_hashes, start=0):
+    """
+    Yields (index, slug, solution_pieces, solution_hash, board) for solutions
+    that are not stored yet, neither under their slug nor as a rotated/mirrored copy.
+    """
+    for index, solution_pieces in enumerate(solutions, start):
+        slug = f"{file_size}_{index:04d}"
+        if slug in existing_names:
+            print(f"INFO: Skipping existing master_base_puzzle: {slug}")
+            continue
+
+        dims = board_dims(file_size, solution_pieces)
+        solution_hash = canonical_fingerprint(solution_pieces, dims)
+        if solution_hash in known_hashes:
+            print(f"INFO: Skipping duplicate solution: {slug}")
+            continue
+
+        yield index, slug, solution_pieces, solution_hash, pack_board(solution_pieces, dims)
+
+
+def import_file_orm(session, file_size, solutions, puzzle_type_id, author_id,
+                    known_hashes, start=0, write_cells=True, checkpoint=None):
+    """
+    Imports one file row by row, committing after every puzzle.
+    Returns (imported_puzzles, imported_cells).
+    """
+    checkpoint = checkpoint or Checkpoint()
+    existing_names = load_existing_names(session, file_size)
+    imported_puzzles = 0
+    imported_cells = 0
+
+    for index, slug, solution_pieces, solution_hash, board in iter_new_solutions(
+            file_size, solutions, existing_names, known_hashes, start):
         try:
+            # Create MasterBasePuzzle entry
+            master_base_puzzle = MasterBasePuzzle(
+                id=uuid.uuid4(),
+                name=slug,
+                description=f"Base puzzle for {slug}",
+                puzzle_type_id=puzzle_type_id,
+                author_id=author_id,
+                solution_hash=solution_hash,
+                board=board,
+            )
+            session.add(master_base_puzzle)
             session.flush()
-            return instance, True
-        except IntegrityError:
+
+            # Create MasterBasePuzzleCell entries
+            cells_to_add = [
+                MasterBasePuzzleCell(
+                    base_puzzle_id=master_base_puzzle.id,
+                    x=x,
+                    y=y,
+                    z=z,
+                    value=piece_id  # Use 'value' for piece_id
+                )
+                for x, y, z, piece_id in iter_solution_cells(solution_pieces)
+            ] if write_cells else []
+
+            if cells_to_add:
+                session.bulk_save_objects(cells_to_add)
+
+            if checkpoint.row_id and not checkpoint.failed:
+                session.execute(update(checkpoint.model).where(checkpoint.model.id == checkpoint.row_id)
+                                .values(last_index=index))
+            session.commit()
+            known_hashes.add(solution_hash)
+            print(f"SUCCESS: Imported master_base_puzzle {slug}")
+            imported_puzzles += 1
+            imported_cells += len(cells_to_add)
+
+        except Exception as e:
             session.rollback()
-            instance = session.query(model).filter_by(**kwargs).first()
-            return instance, False
-
-# --- Piece Definitions ---
-PIECE_DEFINITIONS = {
-    'F': {'name': 'F', 'shape_json': [[1, 0, 0], [2, 0, 0], [0, 1, 0], [1, 1, 0], [1, 2, 0]]},
-    'I': {'name': 'I', 'shape_json': [[0, 0, 0], [0, 1, 0], [0, 2, 0], [0, 3, 0], [0, 4, 0]]},
-    'L': {'name': 'L', 'shape_json': [[0, 0, 0], [0, 1, 0], [0, 2, 0], [0, 3, 0], [1, 3, 0]]},
-    'P': {'name': 'P', 'shape_json': [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0], [0, 2, 0]]},
-    'N': {'name': 'N', 'shape_json': [[1, 0, 0], [2, 0, 0], [0, 1, 0], [1, 1, 0], [0, 2, 0]]},
-    'T': {'name': 'T', 'shape_json': [[0, 0, 0], [1, 0, 0], [2, 0, 0], [1, 1, 0], [1, 2, 0]]},
-    'U': {'name': 'U', 'shape_json': [[0, 0, 0], [2, 0, 0], [0, 1, 0], [1, 1, 0], [2, 1, 0]]},
-    'V': {'name': 'V', 'shape_json': [[0, 0, 0], [0, 1, 0], [0, 2, 0], [1, 2, 0], [2, 2, 0]]},
-    'W': {'name': 'W', 'shape_json': [[0, 0, 0], [1, 0, 0], [1, 1, 0], [2, 1, 0], [2, 2, 0]]},
-    'X': {'name': 'X', 'shape_json': [[1, 0, 0], [0, 1, 0], [1, 1, 0], [2, 1, 0], [1, 2, 0]]},
-    'Y': {'name': 'Y', 'shape_json': [[1, 0, 0], [0, 1, 0], [1, 1, 0], [1, 2, 0], [1, 3, 0]]},
-    'Z': {'name': 'Z', 'shape_json': [[0, 0, 0], [1, 0, 0], [1, 1, 0], [1, 2, 0], [2, 2, 0]]},
-}
+            if isinstance(e, IntegrityError) and session.query(MasterBasePuzzle.id).filter(
+                    MasterBasePuzzle.solution_hash == solution_hash).first() is not None:
+                # Another worker stored the same solution meanwhile.
+                known_hashes.add(solution_hash)
+                print(f"INFO: Skipping duplicate solution: {slug}")
+                continue
+            print(f"ERROR: Failed to import master_base_puzzle {slug}. Error: {e}")
+            checkpoint.failed = True
 
-# --- Main Import Logic ---
-def import_solutions(json_dir, size_filter):
+    return imported_puzzles, imported_cells
+
+
+# --- COPY Bulk Loader ---
+def _copy_text(value):
+    """
+    Escapes a value for PostgreSQL COPY text format.
+    """
+    if value is None:
+        return "\\N"
+    return (str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r"))
+
+
+def _copy_line(values):
+    return "\t".join(_copy_text(v) for v in values) + "\n"
+
+
+def _copy_rows(cursor, table, columns, buffer):
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT text)",
+        buffer)
+
+
+def _copy_bytea(data):
+    return "\\x" + data.hex()
+
+
+def _copy_chunk(cursor, chunk, puzzle_type_id, author_id, write_cells=True):
+    """
+    Sends one chunk of (slug, solution_pieces, solution_hash, board) through COPY.
+    Returns the number of cell rows written.
+    """
+    puzzle_buffer = io.StringIO()
+    cell_buffer = io.StringIO()
+    cell_count = 0
+    for slug, solution_pieces, solution_hash, board in chunk:
+        puzzle_id = uuid.uuid4()
+        puzzle_buffer.write(_copy_line(
+            (puzzle_id, slug, f"Base puzzle for {slug}", puzzle_type_id, author_id,
+             solution_hash, _copy_bytea(board))))
+        if not write_cells:
+            continue
+        for x, y, z, piece_id in iter_solution_cells(solution_pieces):
+            cell_buffer.write(_copy_line((uuid.uuid4(), puzzle_id, x, y, z, piece_id)))
+            cell_count += 1
+
+    _copy_rows(cursor, MasterBasePuzzle.__tablename__, PUZZLE_COPY_COLUMNS, puzzle_buffer)
+    if cell_count:
+        _copy_rows(cursor, MasterBasePuzzleCell.__tablename__, CELL_COPY_COLUMNS, cell_buffer)
+    return cell_count
+
+
+def _is_unique_violation(error):
+    return getattr(error, "pgcode", None) == "23505"
+
+
+def import_file_copy(engine, session, file_size, solutions, puzzle_type_id, author_id,
+                     known_hashes, chunk_size=DEFAULT_CHUNK_SIZE, start=0, write_cells=True,
+                     checkpoint=None):
+    """
+    Imports one file through COPY FROM STDIN, committing once per chunk of solutions.
+    UUIDs are generated client-side so cell rows can reference their puzzle
+    without a round-trip. Returns (imported_puzzles, imported_cells).
+    """
+    checkpoint = checkpoint or Checkpoint()
+    existing_names = load_existing_names(session, file_size)
+    imported_puzzles = 0
+    imported_cells = 0
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+
+        def flush(chunk, last_index):
+            for retry in (False, True):
+                try:
+                    cell_count = _copy_chunk(cursor, chunk, puzzle_type_id, author_id, write_cells)
+                    if checkpoint.row_id and not checkpoint.failed:
+                        cursor.execute(f"UPDATE {checkpoint.model.__tablename__} SET last_index = %s, "
+                                       "updated_at = now() WHERE id = %s", (last_index, str(checkpoint.row_id)))
+                    connection.commit()
+                    break
+                except Exception as e:
+                    connection.rollback()
+                    if retry or not _is_unique_violation(e):
+                        print(f"ERROR: Failed to import master_base_puzzle {chunk[0][0]}..{chunk[-1][0]}. Error: {e}")
+                        checkpoint.failed = True
+                        return 0, 0
+                    # Another worker stored some of these solutions meanwhile.
+                    known_hashes.update(load_existing_hashes(session))
+                    existing_names.update(load_existing_names(session, file_size))
+                    session.rollback()
+                    chunk = [item for item in chunk
+                             if item[0] not in existing_names and item[2] not in known_hashes]
+                    if not chunk:
+                        return 0, 0
+
+            known_hashes.update(item[2] for item in chunk)
+            print(f"SUCCESS: Imported master_base_puzzle {chunk[0][0]}..{chunk[-1][0]} ({len(chunk)} puzzles)")
+            return len(chunk), cell_count
+
+        chunk = []
+        chunk_hashes = set()
+        for index, slug, solution_pieces, solution_hash, board in iter_new_solutions(
+                file_size, solutions, existing_names, known_hashes, start):
+            if solution_hash in chunk_hashes:
+                print(f"INFO: Skipping duplicate solution: {slug}")
+                continue
+
+            chunk.append((slug, solution_pieces, solution_hash, board))
+            chunk_hashes.add(solution_hash)
+            if len(chunk) >= chunk_size:
+                puzzles, cells = flush(chunk, index)
+                imported_puzzles += puzzles
+                imported_cells += cells
+                chunk = []
+                chunk_hashes = set()
+
+        if chunk:
+            puzzles, cells = flush(chunk, index)
+            imported_puzzles += puzzles
+            imported_cells += cells
+
+        cursor.close()
+    finally:
+        connection.close()
+
+    return imported_puzzles, imported_cells
+
+
+def import_file(engine, session, file_size, solutions, options, puzzle_type_id, author_id,
+                known_hashes, start=0, checkpoint=None):
+    """
+    Imports one stream of solutions with the configured mode.
+    Returns (imported_puzzles, imported_cells).
+    """
+    if options.mode == "copy":
+        return import_file_copy(engine, session, file_size, solutions,
+                                puzzle_type_id, author_id, known_hashes,
+                                chunk_size=options.chunk_size, start=start,
+                                write_cells=options.write_cells, checkpoint=checkpoint)
+    return import_file_orm(session, file_size, solutions,
+                           puzzle_type_id, author_id, known_hashes,
+                           start=start, write_cells=options.write_cells, checkpoint=checkpoint)
+
+
+# --- Parallel Import ---
+def count_solutions(filepath, every=OFFSET_EVERY):
+    """
+    Returns (total, offsets): the number of solutions in a file and the byte
+    offset of every `every`-th one (offsets[k] is solution k * every).
+    """
+    total = 0
+    offsets = []
+    for total, (offset, _) in enumerate(iter_solutions(filepath, with_offsets=True), 1):
+        if (total - 1) % every == 0:
+            offsets.append(offset)
+    return total, offsets
+
+
+def plan_shards(session, files, workers, min_shard_size):
+    """
+    Splits the unimported part of every file into contiguous solution ranges,
+    each checkpointed in its own import_shard row. A file with rows from an
+    interrupted run keeps its ranges, and the unfinished ones resume after
+    their checkpoint. Returns (shards, totals): a list of Shard and
+    {filepath: number of solutions}. A file that does not decode is left
+    out of both.
+    """
+    shards = []
+    totals = {}
+    for file_size, filepath, manifest_id, first in files:
+        try:
+            total, offsets = count_solutions(filepath)
+        except json.JSONDecodeError as e:
+            print(f"WARN: Could not decode JSON from {os.path.basename(filepath)}. Skipping the file. Error: {e}")
+            continue
+        totals[filepath] = total
+
+        ranges = session.query(ImportShard.id, ImportShard.start, ImportShard.stop, ImportShard.last_index,
+                               ImportShard.completed).filter(ImportShard.manifest_id == manifest_id) \
+            .order_by(ImportShard.start).all()
+        if ranges:
+            print(f"INFO: Resuming {len(ranges)} shard(s) of {filepath}")
+        elif total > first:
+            shard_size = max(min_shard_size, math.ceil((total - first) / workers))
+            ranges = [(uuid.uuid4(), start, min(start + shard_size, total), start - 1, False)
+                      for start in range(first, total, shard_size)]
+            session.add_all([ImportShard(id=shard_id, manifest_id=manifest_id, start=start, stop=stop,
+                                         last_index=last_index, completed=False)
+                             for shard_id, start, stop, last_index, _ in ranges])
+            session.commit()
+
+        for shard_id, start, stop, last_index, completed in ranges:
+            start = max(start, last_index + 1, first)
+            if completed or start >= stop:
+                continue
+            base = start - start % OFFSET_EVERY
+            shards.append(Shard(file_size, filepath, start, stop, base, offsets[base // OFFSET_EVERY], shard_id))
+    return shards, totals
+
+
+def import_shard(database_url, options, puzzle_type_id, author_id, shard):
+    """
+    Worker entry point: imports one Shard on its own engine, checkpointing
+    it in its import_shard row. Returns (shard, imported_puzzles,
+    imported_cells, failed).
+    """
+    engine = create_db_engine(database_url, pool_size=1, max_overflow=0)
+    session = sessionmaker(bind=engine)()
+    # Shards finish out of order, so only the parent records the file as done.
+    checkpoint = Checkpoint(shard.shard_id, model=ImportShard)
+    try:
+        known_hashes = load_existing_hashes(session)
+        position = [shard.start - 1]
+        solutions = counted(itertools.islice(read_solutions(shard.filepath, shard.offset),
+                                             shard.start - shard.base, shard.stop - shard.base), position)
+        puzzles, cells = import_file(engine, session, shard.file_size, solutions, options,
+                                     puzzle_type_id, author_id, known_hashes, start=shard.start,
+                                     checkpoint=checkpoint)
+        # A short read (the file was cut off since planning) leaves the shard open.
+        if position[0] != shard.stop - 1:
+            checkpoint.failed = True
+        if not checkpoint.failed:
+            session.execute(update(ImportShard).where(ImportShard.id == shard.shard_id)
+                            .values(last_index=shard.stop - 1, completed=True))
+            session.commit()
+    finally:
+        session.close()
+        engine.dispose()
+    return shard, puzzles, cells, checkpoint.failed
+
+
+def import_parallel(database_url, files, options, workers, puzzle_type_id, author_id):
+    """
+    Fans the shards out over a process pool and aggregates the worker totals.
+    Returns (imported_puzzles, imported_cells, finished) where finished lists
+    (manifest_id, total_solutions) of the files whose shards all succeeded.
+    """
+    engine = create_db_engine(database_url, pool_size=1, max_overflow=0)
+    session = sessionmaker(bind=engine)()
+    try:
+        shards, totals = plan_shards(session, files, workers, options.chunk_size)
+    finally:
+        # The pool forks below; don't carry this connection into it.
+        session.close()
+        engine.dispose()
+    print(f"INFO: Importing {len(shards)} shard(s) with {workers} workers")
+
+    imported_puzzles = 0
+    imported_cells = 0
+    failed_files = set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(import_shard, database_url, options,
+                            puzzle_type_id, author_id, shard): shard
+            for shard in shards
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            shard = futures[future]
+            try:
+                _, puzzles, cells, failed = future.result()
+            except Exception as e:
+                print(f"ERROR: Import worker failed. Error: {e}")
+                failed_files.add(shard.filepath)
+                continue
+            if failed:
+                failed_files.add(shard.filepath)
+            imported_puzzles += puzzles
+            imported_cells += cells
+            print(f"PROGRESS: {done}/{len(shards)} shards done "
+                  f"({shard.file_size} [{shard.start}, {shard.stop}): {puzzles} puzzles) "
+                  f"- {imported_puzzles} puzzles, {imported_cells} cells so far")
+
+    finished = [(manifest_id, totals[filepath]) for _, filepath, manifest_id, _ in files
+                if filepath in totals and filepath not in failed_files]
+    return imported_puzzles, imported_cells, finished
+
+
+def import_serial(engine, session, files, options, puzzle_type_id, author_id):
+    """
+    Imports the files one after another on a single session, checkpointing
+    each in import_manifest. Returns (imported_puzzles, imported_cells).
+    """
+    imported_puzzles = 0
+    imported_cells = 0
+    known_hashes = load_existing_hashes(session)
+
+    for file_size, filepath, manifest_id, start in files:
+        print(f"INFO: Processing file: {filepath}")
+        # Parse in a background thread so decoding overlaps with database writes.
+        position = [start - 1]
+        checkpoint = Checkpoint(manifest_id)
+        solutions = counted(itertools.islice(read_solutions(filepath, checkpoint=checkpoint), start, None),
+                            position)
+
+        puzzles, cells = import_file(engine, session, file_size, solutions, options,
+                                     puzzle_type_id, author_id, known_hashes, start=start,
+                                     checkpoint=checkpoint)
+        imported_puzzles += puzzles
+        imported_cells += cells
+        # A decoding error ends the file early; leave it open so it is retried.
+        if checkpoint.complete and not checkpoint.failed:
+            complete_manifest(session, manifest_id, position[0] + 1)
+
+    return imported_puzzles, imported_cells
+
+
+def pending_files(session, json_dir, size_filter):
+    """
+    The matching files that still need work: [(file_size, filepath, manifest_id, start)].
+    Files imported completely with unchanged contents are skipped without
+    reading a solution.
+    """
+    files = []
+    for file_size, filepath in iter_solution_files(json_dir, size_filter):
+        manifest, unchanged = open_manifest(session, file_size, filepath)
+        if unchanged:
+            print(f"INFO: Skipping unchanged file: {filepath} ({manifest.total_solutions} solutions)")
+            continue
+        start = manifest.last_index + 1
+        if start:
+            print(f"INFO: Resuming {filepath} after solution {manifest.last_index}")
+        files.append((file_size, filepath, manifest.id, start))
+    return files
+
+
+def refresh_solution_index(engine, json_dir, size_filter):
+    """
+    Adds the newly imported solutions to the placement index and the
+    similarity cell matrix of every imported size (backend/solution_index.py).
+    """
+    from backend.solution_index import refresh
+
+    session = sessionmaker(bind=engine)()
+    try:
+        for file_size, _ in iter_solution_files(json_dir, size_filter):
+            try:
+                added = refresh(session, file_size)
+            except ValueError as e:
+                print(f"WARN: No solution index for {file_size}: {e}")
+                continue
+            print(f"INFO: Solution index {file_size}: {added} solution(s) added")
+    finally:
+        session.close()
+
+
+def import_solutions(json_dir, size_filter, mode="orm", chunk_size=DEFAULT_CHUNK_SIZE, workers=1,
+                     write_cells=True, update_index=True, metrics_file=None):
     DATABASE_URL = os.environ.get("DATABASE_URL")
     if not DATABASE_URL:
         raise ValueError("DATABASE_URL environment variable not set.")
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unknown import mode: {mode}")
+    options = ImportOptions(mode=mode, chunk_size=chunk_size, write_cells=write_cells)
 
-    engine = create_engine(DATABASE_URL)
+    engine = create_db_engine(DATABASE_URL)
     Session = sessionmaker(bind=engine)
     session = Session()
 
     # --- Prepare Master Data ---
     try:
         print("INFO: Preparing master data...")
-        
-        # 1. Pieces
-        for piece_id, piece_data in PIECE_DEFINITIONS.items():
-            get_or_create(session, MasterPiece, id=piece_id, defaults=piece_data)
-
-        # 2. Other Master Data
-        dummy_author, _ = get_or_create(session, MasterUser,
-            username="dummy_author",
-            defaults={'email': 'author@example.com', 'password_hash': '...'})
-        
-        dummy_puzzle_type, _ = get_or_create(session, MasterPuzzleType,
-            name="Pentomino",
-            defaults={'description': 'A pentomino puzzle.'})
-
-        dummy_difficulty, _ = get_or_create(session, MasterDifficulty,
-            name="Standard",
-            defaults={'description': 'Standard difficulty.'})
-
-        session.commit()
+        dummy_author, dummy_puzzle_type, dummy_difficulty = prepare_master_data(session)
         print("INFO: Master data prepared successfully.")
     except Exception as e:
         session.rollback()
         print(f"FATAL: Could not prepare master data. Error: {e}")
         return
 
-    imported_puzzles = 0
-    imported_cells = 0
-
-    for filename in os.listdir(json_dir):
-        if not (filename.startswith("solutions_") and filename.endswith(".json")):
-            continue
-
-        file_size = filename.replace("solutions_", "").replace(".json", "")
-        if size_filter != "all" and file_size != size_filter:
-            continue
-
-        filepath = os.path.join(json_dir, filename)
-        print(f"INFO: Processing file: {filepath}")
-        with open(filepath, 'r') as f:
-            try:
-                solutions_data = json.load(f)
-            except json.JSONDecodeError:
-                print(f"WARN: Could not decode JSON from {filename}. Skipping.")
-                continue
-
-        for index, solution_pieces in enumerate(solutions_data):
-            slug = f"{file_size}_{index:04d}"
-
-            try:
-                # Create MasterBasePuzzle entry
-                master_base_puzzle, created = get_or_create(session, MasterBasePuzzle,
-                    name=slug,
-                    defaults={
-                        'description': f"Base puzzle for {slug}",
-                        'puzzle_type_id': dummy_puzzle_type.id,
-                        'author_id': dummy_author.id
-                    })
-                
-                if not created:
-                    print(f"INFO: Skipping existing master_base_puzzle: {slug}")
-                    continue
-
-                # Create MasterBasePuzzleCell entries
-                cells_to_add = []
-                for piece_data in solution_pieces:
-                    piece_id = piece_data["piece"]
-                    for cell_coords in piece_data["cells"]:
-                        cells_to_add.append(MasterBasePuzzleCell(
-                            base_puzzle_id=master_base_puzzle.id,
-                            x=cell_coords[0],
-                            y=cell_coords[1],
-                            z=cell_coords[2] if len(cell_coords) > 2 else 0,
-                            value=piece_id  # Use 'value' for piece_id
-                        ))
-                
-                if cells_to_add:
-                    session.bulk_save_objects(cells_to_add)
-
-                session.commit()
-                print(f"SUCCESS: Imported master_base_puzzle {slug}")
-                imported_puzzles += 1
-                imported_cells += len(cells_to_add)
-
-            except Exception as e:
-                print(f"ERROR: Failed to import master_base_puzzle {slug}. Error: {e}")
-                session.rollback()
+    puzzle_type_id, author_id = dummy_puzzle_type.id, dummy_author.id
+    started = time.perf_counter()
+    files = pending_files(session, json_dir, size_filter)
+    if workers > 1:
+        # Workers open their own connections; don't share this pool across the fork.
+        session.close()
+        engine.dispose()
+        imported_puzzles, imported_cells, finished = import_parallel(
+            DATABASE_URL, files, options, workers, puzzle_type_id, author_id)
+        session = Session()
+        for manifest_id, total_solutions in finished:
+            complete_manifest(session, manifest_id, total_solutions)
+        session.close()
+    else:
+        imported_puzzles, imported_cells = import_serial(
+            engine, session, files, options, puzzle_type_id, author_id)
+        session.close()
 
-    session.close()
+    elapsed = time.perf_counter() - started
+    metrics.record_import(MasterBasePuzzle.__tablename__, imported_puzzles, elapsed)
+    metrics.record_import(MasterBasePuzzleCell.__tablename__, imported_cells, elapsed)
     print(f"--- Import Summary ---Total puzzles imported: {imported_puzzles}Total cells imported: {imported_cells}")
+    print(f"INFO: {elapsed:.2f} sec, {imported_puzzles / elapsed if elapsed else 0:.1f} puzzles/sec, "
+          f"{imported_cells / elapsed if elapsed else 0:.1f} cells/sec")
+
+    if update_index:
+        refresh_solution_index(engine, json_dir, size_filter)
+    if metrics_file:
+        metrics.write_textfile(metrics_file)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Import solution data into the database.")
     parser.add_argument("--json-dir", required=True, help="Directory containing solutions_*.json files.")
     parser.add_argument("--size", default="all", help="Filter by puzzle size (e.g., 6x10) or 'all'.")
+    parser.add_argument("--mode", choices=IMPORT_MODES, default="orm",
+                        help="'orm' inserts row by row; 'copy' streams rows through PostgreSQL COPY.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Solutions per COPY batch and commit (copy mode only).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes; files are split into solution ranges.")
+    parser.add_argument("--no-cells", dest="write_cells", action="store_false",
+                        help="Only store the packed board column, skip master_base_puzzle_cell rows.")
+    parser.add_argument("--no-index", dest="update_index", action="store_false",
+                        help="Do not refresh the solution placement index after the import.")
+    parser.add_argument("--metrics-file",
+                        help="Write rows/sec and SQL latency metrics here in Prometheus text format.")
     args = parser.parse_args()
 
-    import_solutions(args.json_dir, args.size)
+    import_solutions(args.json_dir, args.size, mode=args.mode, chunk_size=args.chunk_size,
+                     workers=args.workers, write_cells=args.write_cells, update_index=args.update_index,
+                     metrics_file=args.metrics_file)
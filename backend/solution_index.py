@@ -0,0 +1,450 @@
+# ✅ backend/solution_index.py
+"""
+Inverted placement index over the stored solutions of a board size.
+
+Every solution is a row of placement numbers (backend/solver/placements.py,
+one per piece). The inverted side maps each placement number to the sorted
+solution numbers that use it, so the solutions compatible with k placed
+pieces are a k-way intersection of posting lists, smallest first.
+
+Files per size under SOLUTION_INDEX_DIR, all raw little-endian arrays that
+are memory-mapped on load:
+
+    <size>.ids        16-byte puzzle UUIDs, one per solution number
+    <size>.forward    uint16 [solutions x pieces] placement numbers (append-only)
+    <size>.offsets    uint64 [placements + 1] posting list bounds
+    <size>.postings   uint32 solution numbers grouped by placement
+    <size>.cells      uint8 [solutions x cells] piece number per cell in Grid
+                      bit order, HOLE for holes (append-only)
+    <size>.meta.json  counts and the (created_at, id) of the last indexed puzzle
+
+refresh() reads only puzzles newer than the last indexed one, appends them
+to the forward and cells files and rebuilds the inverted side from the
+forward rows in one vectorized pass. Files are never truncated below what
+the meta file counts; a rebuild writes new ones and os.replace()s them in,
+so workers that have the old ones mapped keep reading valid data.
+
+similar() ranks every stored solution by the number of cells on which it
+agrees with a query board, in the best of the board's orientations, by
+comparing blocks of cell rows against all orientations of the query at once.
+
+    python -m backend.solution_index --size 6x10 --refresh
+    python -m backend.solution_index --size 6x10 --similar <puzzle id>
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+import numpy as np
+
+from backend.board import board_cells, solution_from_cells
+from backend.solver.grid import Grid
+from backend.solver.placements import load_index
+
+FORMAT_VERSION = 1
+HOLE = 255
+# Rows compared per block in similar(); keeps the temporaries in cache.
+SIMILAR_BLOCK_ROWS = 8192
+INDEX_DIR = os.environ.get(
+    "SOLUTION_INDEX_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "var", "solution_index")),
+)
+
+
+def _paths(index_dir, size):
+    base = os.path.join(index_dir, size)
+    return {name: f"{base}.{name}" for name in ("ids", "forward", "offsets", "postings", "cells", "meta.json")}
+
+
+def _memmap(path, dtype, shape):
+    if not shape or 0 in shape:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+class SolutionIndex:
+    """
+    A loaded (memory-mapped) index of one size.
+    """
+
+    def __init__(self, size, index_dir=INDEX_DIR):
+        self.size = size
+        self.index_dir = index_dir
+        self.placements = load_index(size)
+        self.grid = Grid.from_size(size)
+        self.paths = _paths(index_dir, size)
+        self.meta = self._read_meta()
+
+        n = self.meta["solutions"]
+        pieces = len(self.placements.piece_ids)
+        self.ids = _memmap(self.paths["ids"], np.uint8, (n, 16))
+        self.forward = _memmap(self.paths["forward"], np.uint16, (n, pieces))
+        self.offsets = _memmap(self.paths["offsets"], np.uint64, (len(self.placements) + 1,)) \
+            if n else np.zeros(len(self.placements) + 1, dtype=np.uint64)
+        self.postings = _memmap(self.paths["postings"], np.uint32, (int(self.offsets[-1]),))
+        self.cells = self._load_cells()
+
+    def _load_cells(self):
+        n, cells = len(self), self.grid.size
+        try:
+            complete = os.path.getsize(self.paths["cells"]) >= n * cells
+        except FileNotFoundError:
+            complete = False
+        if complete or not n:
+            return _memmap(self.paths["cells"], np.uint8, (n, cells))
+        # Index written before the cells file existed; the next refresh adds it.
+        print(f"WARN: Solution index for {self.size} has no cells file; building it in memory.")
+        return _cell_rows(self.placements, np.asarray(self.forward), cells)
+
+    def _read_meta(self):
+        empty = {"format": FORMAT_VERSION, "size": self.size,
+                 "pieces": "".join(self.placements.piece_ids), "placements": len(self.placements),
+                 "solutions": 0, "last_created_at": None, "last_id": None}
+        try:
+            with open(self.paths["meta.json"]) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return empty
+        if any(meta.get(key) != empty[key] for key in ("format", "pieces", "placements")):
+            print(f"WARN: Solution index for {self.size} is out of date; it will be rebuilt.")
+            return empty
+        return meta
+
+    def __len__(self):
+        return self.meta["solutions"]
+
+    # --- Queries ---
+    def postings_of(self, placement):
+        return self.postings[int(self.offsets[placement]):int(self.offsets[placement + 1])]
+
+    def _match(self, placement_numbers):
+        lists = sorted((self.postings_of(p) for p in placement_numbers), key=len)
+        if not lists:
+            return np.arange(len(self), dtype=np.uint32)
+        result = np.asarray(lists[0])
+        for postings in lists[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, postings, assume_unique=True)
+        return result
+
+    def matching(self, placements, symmetric=True):
+        """
+        Solution numbers compatible with placed pieces {piece_id: mask}.
+        With symmetric=True rotated/mirrored positions match too, since
+        only one orientation of every solution is stored.
+        """
+        perms = [None] + (list(self.grid.symmetries) if symmetric else [])
+        found = []
+        for perm in perms:
+            numbers = []
+            for piece_id, mask in placements.items():
+                if perm is not None:
+                    mask = Grid.transform(mask, perm)
+                number = self.placements.find(piece_id, mask)
+                if number is None:
+                    break
+                numbers.append(number)
+            else:
+                found.append(self._match(numbers))
+        if not found:
+            return np.zeros(0, dtype=np.uint32)
+        return np.unique(np.concatenate(found))
+
+    def puzzle_ids(self, numbers):
+        return [uuid.UUID(bytes=bytes(self.ids[n])) for n in numbers]
+
+    def cell_row(self, solution):
+        """
+        A solution in [{piece, cells}] form as a row of the cells file.
+        """
+        numbers = {piece_id: p for p, piece_id in enumerate(self.placements.piece_ids)}
+        row = np.full(self.grid.size, HOLE, dtype=np.uint8)
+        for piece in solution:
+            if piece["piece"] not in numbers:
+                raise ValueError(f"Unknown piece: {piece['piece']}")
+            for cell in piece["cells"]:
+                point = tuple(cell) + (0,) * (3 - len(cell))
+                if not self.grid.is_inside(*point):
+                    raise ValueError(f"Cell {list(cell)} is outside the {self.size} board")
+                row[self.grid.offset(*point)] = numbers[piece["piece"]]
+        return row
+
+    def similarity(self, row):
+        """
+        Cells on which every stored solution agrees with `row` (from
+        cell_row()), taking the best of the board's orientations. Holes and
+        empty cells of the query never count.
+        """
+        # HOLE never equals a query cell, so holes and gaps drop out.
+        query = np.where(row == HOLE, HOLE - 1, row).astype(np.uint8)
+        variants = [query]
+        for perm in self.grid.symmetries:
+            variant = np.empty_like(query)
+            variant[list(perm)] = query
+            variants.append(variant)
+        variants = np.unique(np.stack(variants), axis=0)
+
+        scores = np.zeros(len(self), dtype=np.uint8)
+        for start in range(0, len(self), SIMILAR_BLOCK_ROWS):
+            block = np.asarray(self.cells[start:start + SIMILAR_BLOCK_ROWS])
+            best = scores[start:start + len(block)]
+            for variant in variants:
+                agree = (block == variant).view(np.uint8).sum(axis=1, dtype=np.uint8)
+                np.maximum(best, agree, out=best)
+        return scores
+
+    def similar(self, row, k=10, exclude=()):
+        """
+        The k solutions most similar to `row` as [(solution number, agreeing
+        cells)], best first; ties go to the older solution.
+        """
+        scores = self.similarity(row).astype(np.int16)
+        scores[list(exclude)] = -1
+        k = min(k, int((scores >= 0).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(int(n), int(scores[n])) for n in top]
+
+    def number_of(self, puzzle_id):
+        """
+        Solution number of a puzzle, None when it is not indexed.
+        """
+        if not len(self):
+            return None
+        ids = np.ascontiguousarray(self.ids).view(np.dtype((np.void, 16))).ravel()
+        found = np.flatnonzero(ids == np.void(puzzle_id.bytes))
+        return int(found[0]) if len(found) else None
+
+
+_loaded = {}
+
+
+def load_solution_index(size, index_dir=INDEX_DIR):
+    """
+    The SolutionIndex of a size, reopened only when a refresh has rewritten
+    its meta file since the last call.
+    """
+    try:
+        stamp = os.stat(_paths(index_dir, size)["meta.json"]).st_mtime_ns
+    except FileNotFoundError:
+        stamp = None
+    key = (size, index_dir)
+    cached = _loaded.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = _loaded[key] = (stamp, SolutionIndex(size, index_dir))
+    return cached[1]
+
+
+def solution_placements(index, solution):
+    """
+    One row of placement numbers (in index.piece_ids order) for a solution
+    in [{piece, cells}] form; None when a piece is missing or illegal.
+    """
+    by_piece = {piece["piece"]: piece["cells"] for piece in solution}
+    row = []
+    for piece_id in index.piece_ids:
+        cells = by_piece.get(piece_id)
+        if cells is None:
+            return None
+        number = index.find(piece_id, index.points_to_mask(tuple(cell) + (0,) * (3 - len(cell)) for cell in cells))
+        if number is None:
+            return None
+        row.append(number)
+    return row
+
+
+def _new_puzzles(session, size, after, batch_size=1000):
+    """
+    Yields (id, created_at, solution) for the puzzles of a size created after
+    `after` = (created_at, id), in (created_at, id) order.
+    """
+    from sqlalchemy import select, tuple_
+
+    from backend.models.master_base_puzzle import MasterBasePuzzle
+    from backend.models.master_base_puzzle_cell import MasterBasePuzzleCell
+
+    stmt = (
+        select(MasterBasePuzzle.id, MasterBasePuzzle.created_at, MasterBasePuzzle.board)
+        .where(MasterBasePuzzle.name.like(size.replace("_", r"\_") + r"\_%", escape="\\"))
+        .order_by(MasterBasePuzzle.created_at, MasterBasePuzzle.id)
+    )
+    if after[0] is not None:
+        stmt = stmt.where(tuple_(MasterBasePuzzle.created_at, MasterBasePuzzle.id) > after)
+
+    for rows in session.execute(stmt.execution_options(yield_per=batch_size)).partitions():
+        missing = [puzzle_id for puzzle_id, _, board in rows if board is None]
+        cells = {puzzle_id: [] for puzzle_id in missing}
+        if missing:
+            for row in session.execute(
+                select(MasterBasePuzzleCell.base_puzzle_id, MasterBasePuzzleCell.x, MasterBasePuzzleCell.y,
+                       MasterBasePuzzleCell.z, MasterBasePuzzleCell.value)
+                .where(MasterBasePuzzleCell.base_puzzle_id.in_(missing))
+            ):
+                cells[row[0]].append(tuple(row[1:]))
+        for puzzle_id, created_at, board in rows:
+            rows_cells = board_cells(board) if board is not None else cells[puzzle_id]
+            yield puzzle_id, created_at, solution_from_cells(rows_cells)
+
+
+def _write_inverted(paths, forward, placements):
+    """
+    Rebuilds offsets/postings from the forward rows.
+    """
+    n, pieces = forward.shape
+    flat = np.asarray(forward, dtype=np.int64).ravel()
+    solutions = np.repeat(np.arange(n, dtype=np.uint32), pieces)
+    order = np.argsort(flat, kind="stable")
+    postings = solutions[order]
+    offsets = np.zeros(placements + 1, dtype=np.uint64)
+    np.cumsum(np.bincount(flat, minlength=placements), out=offsets[1:])
+
+    for name, data in (("offsets", offsets), ("postings", postings)):
+        tmp_path = paths[name] + ".tmp"
+        data.tofile(tmp_path)
+        os.replace(tmp_path, paths[name])
+
+
+def _cell_rows(placements, forward, cells):
+    """
+    Cells-file rows for forward rows: each placement's mask expanded to its
+    piece number on the covered cells.
+    """
+    masks = np.frombuffer(placements.masks, dtype=np.uint64)
+    bits = np.left_shift(np.uint64(1), np.arange(cells, dtype=np.uint64))
+    rows = np.full((len(forward), cells), HOLE, dtype=np.uint8)
+    for p in range(forward.shape[1]):
+        rows[(masks[forward[:, p]][:, None] & bits) != 0] = p
+    return rows
+
+
+def _append_cells(paths, forward, placements, cells, batch_size=65536):
+    """
+    Brings the cells file up to the forward rows. Only new rows are written,
+    so an index from before the cells file existed is filled in once.
+    """
+    done = 0
+    if os.path.exists(paths["cells"]):
+        done = min(os.path.getsize(paths["cells"]) // cells, len(forward))
+    with open(paths["cells"], "ab") as f:
+        f.truncate(done * cells)
+        for start in range(done, len(forward), batch_size):
+            f.write(_cell_rows(placements, forward[start:start + batch_size], cells).tobytes())
+
+
+def refresh(session, size, index_dir=INDEX_DIR):
+    """
+    Adds the puzzles imported since the last refresh. Returns the number of
+    solutions added.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    current = SolutionIndex(size, index_dir)
+    paths, meta = current.paths, dict(current.meta)
+    placements = current.placements
+    pieces = len(placements.piece_ids)
+
+    # Files written by this refresh; differs from paths only when rebuilding.
+    work = dict(paths)
+    if meta["solutions"] == 0:
+        # Fresh (or invalidated) index: write the append-only files anew beside
+        # the old ones, which workers may have memory-mapped, and swap them in
+        # once complete.
+        for name in ("ids", "forward", "cells"):
+            work[name] = paths[name] + ".new"
+            open(work[name], "wb").close()
+    else:
+        # Drop rows a crash may have appended after the last meta update.
+        for name, width in (("ids", 16), ("forward", pieces * 2)):
+            with open(paths[name], "r+b") as f:
+                f.truncate(meta["solutions"] * width)
+
+    last_created_at = datetime.fromisoformat(meta["last_created_at"]) if meta["last_created_at"] else None
+    last_id = uuid.UUID(meta["last_id"]) if meta["last_id"] else None
+    added = skipped = 0
+    with open(work["ids"], "ab") as ids_file, open(work["forward"], "ab") as forward_file:
+        for puzzle_id, created_at, solution in _new_puzzles(session, size, (last_created_at, last_id)):
+            last_created_at, last_id = created_at, puzzle_id
+            row = solution_placements(placements, solution)
+            if row is None:
+                skipped += 1
+                continue
+            ids_file.write(puzzle_id.bytes)
+            forward_file.write(np.asarray(row, dtype=np.uint16).tobytes())
+            added += 1
+    if skipped:
+        print(f"WARN: {skipped} {size} solution(s) are not complete tilings and were not indexed.")
+
+    meta["solutions"] += added
+    meta["last_created_at"] = last_created_at.isoformat() if last_created_at else None
+    meta["last_id"] = str(last_id) if last_id else None
+    forward = np.fromfile(work["forward"], dtype=np.uint16).reshape(meta["solutions"], pieces)
+    _write_inverted(work, forward, len(placements))
+    _append_cells(work, forward, placements, current.grid.size)
+    for name in ("ids", "forward", "cells"):
+        if work[name] != paths[name]:
+            os.replace(work[name], paths[name])
+
+    tmp_path = paths["meta.json"] + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, paths["meta.json"])
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the solution placement index.")
+    parser.add_argument("--size", required=True, help="Board size (e.g., 6x10).")
+    parser.add_argument("--refresh", action="store_true", help="Index the puzzles added since the last refresh.")
+    parser.add_argument("--query", metavar="FILE",
+                        help="Print the puzzles compatible with the [{piece, cells}] placements in FILE.")
+    parser.add_argument("--similar", metavar="PUZZLE_ID", type=uuid.UUID,
+                        help="Print the indexed puzzles most similar to an indexed puzzle.")
+    parser.add_argument("-k", type=int, default=10, help="Number of similar puzzles (default: 10).")
+    args = parser.parse_args(argv)
+
+    if args.refresh:
+        from backend.db import Session, get_session
+
+        started = time.perf_counter()
+        try:
+            added = refresh(get_session(), args.size)
+        finally:
+            Session.remove()
+        print(f"SUCCESS: Indexed {added} new {args.size} solution(s) in {time.perf_counter() - started:.2f} sec")
+
+    if args.query:
+        from backend.solver.hints import parse_placements
+
+        index = SolutionIndex(args.size)
+        with open(args.query) as f:
+            _, placements = parse_placements(index.placements, json.load(f))
+        started = time.perf_counter()
+        numbers = index.matching(placements)
+        elapsed = (time.perf_counter() - started) * 1000
+        for puzzle_id in index.puzzle_ids(numbers):
+            print(puzzle_id)
+        print(f"INFO: {len(numbers)} of {len(index)} solutions match ({elapsed:.2f} ms)")
+
+    if args.similar:
+        index = SolutionIndex(args.size)
+        number = index.number_of(args.similar)
+        if number is None:
+            print(f"ERROR: {args.similar} is not in the {args.size} index")
+            return 1
+        started = time.perf_counter()
+        found = index.similar(index.cells[number], args.k, exclude=[number])
+        elapsed = (time.perf_counter() - started) * 1000
+        for (n, score), puzzle_id in zip(found, index.puzzle_ids(n for n, _ in found)):
+            print(f"{puzzle_id} {score}/{index.grid.open_cells}")
+        print(f"INFO: Ranked {len(index)} solutions ({elapsed:.2f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
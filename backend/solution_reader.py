@@ -0,0 +1,194 @@
+# ✅ backend/solution_reader.py
+"""
+Incremental reader for solutions_<size>.json files.
+
+The solver writes one JSON array holding every solution, and the files in
+infra/docker are UTF-16 with a BOM. Instead of json.load on the whole file,
+the reader decodes fixed-size byte chunks and yields one solution
+(a list of {"piece", "cells"}) as soon as it is complete.
+"""
+import codecs
+import json
+import queue
+import threading
+
+CHUNK_SIZE = 64 * 1024
+
+# Longest BOM first: the UTF-32-LE BOM starts with the UTF-16-LE one.
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+_WHITESPACE = " \t\r\n"
+
+
+def detect_encoding(head):
+    """
+    Returns (encoding, bom_length) for the first bytes of a JSON document.
+    Without a BOM, the position of the NUL bytes around the leading ASCII
+    character decides (RFC 4627 section 3); anything else is UTF-8.
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+
+    if len(head) >= 4:
+        if head[0] == 0 and head[1] == 0 and head[2] == 0:
+            return "utf-32-be", 0
+        if head[1] == 0 and head[2] == 0 and head[3] == 0:
+            return "utf-32-le", 0
+    if len(head) >= 2:
+        if head[0] == 0:
+            return "utf-16-be", 0
+        if head[1] == 0:
+            return "utf-16-le", 0
+    return "utf-8", 0
+
+
+def _iter_text(f, chunk_size, offset=None):
+    head = f.read(max(chunk_size, 4))
+    encoding, bom_length = detect_encoding(head[:4])
+    decoder = codecs.getincrementaldecoder(encoding)()
+    # First the encoding and the byte position the text starts at.
+    yield encoding, bom_length if offset is None else offset
+
+    if offset is not None:
+        f.seek(offset)
+        data = f.read(chunk_size)
+    else:
+        data = head[bom_length:] or f.read(chunk_size)
+    while data:
+        text = decoder.decode(data)
+        if text:
+            yield text
+        data = f.read(chunk_size)
+
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_solutions(filepath, chunk_size=CHUNK_SIZE, offset=None, with_offsets=False):
+    """
+    Yields the elements of the top-level JSON array in filepath one at a time.
+    Only the element being decoded and one chunk of text are held in memory.
+    Raises json.JSONDecodeError on malformed input.
+
+    With with_offsets, yields (byte offset, element) instead. Passing such an
+    offset back as `offset` resumes the array at that element without
+    decoding the ones before it.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(filepath, "rb") as f:
+        chunks = _iter_text(f, chunk_size, offset)
+        encoding, consumed = next(chunks)
+        buffer = ""
+        pos = 0
+        eof = False
+        started = offset is not None
+        # consumed counts the bytes before buffer[counted] (with_offsets only).
+        counted = 0
+
+        def more():
+            nonlocal buffer, pos, eof, counted, consumed
+            if with_offsets:
+                consumed += len(buffer[counted:pos].encode(encoding))
+                counted = 0
+            try:
+                buffer = buffer[pos:] + next(chunks)
+            except StopIteration:
+                eof = True
+                buffer = buffer[pos:]
+            pos = 0
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    if not started:
+                        raise json.JSONDecodeError("Expecting '['", buffer, pos)
+                    raise json.JSONDecodeError("Unterminated array", buffer, pos)
+                more()
+                continue
+
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise json.JSONDecodeError("Expecting '['", buffer, pos)
+                started = True
+                pos += 1
+                continue
+            if char == "]":
+                return
+            if char == ",":
+                pos += 1
+                continue
+
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more()
+                continue
+
+            # A scalar that ends exactly at the buffer boundary may be truncated.
+            if end == len(buffer) and not eof:
+                more()
+                continue
+
+            if with_offsets:
+                consumed += len(buffer[counted:pos].encode(encoding))
+                counted = pos
+                yield consumed, element
+            else:
+                yield element
+            pos = end
+
+
+def prefetch(iterable, depth=256):
+    """
+    Runs iterable in a background thread and yields its items through a
+    bounded queue, so parsing overlaps with whatever the consumer is waiting
+    on (database round-trips). Exceptions are re-raised in the consumer.
+    """
+    items = queue.Queue(maxsize=depth)
+    done = object()
+    stop = threading.Event()
+
+    def put(entry):
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except BaseException as e:
+            put((done, e))
+
+    thread = threading.Thread(target=produce, name="solution-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
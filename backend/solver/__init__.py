@@ -0,0 +1,7 @@
+# ✅ backend/solver/__init__.py
+from .engine import SearchBudgetExceeded, Solver
+from .grid import Grid
+from .pieces import orientations
+from .placements import PlacementIndex, load_index
+
+__all__ = ["Grid", "PlacementIndex", "SearchBudgetExceeded", "Solver", "load_index", "orientations"]
@@ -0,0 +1,90 @@
+# ✅ backend/solver/__main__.py
+"""
+Command-line front end, mirroring solver.rb's --size conventions.
+
+    python -m backend.solver --size 6x10 --count
+    python -m backend.solver --size 8x8h --limit 5 --json-out solutions_8x8h.json
+    python -m backend.solver --size 6x10 --benchmark 3
+    python -m backend.solver --size 5x4x3 --count --workers 4
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+
+from .engine import Solver
+from .parallel import DEFAULT_DEPTH, count_parallel, solve_parallel
+
+
+def run_benchmark(size, rounds):
+    """
+    Times full enumerations of a size and prints the throughput.
+    Returns the list of per-round results.
+    """
+    started = time.perf_counter()
+    solver = Solver(size)
+    setup = time.perf_counter() - started
+    print(f"INFO: {size}: precomputed placements in {setup:.2f} sec")
+
+    results = []
+    for round_no in range(1, rounds + 1):
+        started = time.perf_counter()
+        count = solver.count()
+        elapsed = time.perf_counter() - started
+        results.append({"size": size, "solutions": count, "seconds": elapsed,
+                        "solutions_per_sec": count / elapsed if elapsed else 0.0})
+        print(f"BENCH: {size} round {round_no}: {count:,} solutions in {elapsed:.2f} sec "
+              f"({count / elapsed:,.0f} solutions/sec)")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enumerate pentomino solutions.")
+    parser.add_argument("-s", "--size", default="6x10", help="Board size (e.g., 6x10, 5x4x3, 8x8h).")
+    parser.add_argument("--count", action="store_true", help="Only count the solutions.")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after N solutions.")
+    parser.add_argument("--json-out", help="Write the solutions as [[{piece, cells}]] JSON to FILE.")
+    parser.add_argument("--benchmark", type=int, metavar="ROUNDS",
+                        help="Time ROUNDS full enumerations and report solutions/sec.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Search in N processes, one shard per first-level branch (default: 1).")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH,
+                        help=f"Tree levels to split into shards with --workers (default: {DEFAULT_DEPTH}).")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        run_benchmark(args.size, args.benchmark)
+        return 0
+
+    started = time.perf_counter()
+    solver = Solver(args.size)
+    if args.workers > 1 and args.count and args.limit is None:
+        total, shard_counts = count_parallel(args.size, args.workers, args.depth)
+        print(f"INFO: {len(shard_counts)} shards on {args.workers} workers")
+        print(f"total solution(s): {total:,}   {time.perf_counter() - started:.2f} sec")
+        return 0
+    if args.workers > 1:
+        solutions = (solution for _, solution in solve_parallel(args.size, args.workers, args.depth))
+        solutions = itertools.islice(solutions, args.limit)
+    else:
+        solutions = solver.solve(limit=args.limit)
+
+    if args.count or not args.json_out:
+        total = sum(1 for _ in solutions)
+    else:
+        total = 0
+        with open(args.json_out, "w") as f:
+            f.write("[")
+            for total, solution in enumerate(solutions, 1):
+                f.write(",\n" if total > 1 else "\n")
+                json.dump(solver.to_pieces(solution), f)
+            f.write("\n]\n")
+        print(f"Solutions written to {args.json_out}")
+
+    print(f"total solution(s): {total:,}   {time.perf_counter() - started:.2f} sec")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
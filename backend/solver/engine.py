@@ -0,0 +1,273 @@
+# ✅ backend/solver/engine.py
+"""
+Bitboard exact-cover search.
+
+Every placement of every piece is precomputed as an integer bitmask and
+filed under its lowest bit. The search always fills the lowest empty voxel:
+every placement that can cover it is anchored there, so the branching set
+is one short list lookup instead of a scan over all placements.
+
+Mirror/rotated duplicates are pruned the way solver.rb does it: the first
+pieces (X on flat boards, I on 3D ones) are restricted to one
+representative per orbit of the board symmetries until the stabilizer of
+the placed pieces is trivial.
+"""
+from .grid import Grid
+from .pieces import default_shapes, orientations
+
+# solver.rb piece order: the anchor piece goes first.
+PIECE_ORDER_2D = "XFILNPTUVWYZsb"
+PIECE_ORDER_3D = "IXLNYFPTUVWZsb"
+
+
+class SearchBudgetExceeded(Exception):
+    """
+    Raised by Solver.solve() when a search visits more than max_nodes nodes.
+    """
+
+
+class Solver:
+    """
+    Enumerates the tilings of a Grid with a set of pieces.
+
+    Solutions are tuples of (piece_id, mask) pairs in placement order; see
+    to_pieces() for the [{piece, cells}] format of the solutions files.
+    """
+
+    def __init__(self, grid, shapes=None):
+        if isinstance(grid, str):
+            grid = Grid.from_size(grid)
+        self.grid = grid
+        shapes = shapes if shapes is not None else default_shapes(grid)
+
+        order = PIECE_ORDER_2D if grid.depth == 1 else PIECE_ORDER_3D
+        self.piece_ids = sorted(shapes, key=lambda p: (order.find(p) % (len(order) + 1), p))
+        self.piece_bits = {piece_id: 1 << i for i, piece_id in enumerate(self.piece_ids)}
+        self.all_pieces = (1 << len(self.piece_ids)) - 1
+        self.piece_sizes = {piece_id: len(shapes[piece_id]) for piece_id in self.piece_ids}
+
+        self.placements = {piece_id: self._placements(shapes[piece_id]) for piece_id in self.piece_ids}
+
+        # anchored[cell] -> [(piece_bit, piece_id, mask)] for masks whose lowest bit is cell
+        self.anchored = [[] for _ in range(grid.size)]
+        for piece_id in self.piece_ids:
+            bit = self.piece_bits[piece_id]
+            for mask in self.placements[piece_id]:
+                cell = (mask & -mask).bit_length() - 1
+                self.anchored[cell].append((bit, piece_id, mask))
+
+    # --- Precomputation ---
+    def _placements(self, shape):
+        """
+        Every in-bounds, hole-free placement of a shape that does not cut
+        off an empty region no combination of the pieces can fill.
+        """
+        grid = self.grid
+        masks = []
+        for orientation in orientations(shape):
+            for offset in range(grid.size):
+                ox, oy, oz = grid.point(offset)
+                points = [(x + ox, y + oy, z + oz) for x, y, z in orientation]
+                if not all(grid.is_inside(*p) for p in points):
+                    continue
+                mask = grid.points_to_mask(points)
+                if mask & grid.holes:
+                    continue
+                if not all(self._fillable(size) for size in grid.regions(mask)):
+                    continue
+                masks.append(mask)
+        return masks
+
+    def _fillable(self, region_size):
+        sizes = sorted(set(self.piece_sizes.values()))
+        main = sizes[-1]
+        extras = [size for size in sizes if size != main]
+        return region_size % main == 0 or any(region_size % main == extra % main and region_size >= extra
+                                              for extra in extras)
+
+    # --- Search ---
+    def solve(self, occupied=0, pieces=None, limit=None, symmetry=True, max_nodes=None):
+        """
+        Yields solutions. `occupied` pre-fills voxels and `pieces` restricts
+        the pieces still to place (default: all). Symmetry pruning applies
+        only to the empty board with the full piece set. Stops after `limit`
+        solutions; closing the generator stops the search. With `max_nodes`
+        a search of a partly filled board raises SearchBudgetExceeded once
+        it has placed that many pieces.
+        """
+        used = self.all_pieces
+        for piece_id in (pieces if pieces is not None else self.piece_ids):
+            used &= ~self.piece_bits[piece_id]
+        board = occupied | self.grid.holes
+
+        if symmetry and occupied == 0 and used == 0 and self.grid.symmetries:
+            solutions = self._anchor(board, used, self.grid.symmetries, [])
+        elif max_nodes is not None:
+            solutions = self._search_bounded(board, used, [], [max_nodes])
+        else:
+            solutions = self._search(board, used, [])
+
+        for count, solution in enumerate(solutions, 1):
+            yield solution
+            if limit is not None and count >= limit:
+                return
+
+    def count(self, **kwargs):
+        """
+        Number of solutions (honours `limit`, e.g. limit=2 for uniqueness).
+        """
+        return sum(1 for _ in self.solve(**kwargs))
+
+    def first(self, **kwargs):
+        return next(self.solve(limit=1, **kwargs), None)
+
+    def _search(self, board, used, stack):
+        full = self.grid.full
+        if board == full:
+            yield tuple(stack)
+            return
+        if used == self.all_pieces:
+            return
+
+        isolated = self.grid.isolated
+        cell = (~board & (board + 1)).bit_length() - 1
+        for bit, piece_id, mask in self.anchored[cell]:
+            if used & bit or board & mask:
+                continue
+            placed = board | mask
+            if placed != full and isolated(placed):
+                continue
+            stack.append((piece_id, mask))
+            yield from self._search(placed, used | bit, stack)
+            stack.pop()
+
+    def _search_bounded(self, board, used, stack, budget):
+        # _search with a node budget; kept separate so the hot loop stays lean.
+        full = self.grid.full
+        if board == full:
+            yield tuple(stack)
+            return
+        if used == self.all_pieces:
+            return
+
+        isolated = self.grid.isolated
+        cell = (~board & (board + 1)).bit_length() - 1
+        for bit, piece_id, mask in self.anchored[cell]:
+            if used & bit or board & mask:
+                continue
+            placed = board | mask
+            if placed != full and isolated(placed):
+                continue
+            budget[0] -= 1
+            if budget[0] < 0:
+                raise SearchBudgetExceeded()
+            stack.append((piece_id, mask))
+            yield from self._search_bounded(placed, used | bit, stack, budget)
+            stack.pop()
+
+    def _representatives(self, piece_id, symmetries):
+        """
+        One placement per orbit of `symmetries`, with the symmetries that
+        keep it in place: [(mask, stabilizer)].
+        """
+        representatives = []
+        for mask in self.placements[piece_id]:
+            images = [Grid.transform(mask, perm) for perm in symmetries]
+            if mask <= min(images):
+                stabilizer = tuple(perm for perm, image in zip(symmetries, images) if image == mask)
+                representatives.append((mask, stabilizer))
+        return representatives
+
+    def _anchor(self, board, used, symmetries, stack):
+        """
+        Places the next piece in order at one representative per orbit of
+        `symmetries`, recursing while the placement keeps some symmetry.
+        """
+        piece_id = next(p for p in self.piece_ids if not used & self.piece_bits[p])
+        bit = self.piece_bits[piece_id]
+
+        for mask, stabilizer in self._representatives(piece_id, symmetries):
+            if board & mask:
+                continue
+            stack.append((piece_id, mask))
+            if stabilizer and used | bit != self.all_pieces:
+                yield from self._anchor(board | mask, used | bit, stabilizer, stack)
+            else:
+                yield from self._search(board | mask, used | bit, stack)
+            stack.pop()
+
+    # --- Branches ---
+    # A branch is (path, symmetries): the placements made so far and the
+    # board symmetries still to be broken. Splitting the tree into branches
+    # lets the parallel driver hand independent subtrees to workers.
+    def root(self):
+        return (), self.grid.symmetries
+
+    def _state(self, path):
+        board = self.grid.holes
+        used = 0
+        for piece_id, mask in path:
+            board |= mask
+            used |= self.piece_bits[piece_id]
+        return board, used
+
+    def expand(self, branch):
+        """
+        Children of a branch, in the order the sequential search visits them.
+        A finished branch has no children.
+        """
+        path, symmetries = branch
+        board, used = self._state(path)
+        if board == self.grid.full or used == self.all_pieces:
+            return []
+
+        if symmetries:
+            piece_id = next(p for p in self.piece_ids if not used & self.piece_bits[p])
+            children = []
+            for mask, stabilizer in self._representatives(piece_id, symmetries):
+                if board & mask:
+                    continue
+                if used | self.piece_bits[piece_id] == self.all_pieces:
+                    stabilizer = ()
+                children.append((path + ((piece_id, mask),), stabilizer))
+            return children
+
+        full = self.grid.full
+        cell = (~board & (board + 1)).bit_length() - 1
+        children = []
+        for bit, piece_id, mask in self.anchored[cell]:
+            if used & bit or board & mask:
+                continue
+            placed = board | mask
+            if placed != full and self.grid.isolated(placed):
+                continue
+            children.append((path + ((piece_id, mask),), ()))
+        return children
+
+    def solve_branch(self, branch, limit=None):
+        """
+        Yields the solutions below a branch from root()/expand().
+        """
+        path, symmetries = branch
+        board, used = self._state(path)
+        if board == self.grid.full:
+            solutions = iter([tuple(path)])
+        elif symmetries:
+            solutions = self._anchor(board, used, symmetries, list(path))
+        else:
+            solutions = self._search(board, used, list(path))
+
+        for count, solution in enumerate(solutions, 1):
+            yield solution
+            if limit is not None and count >= limit:
+                return
+
+    # --- Output ---
+    def to_pieces(self, solution):
+        """
+        Converts a solution into the [{piece, cells}] format of solutions_<size>.json.
+        """
+        return [
+            {"piece": piece_id, "cells": [list(p) for p in self.grid.mask_to_points(mask)]}
+            for piece_id, mask in solution
+        ]
@@ -0,0 +1,174 @@
+# ✅ backend/solver/grid.py
+"""
+Board geometry for the solver: voxel <-> bit mapping, holes and the
+rotations/reflections that map the board onto itself.
+"""
+import itertools
+
+from backend.board import is_holed, parse_size
+
+
+class Grid:
+    """
+    A W x H x D board mapped onto the bits of an int; the LSB is (0, 0, 0).
+    `holes` is a bitmask of voxels that are not part of the board.
+
+    Bits run along the shortest axis first and the longest axis last, so the
+    "lowest empty bit" frontier of the search is the smallest cross-section
+    of the box (3x4 instead of 5x4 on 5x4x3). On flat boards this is the
+    (y * W + x) layout of solver.rb.
+    """
+
+    def __init__(self, dims, holes=0):
+        self.width, self.height, self.depth = self.dims = tuple(dims)
+        self.size = self.width * self.height * self.depth
+        self.holes = holes
+        self.full = (1 << self.size) - 1
+
+        strides = [0, 0, 0]
+        stride = 1
+        for axis in sorted(range(3), key=lambda a: (self.dims[a], a)):
+            strides[axis] = stride
+            stride *= self.dims[axis]
+        self.strides = tuple(strides)
+        self._points = [None] * self.size
+        for z in range(self.depth):
+            for y in range(self.height):
+                for x in range(self.width):
+                    self._points[self.offset(x, y, z)] = (x, y, z)
+
+        # Shift masks for neighbour tests: cells that have a neighbour on the
+        # high / low side of each axis.
+        self.shifts = []
+        for axis in range(3):
+            if self.dims[axis] == 1:
+                continue
+            has_high = has_low = 0
+            for offset, p in enumerate(self._points):
+                if p[axis] < self.dims[axis] - 1:
+                    has_high |= 1 << offset
+                if p[axis] > 0:
+                    has_low |= 1 << offset
+            self.shifts.append((self.strides[axis], has_high, has_low))
+
+        self.symmetries = self._symmetries()
+
+    @classmethod
+    def from_size(cls, size):
+        """
+        Builds the board for a solver.rb size string. '8x8h' / '7x9h' get the
+        centre hole; 8x8 and 7x9 without it are filled with an extra piece.
+        """
+        dims = parse_size(size)
+        grid = cls(dims)
+        if is_holed(size) and grid.size > 60:
+            w, h = grid.width, grid.height
+            cx, cy = w // 2, h // 2
+            if grid.size == 64:
+                hole = [(cx, cy), (cx - 1, cy), (cx, cy - 1), (cx - 1, cy - 1)]
+            else:
+                hole = [(cx, cy - 1), (cx, cy), (cx, cy + 1)]
+            grid = cls(dims, grid.points_to_mask((x, y, 0) for x, y in hole))
+        return grid
+
+    @property
+    def open_cells(self):
+        return self.size - bin(self.holes).count("1")
+
+    def offset(self, x, y, z):
+        sx, sy, sz = self.strides
+        return x * sx + y * sy + z * sz
+
+    def point(self, offset):
+        return self._points[offset]
+
+    def is_inside(self, x, y, z):
+        return 0 <= x < self.width and 0 <= y < self.height and 0 <= z < self.depth
+
+    def points_to_mask(self, points):
+        mask = 0
+        for x, y, z in points:
+            mask |= 1 << self.offset(x, y, z)
+        return mask
+
+    def mask_to_points(self, mask):
+        points = []
+        while mask:
+            low = mask & -mask
+            points.append(self.point(low.bit_length() - 1))
+            mask ^= low
+        return points
+
+    def neighbours(self, offset):
+        x, y, z = self.point(offset)
+        for dx, dy, dz in ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)):
+            if self.is_inside(x + dx, y + dy, z + dz):
+                yield self.offset(x + dx, y + dy, z + dz)
+
+    def isolated(self, board):
+        """
+        Empty voxels whose neighbours are all filled (or holes), computed
+        with a handful of shifts. No piece fits them, so the board is dead.
+        """
+        empty = ~board & self.full
+        reachable = 0
+        for stride, has_high, has_low in self.shifts:
+            reachable |= ((empty & has_high) << stride) | ((empty & has_low) >> stride)
+        return empty & ~reachable
+
+    def regions(self, occupied):
+        """
+        Sizes of the connected empty regions left by an occupied mask.
+        """
+        free = ~(occupied | self.holes) & self.full
+        sizes = []
+        while free:
+            start = (free & -free).bit_length() - 1
+            stack = [start]
+            free &= ~(1 << start)
+            count = 0
+            while stack:
+                cell = stack.pop()
+                count += 1
+                for n in self.neighbours(cell):
+                    if free >> n & 1:
+                        free &= ~(1 << n)
+                        stack.append(n)
+            sizes.append(count)
+        return sizes
+
+    def _symmetries(self):
+        """
+        Every non-identity rotation/reflection of the box that keeps the
+        dimensions and the holes, as a tuple mapping old offset -> new offset.
+        """
+        dims = self.dims
+        perms = []
+        for axes in itertools.permutations(range(3)):
+            if tuple(dims[a] for a in axes) != dims:
+                continue
+            for flips in itertools.product((False, True), repeat=3):
+                if axes == (0, 1, 2) and not any(flips):
+                    continue
+                # A flip along an axis of length 1 is the identity.
+                if any(flip and dims[a] == 1 for a, flip in zip(axes, flips)):
+                    continue
+                perm = []
+                for offset in range(self.size):
+                    p = self.point(offset)
+                    q = [p[a] for a in axes]
+                    q = [dims[i] - 1 - v if flip else v for i, (v, flip) in enumerate(zip(q, flips))]
+                    perm.append(self.offset(*q))
+                if self.transform(self.holes, perm) == self.holes:
+                    perms.append(tuple(perm))
+        identity = tuple(range(self.size))
+        return tuple(perm for perm in dict.fromkeys(perms) if perm != identity)
+
+    @staticmethod
+    def transform(mask, perm):
+        result = 0
+        while mask:
+            low = mask & -mask
+            result |= 1 << perm[low.bit_length() - 1]
+            mask ^= low
+        return result
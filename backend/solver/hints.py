@@ -0,0 +1,100 @@
+# ✅ backend/solver/hints.py
+"""
+Next-move hints for a partly filled board.
+
+A position that agrees with the puzzle's stored solution is answered from
+it directly. Anything else (the player went their own way) gets a bounded
+search for a completion; the hint is that completion's piece on the lowest
+empty cell.
+"""
+import os
+from functools import lru_cache
+
+from .engine import SearchBudgetExceeded, Solver
+from .placements import load_index
+
+HINT_MAX_NODES = int(os.environ.get("HINT_MAX_NODES", 200_000))
+
+
+@lru_cache(maxsize=None)
+def _solver(size):
+    return Solver(size)
+
+
+def parse_placements(index, placements):
+    """
+    Validates [{piece, cells}] placements against a board. Returns
+    (occupied, {piece_id: mask}); ValueError for malformed input, cells
+    off the board, an unknown piece, an illegal placement, a piece used
+    twice or overlapping pieces.
+    """
+    if not isinstance(placements, list):
+        raise ValueError("placements must be a list")
+    occupied = 0
+    masks = {}
+    for placement in placements:
+        if not isinstance(placement, dict):
+            raise ValueError("Each placement must be an object with piece and cells")
+        piece_id = placement.get("piece")
+        if not isinstance(piece_id, str):
+            raise ValueError(f"Unknown piece {piece_id!r}")
+        try:
+            # Off-board or non-integer cells raise here, before any shift.
+            mask = index.points_to_mask(tuple(cell) for cell in placement.get("cells") or ())
+        except (TypeError, ValueError):
+            raise ValueError(f"Bad cells for piece {piece_id}")
+        if index.find(piece_id, mask) is None:
+            raise ValueError(f"Not a placement of piece {piece_id}")
+        if piece_id in masks:
+            raise ValueError(f"Piece {piece_id} placed twice")
+        if occupied & mask:
+            raise ValueError(f"Piece {piece_id} overlaps another piece")
+        occupied |= mask
+        masks[piece_id] = mask
+    return occupied, masks
+
+
+def solution_masks(index, solution):
+    """
+    {piece_id: mask} of a stored solution in [{piece, cells}] form.
+    """
+    return {piece["piece"]: index.points_to_mask(tuple(cell) for cell in piece["cells"]) for piece in solution}
+
+
+def _hint(index, piece_id, mask, source):
+    return {"status": "hint", "source": source,
+            "hint": {"piece": piece_id, "cells": [list(p) for p in index.mask_to_points(mask)]}}
+
+
+def next_hint(size, placements, solution=None, max_nodes=HINT_MAX_NODES):
+    """
+    Hint for a position given as validated placements {piece_id: mask}.
+    Returns a dict with status 'hint', 'complete', 'unsolvable' or
+    'budget_exceeded'.
+    """
+    index = load_index(size)
+    board = index.holes
+    for mask in placements.values():
+        board |= mask
+    if board == index.full:
+        return {"status": "complete", "hint": None}
+    cell = (~board & (board + 1)).bit_length() - 1
+
+    if solution is not None:
+        expected = solution_masks(index, solution)
+        if all(expected.get(piece_id) == mask for piece_id, mask in placements.items()):
+            for piece_id, mask in expected.items():
+                if piece_id not in placements and mask >> cell & 1:
+                    return _hint(index, piece_id, mask, "solution")
+
+    solver = _solver(size)
+    remaining = [piece_id for piece_id in solver.piece_ids if piece_id not in placements]
+    try:
+        found = solver.first(occupied=board & ~index.holes, pieces=remaining, symmetry=False,
+                             max_nodes=max_nodes)
+    except SearchBudgetExceeded:
+        return {"status": "budget_exceeded", "hint": None}
+    if found is None:
+        return {"status": "unsolvable", "hint": None}
+    piece_id, mask = found[0]
+    return _hint(index, piece_id, mask, "search")
@@ -0,0 +1,110 @@
+# ✅ backend/solver/metrics.py
+"""
+Search-effort metrics of a puzzle: how hard the solver has to work to
+complete a partly filled board.
+
+    nodes             placements tried by an exhaustive search
+    solutions         completions of the board
+    branching_factor  average number of candidate placements per step on the
+                      way to the puzzle's solution
+    forced_moves      steps on that way with a single candidate
+
+The search is the one of Solver.solve() with symmetry pruning off (always
+fill the lowest empty voxel), so the numbers describe the position exactly
+as given.
+"""
+from .engine import SearchBudgetExceeded
+
+# Bump when the definitions change so stored metrics get recomputed.
+METRICS_VERSION = 1
+
+
+def _candidates(solver, board, used):
+    full = solver.grid.full
+    cell = (~board & (board + 1)).bit_length() - 1
+    candidates = []
+    for bit, piece_id, mask in solver.anchored[cell]:
+        if used & bit or board & mask:
+            continue
+        placed = board | mask
+        if placed != full and solver.grid.isolated(placed):
+            continue
+        candidates.append((bit, piece_id, mask))
+    return candidates
+
+
+def _board(solver, occupied, pieces):
+    used = solver.all_pieces
+    for piece_id in (pieces if pieces is not None else solver.piece_ids):
+        used &= ~solver.piece_bits[piece_id]
+    return occupied | solver.grid.holes, used
+
+
+def tree_metrics(solver, occupied=0, pieces=None, max_nodes=None):
+    """
+    (nodes, solutions) of an exhaustive search. With `max_nodes` the search
+    stops there and solutions is None.
+    """
+    board, used = _board(solver, occupied, pieces)
+    full = solver.grid.full
+    all_pieces = solver.all_pieces
+    budget = max_nodes if max_nodes is not None else -1
+    # nodes, solutions
+    counts = [0, 0]
+
+    def search(board, used):
+        if board == full:
+            counts[1] += 1
+            return
+        if used == all_pieces:
+            return
+        for bit, _, mask in _candidates(solver, board, used):
+            counts[0] += 1
+            if counts[0] == budget:
+                raise SearchBudgetExceeded()
+            search(board | mask, used | bit)
+
+    try:
+        search(board, used)
+    except SearchBudgetExceeded:
+        return counts[0], None
+    return counts[0], counts[1]
+
+
+def path_metrics(solver, solution, occupied=0, pieces=None):
+    """
+    (branching_factor, forced_moves) along the search path that builds
+    `solution` ({piece_id: mask} of the pieces still to place).
+    """
+    board, used = _board(solver, occupied, pieces)
+    steps = branches = forced = 0
+    while board != solver.grid.full:
+        candidates = _candidates(solver, board, used)
+        step = next(((bit, mask) for bit, piece_id, mask in candidates if solution.get(piece_id) == mask), None)
+        if step is None:
+            raise ValueError("Solution does not complete the board")
+        steps += 1
+        branches += len(candidates)
+        if len(candidates) == 1:
+            forced += 1
+        board |= step[1]
+        used |= step[0]
+    return (round(branches / steps, 4) if steps else 0.0), forced
+
+
+def search_metrics(solver, occupied=0, pieces=None, solution=None, max_nodes=None):
+    """
+    All metrics of a board as a dict. `solution` ({piece_id: mask}) picks
+    the completion the path metrics follow; default: the first one found.
+    """
+    nodes, solutions = tree_metrics(solver, occupied, pieces, max_nodes)
+    if solution is None:
+        found = solver.first(occupied=occupied, pieces=pieces, symmetry=False)
+        solution = dict(found) if found is not None else None
+    branching_factor, forced_moves = path_metrics(solver, solution, occupied, pieces) if solution else (0.0, 0)
+    return {
+        "nodes": nodes,
+        "solutions": solutions,
+        "branching_factor": branching_factor,
+        "forced_moves": forced_moves,
+    }
@@ -0,0 +1,94 @@
+# ✅ backend/solver/parallel.py
+"""
+Process-pool search: the tree is cut at its first levels (the symmetry-
+breaking placements of X, or I on 3D boards) and every subtree becomes a
+shard. Shards are planned in the parent in the same order the sequential
+search visits them, so counts are deterministic and ordered output matches
+Solver.solve().
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from .engine import Solver
+
+DEFAULT_DEPTH = 2
+
+
+@lru_cache(maxsize=None)
+def _solver(size):
+    # One Solver per process and size; the placement tables are rebuilt once.
+    return Solver(size)
+
+
+def plan_shards(solver, depth=DEFAULT_DEPTH):
+    """
+    Splits the search tree `depth` levels below the root. Returns the
+    branches in visiting order.
+    """
+    branches = [solver.root()]
+    for _ in range(depth):
+        expanded = []
+        for branch in branches:
+            children = solver.expand(branch)
+            # Finished branches (a full board) are kept as their own shard.
+            expanded.extend(children if children else [branch])
+        branches = expanded
+    return branches
+
+
+def _encode(solver, branch):
+    # Symmetries travel as indexes into grid.symmetries to keep shards small.
+    path, symmetries = branch
+    index = {perm: i for i, perm in enumerate(solver.grid.symmetries)}
+    return path, tuple(index[perm] for perm in symmetries)
+
+
+def _decode(solver, shard):
+    path, symmetry_indexes = shard
+    return path, tuple(solver.grid.symmetries[i] for i in symmetry_indexes)
+
+
+def _run_shard(size, shard, count_only):
+    solver = _solver(size)
+    solutions = solver.solve_branch(_decode(solver, shard))
+    if count_only:
+        return sum(1 for _ in solutions)
+    return list(solutions)
+
+
+def solve_parallel(size, workers=None, depth=DEFAULT_DEPTH, ordered=True):
+    """
+    Yields (shard_index, solution) for every solution of a size ('6x10',
+    '5x4x3', '8x8h'). With ordered=True shards are yielded in sequential
+    search order; otherwise each shard is yielded as soon as it finishes.
+    """
+    solver = _solver(size)
+    shards = [_encode(solver, branch) for branch in plan_shards(solver, depth)]
+    workers = workers or os.cpu_count()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_run_shard, size, shard, False): i for i, shard in enumerate(shards)}
+        if ordered:
+            completed = ((i, future) for future, i in sorted(futures.items(), key=lambda item: item[1]))
+        else:
+            completed = ((futures[future], future) for future in as_completed(futures))
+
+        for shard_index, future in completed:
+            for solution in future.result():
+                yield shard_index, solution
+
+
+def count_parallel(size, workers=None, depth=DEFAULT_DEPTH):
+    """
+    Total number of solutions of a size, counted shard by shard in workers.
+    Returns (total, per_shard_counts).
+    """
+    solver = _solver(size)
+    shards = [_encode(solver, branch) for branch in plan_shards(solver, depth)]
+    workers = workers or os.cpu_count()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        counts = list(executor.map(_run_shard, [size] * len(shards), shards,
+                                   [True] * len(shards), chunksize=1))
+    return sum(counts), counts
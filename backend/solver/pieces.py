@@ -0,0 +1,55 @@
+# ✅ backend/solver/pieces.py
+"""
+Piece orientations: every distinct rotation and reflection of a shape.
+"""
+import itertools
+
+from backend.pieces import EXTRA_PIECE_DEFINITIONS, PIECE_DEFINITIONS
+
+PIECE_SHAPES = {piece_id: data["shape_json"] for piece_id, data in PIECE_DEFINITIONS.items()}
+EXTRA_PIECE_SHAPES = {piece_id: data["shape_json"] for piece_id, data in EXTRA_PIECE_DEFINITIONS.items()}
+
+
+def normalize(points):
+    """
+    Sorts points in (z, y, x) order and moves the first one to the origin,
+    so every orientation is anchored at its lowest bit.
+    """
+    points = sorted(points, key=lambda p: (p[2], p[1], p[0]))
+    ox, oy, oz = points[0]
+    return tuple((x - ox, y - oy, z - oz) for x, y, z in points)
+
+
+def orientations(shape):
+    """
+    All distinct orientations of a shape under the 48 rotations and
+    reflections of 3D space (24 rotations x mirror).
+    """
+    points = [tuple(p) + (0,) * (3 - len(p)) for p in shape]
+    seen = {}
+    for axes in itertools.permutations(range(3)):
+        for signs in itertools.product((1, -1), repeat=3):
+            oriented = [tuple(p[a] * sign for a, sign in zip(axes, signs)) for p in points]
+            seen.setdefault(normalize(oriented), None)
+    return list(seen)
+
+
+def shapes_from_master_pieces(pieces):
+    """
+    Shape map from MasterPiece rows, so the solver can follow the database.
+    """
+    return {piece.id: piece.shape_json for piece in pieces}
+
+
+def default_shapes(grid, with_extras=True):
+    """
+    The pieces solver.rb uses for a board: the 12 pentominoes, plus the
+    2x2 square on a full 64-cell board or the 1x3 bar on a full 63-cell one.
+    """
+    shapes = dict(PIECE_SHAPES)
+    if with_extras and grid.depth == 1 and not grid.holes:
+        if grid.size == 64:
+            shapes["s"] = EXTRA_PIECE_SHAPES["s"]
+        elif grid.size == 63:
+            shapes["b"] = EXTRA_PIECE_SHAPES["b"]
+    return shapes
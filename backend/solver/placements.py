@@ -0,0 +1,280 @@
+# ✅ backend/solver/placements.py
+"""
+Precomputed placement index: every legal placement of every piece on a
+board size as a 64-bit mask, plus a cell -> placements inverted index.
+
+Masks use the solver's bit layout (Grid.offset), so they can be ANDed with
+solver boards directly. The tables are flat `array` buffers: a handful of
+objects per index, which save to under 100 KB of plain .npz arrays (no
+pickle), load in milliseconds and stay shared copy-on-write after a fork
+(nothing touches per-placement refcounts). The find() lookup table is
+built when the index is loaded, so preload() before forking shares it too.
+
+The disk cache lives in a private directory (mode 0700) and is only read
+when that directory and the file belong to the current user.
+
+    index = load_index("6x10")
+    for i in index.covering(index.offset(0, 0, 0)):
+        index.piece(i), index.masks[i]
+"""
+import hashlib
+import json
+import os
+import stat
+import tempfile
+from array import array
+from functools import lru_cache
+
+from .grid import Grid
+from .pieces import default_shapes, orientations
+
+# solver.rb's board sizes
+SUPPORTED_SIZES = (
+    "6x10", "5x12", "4x15", "3x20",
+    "5x4x3", "6x5x2", "10x3x2",
+    "8x8", "8x8h", "7x9", "7x9h",
+)
+# Bump when the saved layout changes; old cache files are then ignored.
+FORMAT_VERSION = 2
+CACHE_DIR = os.environ.get(
+    "PLACEMENT_CACHE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "var", "placements")),
+)
+# The flat tables, saved and loaded as arrays of their own typecode.
+_TABLES = ("cell_points", "masks", "pieces", "orients", "piece_start", "cell_start", "cell_items")
+
+
+class PlacementIndex:
+    """
+    Placements are numbered piece by piece: placement i belongs to
+    piece_ids[pieces[i]], has orientation orientations[piece][orients[i]]
+    and covers masks[i]. The placements of a piece are the range
+    piece_start[p]:piece_start[p + 1]; the placements covering a cell are
+    cell_items[cell_start[cell]:cell_start[cell + 1]].
+    """
+
+    def __init__(self, size, shapes=None):
+        grid = Grid.from_size(size)
+        shapes = shapes if shapes is not None else default_shapes(grid)
+
+        self.size = size
+        self.dims = grid.dims
+        self.strides = grid.strides
+        self.holes = grid.holes
+        self.full = grid.full
+        # x, y, z of every cell, flattened
+        self.cell_points = array("B", [v for offset in range(grid.size) for v in grid.point(offset)])
+        self.piece_ids = tuple(sorted(shapes))
+        self.orientations = {piece_id: tuple(orientations(shapes[piece_id])) for piece_id in self.piece_ids}
+
+        self.masks = array("Q")
+        self.pieces = array("B")
+        self.orients = array("B")
+        self.piece_start = array("I", [0])
+        for p, piece_id in enumerate(self.piece_ids):
+            for o, orientation in enumerate(self.orientations[piece_id]):
+                for offset in range(grid.size):
+                    ox, oy, oz = grid.point(offset)
+                    points = [(x + ox, y + oy, z + oz) for x, y, z in orientation]
+                    if not all(grid.is_inside(*point) for point in points):
+                        continue
+                    mask = grid.points_to_mask(points)
+                    if mask & grid.holes:
+                        continue
+                    self.masks.append(mask)
+                    self.pieces.append(p)
+                    self.orients.append(o)
+            self.piece_start.append(len(self.masks))
+
+        covering = [[] for _ in range(grid.size)]
+        for i, mask in enumerate(self.masks):
+            while mask:
+                low = mask & -mask
+                covering[low.bit_length() - 1].append(i)
+                mask ^= low
+        self.cell_start = array("I", [0])
+        self.cell_items = array("I")
+        for items in covering:
+            self.cell_items.extend(items)
+            self.cell_start.append(len(self.cell_items))
+
+        self._lookup = self._build_lookup()
+
+    def _build_lookup(self):
+        return {(p, mask): i for i, (p, mask) in enumerate(zip(self.pieces, self.masks))}
+
+    def __len__(self):
+        return len(self.masks)
+
+    # --- Geometry ---
+    def offset(self, x, y, z=0):
+        sx, sy, sz = self.strides
+        return x * sx + y * sy + z * sz
+
+    def is_inside(self, x, y, z=0):
+        w, h, d = self.dims
+        return 0 <= x < w and 0 <= y < h and 0 <= z < d
+
+    def points_to_mask(self, points):
+        """
+        Mask of (x, y[, z]) points. ValueError for a point that is not
+        integer coordinates on the board; nothing is shifted before the
+        check, so off-board points can neither alias other cells nor make
+        huge integers.
+        """
+        mask = 0
+        for point in points:
+            if len(point) not in (2, 3) or not all(type(v) is int for v in point) or not self.is_inside(*point):
+                raise ValueError(f"Point {point!r} is not on the {self.size} board")
+            mask |= 1 << self.offset(*point)
+        return mask
+
+    def point(self, offset):
+        return tuple(self.cell_points[offset * 3:offset * 3 + 3])
+
+    def mask_to_points(self, mask):
+        points = []
+        while mask:
+            low = mask & -mask
+            points.append(self.point(low.bit_length() - 1))
+            mask ^= low
+        return points
+
+    # --- Lookups ---
+    def piece(self, i):
+        return self.piece_ids[self.pieces[i]]
+
+    def orientation(self, i):
+        return self.orientations[self.piece(i)][self.orients[i]]
+
+    def placements_of(self, piece_id):
+        p = self.piece_ids.index(piece_id)
+        return range(self.piece_start[p], self.piece_start[p + 1])
+
+    def covering(self, cell):
+        """
+        Placement numbers of every placement that covers a cell.
+        """
+        return self.cell_items[self.cell_start[cell]:self.cell_start[cell + 1]]
+
+    def find(self, piece_id, mask):
+        """
+        Placement number of a piece at a mask, or None when the piece cannot
+        be placed there (wrong shape, off the board or on a hole).
+        """
+        try:
+            return self._lookup.get((self.piece_ids.index(piece_id), mask))
+        except ValueError:
+            return None
+
+    def fits(self, board, i):
+        """
+        True when placement i does not overlap an occupied board.
+        """
+        return not board & self.masks[i]
+
+
+def shapes_key(shapes):
+    """
+    Stable digest of a {piece_id: shape_json} map, part of the cache file name.
+    """
+    data = json.dumps({"version": FORMAT_VERSION, "shapes": shapes}, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+
+def _cache_path(size, shapes, cache_dir):
+    return os.path.join(cache_dir, f"placements-{size}-{shapes_key(shapes)}.npz")
+
+
+def _private(path):
+    """
+    True when path belongs to this user and nobody else can write to it.
+    """
+    info = os.stat(path)
+    return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _save(index, path):
+    import numpy as np
+
+    header = {
+        "size": index.size, "dims": index.dims, "strides": index.strides, "holes": index.holes,
+        "full": index.full, "piece_ids": index.piece_ids, "orientations": index.orientations,
+    }
+    tables = {name: np.frombuffer(getattr(index, name), dtype=getattr(index, name).typecode) for name in _TABLES}
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, header=np.array(json.dumps(header)), **tables)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _load(path):
+    import numpy as np
+
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(str(data["header"]))
+        index = PlacementIndex.__new__(PlacementIndex)
+        index.size = header["size"]
+        index.dims = tuple(header["dims"])
+        index.strides = tuple(header["strides"])
+        index.holes = header["holes"]
+        index.full = header["full"]
+        index.piece_ids = tuple(header["piece_ids"])
+        index.orientations = {
+            piece_id: tuple(tuple(tuple(point) for point in orientation) for orientation in orientations)
+            for piece_id, orientations in header["orientations"].items()
+        }
+        for name in _TABLES:
+            table = data[name]
+            setattr(index, name, array(table.dtype.char, table.tobytes()))
+    index._lookup = index._build_lookup()
+    return index
+
+
+@lru_cache(maxsize=None)
+def _load_index(size, shapes_json, cache_dir):
+    shapes = json.loads(shapes_json)
+    path = None
+    if cache_dir:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        if _private(cache_dir):
+            path = _cache_path(size, shapes, cache_dir)
+        else:
+            print(f"WARN: Not using placement cache {cache_dir}: it is not private to this user")
+    if path and os.path.exists(path):
+        if _private(path):
+            try:
+                return _load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"WARN: Ignoring unreadable placement cache {path}: {e}")
+        else:
+            print(f"WARN: Ignoring placement cache {path}: it is not private to this user")
+
+    index = PlacementIndex(size, shapes)
+    if path:
+        _save(index, path)
+    return index
+
+
+def load_index(size, shapes=None, cache_dir=CACHE_DIR):
+    """
+    The PlacementIndex of a size, built once per process and cached on
+    disk under `cache_dir` (None disables the disk cache). `shapes`
+    defaults to solver.rb's pieces; pass shapes_from_master_pieces(...) to
+    follow MasterPiece.shape_json.
+    """
+    if shapes is None:
+        shapes = default_shapes(Grid.from_size(size))
+    return _load_index(size, json.dumps(shapes, sort_keys=True), cache_dir)
+
+
+def preload(sizes=SUPPORTED_SIZES, **kwargs):
+    """
+    Loads the indexes of several sizes, e.g. in a gunicorn master before it
+    forks so the workers share them.
+    """
+    return {size: load_index(size, **kwargs) for size in sizes}
@@ -0,0 +1,319 @@
+# ✅ backend/worksheets.py
+"""
+Batch worksheet renderer: one PDF page per ContentPuzzle.
+
+    python -m backend.worksheets --out print-run.pdf <puzzle id> ...
+    python -m backend.worksheets --out print-run.pdf --ids-file ids.txt --workers 8
+
+The board drawing of a page is a vector fragment (PDF drawing operators in
+cell units) rendered in a process pool and cached on disk under the hash of
+the board content and TEMPLATE_VERSION, so a board printed before (or twice
+in one run) is not drawn again. Pages are written to the output file as
+they are assembled; only the page tree and xref are kept until the end.
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.board import EMPTY, unpack_board
+
+# Bump when the drawing changes so cached fragments are not reused.
+TEMPLATE_VERSION = 1
+WORKSHEET_CACHE_DIR = os.environ.get(
+    "WORKSHEET_CACHE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "var", "worksheets")),
+)
+DEFAULT_BATCH_SIZE = 200
+
+# A4 portrait, in points
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 48
+# Board cells the player fills in
+OPEN = "-"
+
+PIECE_COLORS = {
+    "F": (0.95, 0.55, 0.55), "I": (0.55, 0.75, 0.95), "L": (0.95, 0.80, 0.45),
+    "N": (0.65, 0.85, 0.60), "P": (0.85, 0.65, 0.90), "T": (0.55, 0.85, 0.85),
+    "U": (0.95, 0.70, 0.80), "V": (0.75, 0.75, 0.55), "W": (0.70, 0.70, 0.95),
+    "X": (0.95, 0.65, 0.40), "Y": (0.60, 0.80, 0.75), "Z": (0.85, 0.85, 0.85),
+    "s": (0.80, 0.70, 0.60), "b": (0.70, 0.60, 0.80),
+}
+
+
+def worksheet_board(base_board, cells):
+    """
+    Packed board of a content puzzle: the kept (x, y, z, piece) cells, OPEN
+    for the cells to fill and EMPTY for the holes of the base board.
+    """
+    (w, h, d), base_grid = unpack_board(base_board)
+    grid = bytearray(OPEN.encode() * (w * h * d))
+    for offset, value in enumerate(base_grid):
+        if value == ord(EMPTY):
+            grid[offset] = value
+    for x, y, z, piece in cells:
+        grid[(z * h + y) * w + x] = ord(piece)
+    return bytes((w, h, d)) + bytes(grid)
+
+
+def fragment_key(board):
+    return hashlib.sha256(f"worksheet{TEMPLATE_VERSION}:".encode() + board).hexdigest()[:32]
+
+
+def board_fragment(board):
+    """
+    PDF drawing operators for a worksheet board, one unit per cell with the
+    origin at the bottom-left corner. Layers of a 3D board are drawn side by
+    side, z = 0 first.
+    """
+    (w, h, d), grid = unpack_board(board)
+    ops = []
+
+    def value(x, y, z):
+        if 0 <= x < w and 0 <= y < h:
+            return grid[(z * h + y) * w + x]
+        return ord(EMPTY)
+
+    for z in range(d):
+        left = z * (w + 1)
+        cells = [(x, y, chr(value(x, y, z))) for y in range(h) for x in range(w)]
+        # Rows run top to bottom on paper.
+        for x, y, piece in cells:
+            if piece == EMPTY:
+                continue
+            r, g, b = PIECE_COLORS.get(piece, (1, 1, 1)) if piece != OPEN else (1, 1, 1)
+            ops.append(f"{r:.2f} {g:.2f} {b:.2f} rg {left + x} {h - 1 - y} 1 1 re f")
+        ops.append("0.6 G 0.02 w")
+        for x, y, piece in cells:
+            if piece != EMPTY:
+                ops.append(f"{left + x} {h - 1 - y} 1 1 re S")
+        # Outlines between different pieces and around the board
+        ops.append("0 G 0.08 w 1 J")
+        for y in range(h):
+            for x in range(w + 1):
+                if value(x - 1, y, z) != value(x, y, z):
+                    ops.append(f"{left + x} {h - 1 - y} m {left + x} {h - y} l S")
+        for y in range(h + 1):
+            for x in range(w):
+                if value(x, y - 1, z) != value(x, y, z):
+                    ops.append(f"{left + x} {h - y} m {left + x + 1} {h - y} l S")
+    return "\n".join(ops).encode() + b"\n"
+
+
+def render_fragment(task):
+    """
+    Worker entry point. task = (key, board); returns (key, fragment, hit).
+    """
+    key, board = task
+    path = os.path.join(WORKSHEET_CACHE_DIR, key[:2], f"{key}.frag")
+    try:
+        with open(path, "rb") as f:
+            return key, f.read(), True
+    except FileNotFoundError:
+        pass
+    fragment = board_fragment(board)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(fragment)
+    os.replace(tmp_path, path)
+    return key, fragment, False
+
+
+def _text(value):
+    raw = str(value or "").encode("cp1252", "replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def page_content(page, fragment):
+    """
+    Content stream of one worksheet page around a board fragment.
+    """
+    w, h, d = page["dims"]
+    units_w, units_h = d * (w + 1) - 1, h
+    top = PAGE_HEIGHT - MARGIN - 110
+    scale = min((PAGE_WIDTH - 2 * MARGIN) / units_w, (top - MARGIN) / units_h, 40)
+    x0 = (PAGE_WIDTH - units_w * scale) / 2
+    y0 = top - units_h * scale
+
+    text = [
+        (18, PAGE_HEIGHT - MARGIN - 18, page["title"]),
+        (10, PAGE_HEIGHT - MARGIN - 40, page["description"]),
+        (12, PAGE_HEIGHT - MARGIN - 70, "Pieces to place: " + ", ".join(page["pieces_to_place"])),
+        (8, MARGIN / 2, f"{page['code']}  {page['size']}"),
+    ]
+    parts = [b"0 g"]
+    for size, y, line in text:
+        parts.append(b"BT /F1 %d Tf %d %.2f Td (%s) Tj ET" % (size, MARGIN, y, _text(line)))
+    parts.append(b"q %.4f 0 0 %.4f %.2f %.2f cm" % (scale, scale, x0, y0))
+    parts.append(fragment + b"Q")
+    return b"\n".join(parts)
+
+
+class PdfWriter:
+    """
+    Minimal streaming PDF 1.4 writer: objects go to the file as they are
+    added; close() writes the page tree, catalog and xref.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.offsets = {}
+        self.pages = []
+        self._next = 1
+        self.catalog = self._reserve()
+        self.page_tree = self._reserve()
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.font = self.add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    def _reserve(self):
+        number = self._next
+        self._next += 1
+        return number
+
+    def add(self, body, number=None):
+        number = number or self._reserve()
+        self.offsets[number] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        return number
+
+    def add_page(self, content):
+        data = zlib.compress(content)
+        stream = self.add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+        self.pages.append(self.add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 %d 0 R >> >> "
+            b"/Contents %d 0 R >>" % (self.page_tree, PAGE_WIDTH, PAGE_HEIGHT, self.font, stream)))
+
+    def close(self):
+        kids = b" ".join(b"%d 0 R" % number for number in self.pages)
+        self.add(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.pages)), self.page_tree)
+        self.add(b"<< /Type /Catalog /Pages %d 0 R >>" % self.page_tree, self.catalog)
+        xref = self.f.tell()
+        self.f.write(b"xref\n0 %d\n0000000000 65535 f \n" % self._next)
+        for number in range(1, self._next):
+            self.f.write(b"%010d 00000 n \n" % self.offsets[number])
+        self.f.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                     % (self._next, self.catalog, xref))
+
+
+def load_pages(session, puzzle_ids):
+    """
+    Page data of content puzzles, in the order of `puzzle_ids` (unknown ids
+    are left out).
+    """
+    from sqlalchemy import select
+
+    from backend.models.content_puzzle import ContentPuzzle
+    from backend.models.content_puzzle_cell import ContentPuzzleCell
+    from backend.models.master_base_puzzle import MasterBasePuzzle
+
+    rows = session.execute(
+        select(ContentPuzzle.id, ContentPuzzle.code, ContentPuzzle.title, ContentPuzzle.description,
+               MasterBasePuzzle.name, MasterBasePuzzle.board)
+        .join(MasterBasePuzzle, MasterBasePuzzle.id == ContentPuzzle.base_puzzle_id)
+        .where(ContentPuzzle.id.in_(list(puzzle_ids)))
+        .where(MasterBasePuzzle.board.is_not(None))
+    ).all()
+    cells = {row.id: [] for row in rows}
+    if cells:
+        for puzzle_id, x, y, z, piece_id in session.execute(
+            select(ContentPuzzleCell.puzzle_id, ContentPuzzleCell.x, ContentPuzzleCell.y, ContentPuzzleCell.z,
+                   ContentPuzzleCell.piece_id)
+            .where(ContentPuzzleCell.puzzle_id.in_(list(cells)))
+        ):
+            cells[puzzle_id].append((x, y, z, piece_id))
+
+    pages = {}
+    for row in rows:
+        board = worksheet_board(row.board, cells[row.id])
+        base_pieces = {chr(value) for value in unpack_board(row.board)[1]} - {EMPTY}
+        pages[row.id] = {
+            "id": row.id, "code": row.code, "title": row.title, "description": row.description,
+            "size": row.name.rsplit("_", 1)[0], "dims": tuple(board[:3]), "board": board,
+            "pieces_to_place": sorted(base_pieces - {piece for *_, piece in cells[row.id]}),
+        }
+    return [pages[puzzle_id] for puzzle_id in puzzle_ids if puzzle_id in pages]
+
+
+def render_worksheets(session, puzzle_ids, out_path, workers=1, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Renders the puzzles to one PDF at out_path. Returns a stats dict
+    (pages, missing, hits, misses, hit_rate, pages_per_sec).
+    """
+    started = time.perf_counter()
+    pages_written = hits = misses = missing = 0
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as f, ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = PdfWriter(f)
+        for start in range(0, len(puzzle_ids), batch_size):
+            batch_ids = puzzle_ids[start:start + batch_size]
+            pages = load_pages(session, batch_ids)
+            missing += len(batch_ids) - len(pages)
+
+            tasks = {}
+            for page in pages:
+                page["key"] = fragment_key(page["board"])
+                tasks.setdefault(page["key"], (page["key"], page["board"]))
+            fragments = {}
+            for key, fragment, hit in executor.map(render_fragment, tasks.values(),
+                                                   chunksize=max(1, len(tasks) // (workers * 4))):
+                fragments[key] = fragment
+                misses += not hit
+            for page in pages:
+                writer.add_page(page_content(page, fragments[page["key"]]))
+            pages_written += len(pages)
+            # A page is a hit unless its board had to be drawn (repeats within a batch are hits too).
+            hits = pages_written - misses
+
+            elapsed = time.perf_counter() - started
+            print(f"PROGRESS: {pages_written}/{len(puzzle_ids)} pages - {pages_written / elapsed:.1f} pages/sec, "
+                  f"cache hit rate {hits / pages_written if pages_written else 0:.0%}")
+        writer.close()
+    os.replace(tmp_path, out_path)
+
+    elapsed = time.perf_counter() - started
+    return {"pages": pages_written, "missing": missing, "hits": hits, "misses": misses,
+            "hit_rate": round(hits / pages_written, 4) if pages_written else 0.0,
+            "pages_per_sec": round(pages_written / elapsed, 1) if elapsed else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render ContentPuzzle worksheets to a PDF.")
+    parser.add_argument("ids", nargs="*", help="Content puzzle ids, one page each in this order.")
+    parser.add_argument("--ids-file", help="File with one puzzle id per line ('-' for stdin).")
+    parser.add_argument("--out", required=True, help="Output PDF path.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Pages per batch.")
+    args = parser.parse_args(argv)
+
+    import uuid
+
+    lines = list(args.ids)
+    if args.ids_file:
+        with (sys.stdin if args.ids_file == "-" else open(args.ids_file)) as f:
+            lines.extend(line.strip() for line in f)
+    try:
+        puzzle_ids = [uuid.UUID(line) for line in lines if line]
+    except ValueError as e:
+        print(f"ERROR: Bad puzzle id: {e}")
+        return 1
+
+    from backend.db import Session, get_session
+
+    try:
+        stats = render_worksheets(get_session(), puzzle_ids, args.out, workers=max(1, args.workers),
+                                  batch_size=args.batch_size)
+    finally:
+        Session.remove()
+    if stats["missing"]:
+        print(f"WARN: {stats['missing']} puzzle id(s) not found or without a board.")
+    print(f"SUCCESS: Wrote {stats['pages']} pages to {args.out} ({stats['pages_per_sec']} pages/sec, "
+          f"cache hit rate {stats['hit_rate']:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# ✅ benchmarks/bench_api.py
+"""
+Read latency through the Flask test client against an imported database:
+single puzzles with a cold and a warm response cache, and a full walk of
+the paginated catalogue.
+"""
+import random
+import time
+
+from benchmarks import common
+
+
+def _fix_sqlite_timestamps(url):
+    # SQLite's CURRENT_TIMESTAMP has no fractional seconds, which breaks the
+    # (created_at, id) keyset comparison against the cursor's ISO timestamp.
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "UPDATE master_base_puzzle SET created_at = created_at || '.000000' WHERE length(created_at) = 19"))
+    engine.dispose()
+
+
+def run(url, samples=200, page_size=100, seed=0):
+    if url.startswith("sqlite"):
+        _fix_sqlite_timestamps(url)
+
+    from backend.api.puzzles import puzzle_cache
+    from backend.app import create_app
+
+    app = create_app({"DATABASE_URL": url})
+    client = app.test_client()
+
+    ids = []
+    cursor = None
+    page_times = []
+    while True:
+        path = f"/puzzles?limit={page_size}" + (f"&after={cursor}" if cursor else "")
+        started = time.perf_counter()
+        response = client.get(path)
+        page_times.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+        body = response.get_json()
+        ids.extend(item["id"] for item in body["items"])
+        cursor = body["next"]
+        if not cursor:
+            break
+
+    rng = random.Random(seed)
+    sample = [rng.choice(ids) for _ in range(samples)]
+    cold, warm = [], []
+    for puzzle_id in sample:
+        puzzle_cache.clear()
+        started = time.perf_counter()
+        client.get(f"/puzzles/{puzzle_id}")
+        cold.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        client.get(f"/puzzles/{puzzle_id}")
+        warm.append(time.perf_counter() - started)
+
+    results = {"api.catalogue_puzzles": len(ids)}
+    results.update(common.latency_summary("api.get_puzzle_cold", cold))
+    results.update(common.latency_summary("api.get_puzzle_warm", warm))
+    results.update(common.latency_summary("api.list_page", page_times))
+    return results
@@ -0,0 +1,54 @@
+# ✅ benchmarks/bench_import.py
+"""
+Import throughput: one solutions file through import_solutions() into an
+empty database. Runs in its own process so the peak RSS is the import's.
+"""
+import contextlib
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks import common
+
+
+def run(url, solutions_path=None, mode="orm", write_cells=True):
+    """
+    Imports solutions_path (default: common.solutions_file(), the solver's
+    full 6x10 output).
+    """
+    solutions_path = solutions_path or common.solutions_file()
+    if url.startswith("sqlite"):
+        common.enable_sqlite_jsonb()
+    from sqlalchemy import create_engine, func, select
+
+    from backend.scripts import solution_data_import as importer
+
+    rss_before = common.peak_rss_mb()
+    json_dir = tempfile.mkdtemp(prefix="bench-import-")
+    size = os.path.basename(solutions_path)[len("solutions_"):-len(".json")]
+    shutil.copy(solutions_path, os.path.join(json_dir, f"solutions_{size}.json"))
+    os.environ["DATABASE_URL"] = url
+    try:
+        started = time.perf_counter()
+        # The importer prints a line per puzzle.
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            importer.import_solutions(json_dir, size, mode=mode, write_cells=write_cells, update_index=False)
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(json_dir, ignore_errors=True)
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        puzzles = connection.scalar(select(func.count()).select_from(importer.MasterBasePuzzle))
+        cells = connection.scalar(select(func.count()).select_from(importer.MasterBasePuzzleCell))
+    engine.dispose()
+
+    return {
+        "import.puzzles": puzzles,
+        "import.seconds": round(elapsed, 3),
+        "import.puzzles_per_sec": round(puzzles / elapsed, 1),
+        "import.rows_per_sec": round((puzzles + cells) / elapsed, 1),
+        "import.peak_rss_mb": common.peak_rss_mb(),
+        "import.rss_growth_mb": round(common.peak_rss_mb() - rss_before, 1),
+    }
@@ -0,0 +1,29 @@
+# ✅ benchmarks/bench_solver.py
+"""
+Full enumeration time of the bitboard solver.
+"""
+import time
+
+from benchmarks import common  # noqa: F401  (puts the repo root on sys.path)
+
+EXPECTED_SOLUTIONS = {"6x10": 2339, "5x4x3": 3940}
+
+
+def run(sizes=("6x10", "5x4x3"), workers=1):
+    from backend.solver import Solver
+    from backend.solver.parallel import count_parallel
+
+    results = {}
+    for size in sizes:
+        started = time.perf_counter()
+        if workers > 1:
+            count, _ = count_parallel(size, workers=workers)
+        else:
+            count = Solver(size).count()
+        elapsed = time.perf_counter() - started
+        expected = EXPECTED_SOLUTIONS.get(size)
+        if expected is not None and count != expected:
+            raise RuntimeError(f"{size}: found {count} solutions, expected {expected}")
+        results[f"solver.{size}_seconds"] = round(elapsed, 3)
+        results[f"solver.{size}_solutions_per_sec"] = round(count / elapsed, 1)
+    return results
@@ -0,0 +1,61 @@
+# ✅ benchmarks/bench_startup.py
+"""
+Cold start of an app worker: a fresh interpreter imports backend.app,
+builds the app (which preloads the master data) and answers its first
+catalogue page and puzzle. Timed from outside, so interpreter start-up
+counts too; that is what a new gunicorn worker pays before serving.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks import common
+
+# A new worker should serve its first request well under a second.
+TARGET_MS = float(os.environ.get("STARTUP_TARGET_MS", 1000))
+
+
+def _child(url):
+    started = time.perf_counter()
+    from backend.app import create_app
+    imported = time.perf_counter()
+
+    if url.startswith("sqlite"):
+        common.enable_sqlite_jsonb()
+    app = create_app({"DATABASE_URL": url})
+    created = time.perf_counter()
+
+    client = app.test_client()
+    page = client.get("/puzzles?limit=1").get_json()
+    if page["items"]:
+        client.get(f"/puzzles/{page['items'][0]['id']}")
+    served = time.perf_counter()
+    print(json.dumps({
+        "startup.import_ms": round((imported - started) * 1000, 1),
+        "startup.create_app_ms": round((created - imported) * 1000, 1),
+        "startup.first_requests_ms": round((served - created) * 1000, 1),
+    }))
+
+
+def run(url, repeats=5):
+    """
+    Median over `repeats` fresh interpreters.
+    """
+    totals, parts = [], []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", url], cwd=common.ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        totals.append(time.perf_counter() - started)
+        parts.append(json.loads(output.strip().splitlines()[-1]))
+
+    results = {"startup.first_response_ms": round(common.percentile(totals, 0.5) * 1000, 1)}
+    for name in parts[0]:
+        results[name] = common.percentile([part[name] for part in parts], 0.5)
+    return results
+
+
+if __name__ == "__main__":
+    _child(sys.argv[1])
@@ -0,0 +1,162 @@
+# ✅ benchmarks/check_query_plans.py
+"""
+Query-plan regression check for the board-load and listing queries.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.check_query_plans
+
+Runs EXPLAIN (FORMAT JSON) on each statement with enable_seqscan off, so
+the planner only picks a sequential scan when no index can answer the
+query, and exits with 1 if any plan scans a whole table. Needs a migrated
+PostgreSQL database; it only reads. The statements are built from the same
+SQLAlchemy code the API and scripts use wherever that code exposes them.
+
+Also reports how well the cell tables follow their CLUSTER index
+(pg_stats.correlation of the puzzle id); re-CLUSTER when it drops.
+"""
+import argparse
+import os
+import sys
+import uuid
+from datetime import datetime
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks import common  # noqa: F401  (puts the repo root on sys.path)
+
+MIN_CORRELATION = 0.9
+
+
+def statements():
+    """
+    [(label, statement, index-only expected)] with placeholder parameters;
+    the plans do not depend on the rows existing.
+    """
+    from sqlalchemy import select, tuple_
+
+    from backend.api.puzzles import _catalogue, cells_query, content_cells_query
+    from backend.models.content_puzzle import ContentPuzzle
+    from backend.models.content_puzzle_cell import ContentPuzzleCell
+    from backend.models.master_base_puzzle import MasterBasePuzzle
+    from backend.models.master_base_puzzle_cell import MasterBasePuzzleCell
+
+    ids = [uuid.uuid4() for _ in range(3)]
+    after = (datetime(2024, 1, 1), ids[0])
+    size_prefix = MasterBasePuzzle.name.like(r"6x10\_%", escape="\\")
+    return [
+        ("board cells (1 puzzle)", cells_query(ids[:1]), True),
+        ("board cells (page)", cells_query(ids), True),
+        ("puzzle by id", select(MasterBasePuzzle).where(MasterBasePuzzle.id == ids[0]), False),
+        ("puzzle by name", select(MasterBasePuzzle.id).where(MasterBasePuzzle.name == "6x10_0001")
+         .order_by(MasterBasePuzzle.created_at, MasterBasePuzzle.id).limit(1), False),
+        ("puzzle names of a size", select(MasterBasePuzzle.name).where(size_prefix), False),
+        ("catalogue first page", _catalogue().limit(101), False),
+        ("catalogue next page", _catalogue()
+         .where(tuple_(MasterBasePuzzle.created_at, MasterBasePuzzle.id) > after).limit(101), False),
+        ("base puzzles by difficulty", select(MasterBasePuzzle.id)
+         .where(MasterBasePuzzle.solver_nodes.between(100, 1000))
+         .order_by(MasterBasePuzzle.solver_nodes, MasterBasePuzzle.id).limit(100), False),
+        ("content puzzles by difficulty", select(ContentPuzzle.id)
+         .where(ContentPuzzle.solver_nodes.between(100, 1000))
+         .order_by(ContentPuzzle.solver_nodes, ContentPuzzle.id).limit(100), False),
+        ("content puzzles of a base puzzle", select(ContentPuzzle.id)
+         .where(ContentPuzzle.base_puzzle_id == ids[0]), False),
+        ("content puzzles of a difficulty", select(ContentPuzzle.id)
+         .where(ContentPuzzle.difficulty_id == ids[0]).limit(100), False),
+        ("content board cells", content_cells_query(ids), True),
+        ("content catalogue first page", _catalogue(ContentPuzzle).limit(101), False),
+        ("content catalogue next page", _catalogue(ContentPuzzle)
+         .where(tuple_(ContentPuzzle.created_at, ContentPuzzle.id) > after).limit(101), False),
+        ("base cells of a piece", select(MasterBasePuzzleCell.id).where(MasterBasePuzzleCell.value == "X"), False),
+        ("content cells of a piece", select(ContentPuzzleCell.id).where(ContentPuzzleCell.piece_id == "X"), False),
+    ]
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def explain(connection, statement):
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    params = {name: str(value) if isinstance(value, uuid.UUID) else value
+              for name, value in compiled.params.items()}
+    return connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()[0]["Plan"]
+
+
+def describe(node):
+    text = node["Node Type"]
+    if "Index Name" in node:
+        text += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        text += f" on {node['Relation Name']}"
+    return text
+
+
+def check(connection):
+    """
+    Returns the number of plans that contain a sequential scan.
+    """
+    from sqlalchemy import text
+
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    failures = 0
+    for label, statement, index_only in statements():
+        nodes = list(plan_nodes(explain(connection, statement)))
+        scans = [node for node in nodes if "Relation Name" in node]
+        summary = "; ".join(describe(node) for node in scans)
+        if any(node["Node Type"] == "Seq Scan" for node in nodes):
+            failures += 1
+            print(f"ERROR: {label}: {summary}")
+            continue
+        if index_only and not all(node["Node Type"] == "Index Only Scan" for node in scans):
+            # Correct, but the visibility map is stale; VACUUM the table.
+            print(f"WARN: {label}: not index-only: {summary}")
+            continue
+        print(f"INFO: {label}: {summary}")
+    return failures
+
+
+def check_clustering(connection):
+    from sqlalchemy import text
+
+    rows = connection.execute(text(
+        "SELECT tablename, attname, correlation FROM pg_stats "
+        "WHERE (tablename, attname) IN (('master_base_puzzle_cell', 'base_puzzle_id'), "
+        "('content_puzzle_cell', 'puzzle_id'))"
+    ))
+    for table, column, correlation in rows:
+        if correlation is None or abs(correlation) < MIN_CORRELATION:
+            print(f"WARN: {table}.{column} correlation {correlation}; run CLUSTER {table};")
+        else:
+            print(f"INFO: {table}.{column} correlation {correlation:.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail when core queries plan a sequential scan.")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                        help="Migrated PostgreSQL database (default: DATABASE_URL).")
+    args = parser.parse_args(argv)
+    if not args.database_url or not args.database_url.startswith("postgresql"):
+        print("ERROR: A PostgreSQL --database-url (or DATABASE_URL) is required.")
+        return 2
+
+    from sqlalchemy import create_engine
+
+    engine = create_engine(args.database_url)
+    try:
+        with engine.begin() as connection:
+            failures = check(connection)
+            check_clustering(connection)
+    finally:
+        engine.dispose()
+    if failures:
+        print(f"ERROR: {failures} quer{'y' if failures == 1 else 'ies'} fell back to a sequential scan")
+        return 1
+    print("SUCCESS: No sequential scans")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
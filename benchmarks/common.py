@@ -0,0 +1,118 @@
+# ✅ benchmarks/common.py
+"""
+Shared setup for the benchmark suite: a throwaway database and small
+measurement helpers.
+"""
+import contextlib
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+BENCH_DIR = os.path.join(ROOT, "var", "bench")
+# Size of the importer benchmark's input (solutions_file()).
+BENCH_SIZE = "6x10"
+
+
+def solutions_file(size=BENCH_SIZE):
+    """
+    A solutions_<size>.json holding every solution of a size, written by the
+    bitboard solver on first use and kept under var/bench; UTF-16 with a BOM
+    and indented like solver.rb's output. For 6x10 that is 2339 distinct
+    boards (about 5 s to generate), so the import benchmark measures real
+    inserts rather than duplicate skipping.
+    """
+    path = os.path.join(BENCH_DIR, f"solutions_{size}.json")
+    if not os.path.exists(path):
+        from backend.solver import Solver
+
+        solver = Solver(size)
+        solutions = [solver.to_pieces(solution) for solution in solver.solve()]
+        os.makedirs(BENCH_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-16") as f:
+            json.dump(solutions, f, indent=2)
+        os.replace(tmp_path, path)
+    return path
+
+
+def enable_sqlite_jsonb():
+    """
+    Lets the PostgreSQL-typed models create their tables on SQLite
+    (master_piece.shape_json is JSONB).
+    """
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.ext.compiler import compiles
+
+    @compiles(JSONB, "sqlite")
+    def _jsonb_on_sqlite(type_, compiler, **kw):
+        return "JSON"
+
+
+def schema_metadata():
+    from backend.models.all import Base
+
+    return Base.metadata
+
+
+@contextlib.contextmanager
+def throwaway_database(url=None):
+    """
+    Yields the URL of an empty database with the schema created. With
+    `url` (an otherwise unused PostgreSQL database) the tables are dropped
+    again afterwards; without it a temporary SQLite file is used.
+    """
+    from sqlalchemy import create_engine
+
+    workdir = None
+    if url is None:
+        enable_sqlite_jsonb()
+        workdir = tempfile.mkdtemp(prefix="bench-db-")
+        url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    metadata = schema_metadata()
+    engine = create_engine(url)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    engine.dispose()
+    try:
+        yield url
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+        else:
+            engine = create_engine(url)
+            metadata.drop_all(engine)
+            engine.dispose()
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MiB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def latency_summary(prefix, seconds):
+    """
+    p50/p95 in milliseconds of a list of durations in seconds.
+    """
+    return {
+        f"{prefix}_p50_ms": round(percentile(seconds, 0.50) * 1000, 3),
+        f"{prefix}_p95_ms": round(percentile(seconds, 0.95) * 1000, 3),
+    }
@@ -0,0 +1,175 @@
+# ✅ benchmarks/run.py
+"""
+Benchmark suite for the import, read API, worker start-up and solver hot paths.
+
+    python -m benchmarks.run                          # SQLite in a temp dir
+    python -m benchmarks.run --database-url postgresql://...  # throwaway PostgreSQL database
+    python -m benchmarks.run --only solver --solver-sizes 6x10
+    python -m benchmarks.run --save-baseline          # record the reference numbers
+
+Results are written as JSON (--out) and compared with the baseline file
+(benchmarks/baseline.json, committed): a metric more than --threshold
+worse than its baseline fails the run.
+Metrics ending in _per_sec are better when higher, all others (seconds,
+milliseconds, MiB) when lower. Baselines are only comparable on the same
+machine and database, so record one per environment.
+
+The worker start-up time also has an absolute target (STARTUP_TARGET_MS,
+1000): a cold start slower than that fails the run with or without a
+baseline.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks import bench_api, bench_import, bench_solver, bench_startup, common
+
+BENCHMARKS = ("import", "api", "startup", "solver")
+DEFAULT_OUT = os.path.join(common.ROOT, "benchmarks", "results", "latest.json")
+DEFAULT_BASELINE = os.path.join(common.ROOT, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.10
+# Counts and sizes that describe the run rather than its speed.
+INFORMATIONAL = ("import.puzzles", "api.catalogue_puzzles")
+
+
+def higher_is_better(name):
+    return name.endswith("_per_sec")
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns [(name, baseline, current, change)] for the metrics that got
+    worse by more than `threshold` (0.10 = 10 %).
+    """
+    regressions = []
+    for name, before in sorted(baseline.items()):
+        now = results.get(name)
+        if now is None or name in INFORMATIONAL or not before:
+            continue
+        change = (now - before) / before
+        worse = -change if higher_is_better(name) else change
+        if worse > threshold:
+            regressions.append((name, before, now, change))
+    return regressions
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=common.ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(only, database_url=None, solutions_path=None, import_mode="orm",
+              solver_sizes=("6x10", "5x4x3"), solver_workers=1):
+    results = {}
+    if only & {"import", "api", "startup"}:
+        # Generated here, so the solver's memory does not count as the import's.
+        solutions_path = solutions_path or common.solutions_file()
+        with common.throwaway_database(database_url) as url:
+            # A fresh interpreter per import keeps the peak RSS the import's own.
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                imported = executor.submit(bench_import.run, url, solutions_path, import_mode).result()
+            print(f"BENCH: import {imported['import.puzzles']} puzzles in {imported['import.seconds']} sec")
+            if "import" in only:
+                results.update(imported)
+            if "api" in only:
+                results.update(bench_api.run(url))
+                print("BENCH: api done")
+            if "startup" in only:
+                results.update(bench_startup.run(url))
+                print("BENCH: startup done")
+    if "solver" in only:
+        results.update(bench_solver.run(solver_sizes, solver_workers))
+        print("BENCH: solver done")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--only", default=",".join(BENCHMARKS),
+                        help=f"Comma-separated subset of {', '.join(BENCHMARKS)}.")
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"),
+                        help="Throwaway PostgreSQL database; its tables are dropped. Default: SQLite.")
+    parser.add_argument("--solutions",
+                        help="Solutions file to import (default: the solver's full 6x10 output, "
+                             "generated once under var/bench).")
+    parser.add_argument("--import-mode", default="orm", choices=("orm", "copy"),
+                        help="Importer mode ('copy' needs PostgreSQL).")
+    parser.add_argument("--solver-sizes", default="6x10,5x4x3", help="Comma-separated solver sizes.")
+    parser.add_argument("--solver-workers", type=int, default=1, help="Processes for the solver runs.")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="Where to write the results JSON.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results JSON.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a metric counts as a regression (0.10 = 10%%).")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline too.")
+    args = parser.parse_args(argv)
+
+    only = {name.strip() for name in args.only.split(",") if name.strip()}
+    unknown = only - set(BENCHMARKS)
+    if unknown:
+        print(f"ERROR: Unknown benchmark(s): {', '.join(sorted(unknown))}")
+        return 2
+
+    started = time.time()
+    results = run_suite(only, args.database_url, args.solutions, args.import_mode,
+                        tuple(size.strip() for size in args.solver_sizes.split(",") if size.strip()),
+                        args.solver_workers)
+    report = {
+        "meta": {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": (args.database_url or "sqlite").split(":", 1)[0],
+        },
+        "results": results,
+    }
+    for name, value in sorted(results.items()):
+        print(f"BENCH: {name} = {value}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"INFO: Results written to {args.out}")
+
+    startup_ms = results.get("startup.first_response_ms")
+    if startup_ms is not None and startup_ms > bench_startup.TARGET_MS:
+        print(f"ERROR: Worker start-up took {startup_ms} ms, target {bench_startup.TARGET_MS:.0f} ms")
+        return 1
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"INFO: Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"WARN: No baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("database") != report["meta"]["database"]:
+        print("WARN: The baseline was recorded on a different database; comparing anyway.")
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    for name, before, now, change in regressions:
+        print(f"ERROR: Regression in {name}: {before} -> {now} ({change:+.1%})")
+    if regressions:
+        return 1
+    print(f"SUCCESS: No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,15 +23,8 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-from backend.models.base import Base
-from backend.models.master_user import MasterUser
-from backend.models.master_difficulty import MasterDifficulty
-from backend.models.master_puzzle_type import MasterPuzzleType
-from backend.models.master_piece import MasterPiece
-from backend.models.master_base_puzzle import MasterBasePuzzle
-from backend.models.master_base_puzzle_cell import MasterBasePuzzleCell
-from backend.models.content_puzzle import ContentPuzzle
-from backend.models.content_puzzle_cell import ContentPuzzleCell
+from backend.db import create_db_engine
+from backend.models.all import Base
 
 target_metadata = Base.metadata
 
@@ -72,9 +65,10 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
+    # DATABASE_URL wins over alembic.ini so migrations hit the same database
+    # as the app and the importer.
+    connectable = create_db_engine(
+        os.environ.get("DATABASE_URL") or config.get_main_option("sqlalchemy.url"),
         poolclass=pool.NullPool,
     )
 
@@ -0,0 +1,57 @@
+"""Add packed board to master_base_puzzle
+
+Revision ID: 0c7f16c55a4a
+Revises: 3156aa11c8f9
+Create Date: 2026-10-17 11:02:37.104822
+
+"""
+import itertools
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.board import board_dims, pack_board, solution_from_cells
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7f16c55a4a'
+down_revision: Union[str, Sequence[str], None] = '3156aa11c8f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def backfill_board() -> None:
+    """Pack the existing master_base_puzzle_cell rows into master_base_puzzle.board."""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT p.id, p.name, c.x, c.y, c.z, c.value "
+        "FROM master_base_puzzle p "
+        "JOIN master_base_puzzle_cell c ON c.base_puzzle_id = p.id "
+        "ORDER BY p.id"
+    ))
+
+    update = sa.text("UPDATE master_base_puzzle SET board = :board WHERE id = :id")
+    batch = []
+    for (puzzle_id, name), cells in itertools.groupby(rows, key=lambda row: (row[0], row[1])):
+        solution = solution_from_cells((x, y, z, value) for _, _, x, y, z, value in cells)
+        board = pack_board(solution, board_dims(name.rsplit("_", 1)[0], solution))
+        batch.append({"id": puzzle_id, "board": board})
+        if len(batch) >= BATCH_SIZE:
+            bind.execute(update, batch)
+            batch = []
+    if batch:
+        bind.execute(update, batch)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('master_base_puzzle', sa.Column('board', sa.LargeBinary(), nullable=True))
+    backfill_board()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('master_base_puzzle', 'board')
@@ -0,0 +1,63 @@
+"""Add solution_hash to master_base_puzzle
+
+Revision ID: 3156aa11c8f9
+Revises: f02efb69dbe2
+Create Date: 2026-10-17 10:12:04.518330
+
+"""
+import itertools
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.board import board_dims, canonical_fingerprint, solution_from_cells
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3156aa11c8f9'
+down_revision: Union[str, Sequence[str], None] = 'f02efb69dbe2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def backfill_solution_hash() -> None:
+    """Fingerprint the puzzles imported so far; later duplicates keep NULL."""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT p.id, p.name, c.x, c.y, c.z, c.value "
+        "FROM master_base_puzzle p "
+        "JOIN master_base_puzzle_cell c ON c.base_puzzle_id = p.id "
+        "ORDER BY p.created_at, p.id"
+    ))
+
+    update = sa.text("UPDATE master_base_puzzle SET solution_hash = :solution_hash WHERE id = :id")
+    seen = set()
+    batch = []
+    for (puzzle_id, name), cells in itertools.groupby(rows, key=lambda row: (row[0], row[1])):
+        solution = solution_from_cells((x, y, z, value) for _, _, x, y, z, value in cells)
+        solution_hash = canonical_fingerprint(solution, board_dims(name.rsplit("_", 1)[0], solution))
+        if solution_hash in seen:
+            continue
+        seen.add(solution_hash)
+        batch.append({"id": puzzle_id, "solution_hash": solution_hash})
+        if len(batch) >= BATCH_SIZE:
+            bind.execute(update, batch)
+            batch = []
+    if batch:
+        bind.execute(update, batch)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('master_base_puzzle', sa.Column('solution_hash', sa.String(length=64), nullable=True))
+    backfill_solution_hash()
+    op.create_index(op.f('ix_master_base_puzzle_solution_hash'), 'master_base_puzzle', ['solution_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_master_base_puzzle_solution_hash'), table_name='master_base_puzzle')
+    op.drop_column('master_base_puzzle', 'solution_hash')
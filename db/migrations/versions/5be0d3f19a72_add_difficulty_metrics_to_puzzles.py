@@ -0,0 +1,42 @@
+"""Add solver difficulty metrics to content_puzzle and master_base_puzzle
+
+Revision ID: 5be0d3f19a72
+Revises: a41e2d7c9b15
+Create Date: 2026-10-17 16:02:11.904215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5be0d3f19a72'
+down_revision: Union[str, Sequence[str], None] = 'a41e2d7c9b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('content_puzzle', 'master_base_puzzle'):
+        op.add_column(table, sa.Column('solver_nodes', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('solver_solutions', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('branching_factor', sa.Float(), nullable=True))
+        op.add_column(table, sa.Column('forced_moves', sa.SmallInteger(), nullable=True))
+        op.add_column(table, sa.Column('metrics_version', sa.SmallInteger(), nullable=True))
+        op.create_index(f'ix_{table}_solver_nodes_id', table, ['solver_nodes', 'id'], unique=False)
+    op.add_column('content_puzzle', sa.Column('metrics_updated_at', sa.TIMESTAMP(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('content_puzzle', 'metrics_updated_at')
+    for table in ('master_base_puzzle', 'content_puzzle'):
+        op.drop_index(f'ix_{table}_solver_nodes_id', table_name=table)
+        op.drop_column(table, 'metrics_version')
+        op.drop_column(table, 'forced_moves')
+        op.drop_column(table, 'branching_factor')
+        op.drop_column(table, 'solver_solutions')
+        op.drop_column(table, 'solver_nodes')
@@ -0,0 +1,40 @@
+"""Add import_manifest
+
+Revision ID: 8d3b61f0c2e4
+Revises: 5be0d3f19a72
+Create Date: 2026-10-17 17:40:26.518903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3b61f0c2e4'
+down_revision: Union[str, Sequence[str], None] = '5be0d3f19a72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('import_manifest',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('file_name', sa.String(length=255), nullable=False),
+    sa.Column('size', sa.String(length=32), nullable=False),
+    sa.Column('file_hash', sa.String(length=64), nullable=False),
+    sa.Column('last_index', sa.Integer(), server_default='-1', nullable=False),
+    sa.Column('total_solutions', sa.Integer(), nullable=True),
+    sa.Column('completed', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('file_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('import_manifest')
@@ -0,0 +1,28 @@
+"""Add (created_at, id) index to master_base_puzzle
+
+Revision ID: a41e2d7c9b15
+Revises: 0c7f16c55a4a
+Create Date: 2026-10-17 13:21:48.310562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41e2d7c9b15'
+down_revision: Union[str, Sequence[str], None] = '0c7f16c55a4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_master_base_puzzle_created_at_id', 'master_base_puzzle', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_master_base_puzzle_created_at_id', table_name='master_base_puzzle')
@@ -0,0 +1,28 @@
+"""Add (created_at, id) index to content_puzzle
+
+Revision ID: b8f1d2e6a043
+Revises: e4b9c0a7d213
+Create Date: 2026-10-17 23:12:07.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f1d2e6a043'
+down_revision: Union[str, Sequence[str], None] = 'e4b9c0a7d213'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_content_puzzle_created_at_id', 'content_puzzle', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_content_puzzle_created_at_id', table_name='content_puzzle')
@@ -0,0 +1,69 @@
+"""Add FK and covering indexes, cluster the cell tables
+
+Revision ID: c7e2a9d41f58
+Revises: 8d3b61f0c2e4
+Create Date: 2026-10-17 19:12:53.271046
+
+Every foreign key gets an index (lookups and ON DELETE CASCADE no longer
+scan the referencing table), master_base_puzzle.name gets a pattern index
+for by-name lookups and the importer's "<size>_%" prefix scans, and the cell
+tables get (puzzle id) INCLUDE (x, y, z, piece) indexes so a board loads with
+an index-only scan. On PostgreSQL the cell tables are then clustered on those
+indexes so the cells of one board share a few heap pages.
+
+CLUSTER takes an ACCESS EXCLUSIVE lock and rewrites the table; rows added
+later are not kept in order, so re-run `CLUSTER master_base_puzzle_cell;`
+(the index is remembered) after large imports.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a9d41f58'
+down_revision: Union[str, Sequence[str], None] = '8d3b61f0c2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FK_INDEXES = [
+    ('ix_master_base_puzzle_puzzle_type_id', 'master_base_puzzle', ['puzzle_type_id']),
+    ('ix_master_base_puzzle_author_id', 'master_base_puzzle', ['author_id']),
+    ('ix_content_puzzle_base_puzzle_id', 'content_puzzle', ['base_puzzle_id']),
+    ('ix_content_puzzle_difficulty_id', 'content_puzzle', ['difficulty_id']),
+    ('ix_content_puzzle_puzzle_type_id', 'content_puzzle', ['puzzle_type_id']),
+    ('ix_content_puzzle_author_id', 'content_puzzle', ['author_id']),
+    ('ix_master_base_puzzle_cell_value', 'master_base_puzzle_cell', ['value']),
+    ('ix_content_puzzle_cell_piece_id', 'content_puzzle_cell', ['piece_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in FK_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    op.create_index('ix_master_base_puzzle_name', 'master_base_puzzle', ['name'], unique=False,
+                    postgresql_ops={'name': 'varchar_pattern_ops'})
+    op.create_index('ix_master_base_puzzle_cell_board', 'master_base_puzzle_cell', ['base_puzzle_id'],
+                    unique=False, postgresql_include=['x', 'y', 'z', 'value'])
+    op.create_index('ix_content_puzzle_cell_board', 'content_puzzle_cell', ['puzzle_id'],
+                    unique=False, postgresql_include=['x', 'y', 'z', 'piece_id'])
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CLUSTER master_base_puzzle_cell USING ix_master_base_puzzle_cell_board')
+        op.execute('CLUSTER content_puzzle_cell USING ix_content_puzzle_cell_board')
+        op.execute('ANALYZE master_base_puzzle_cell')
+        op.execute('ANALYZE content_puzzle_cell')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE master_base_puzzle_cell SET WITHOUT CLUSTER')
+        op.execute('ALTER TABLE content_puzzle_cell SET WITHOUT CLUSTER')
+    op.drop_index('ix_content_puzzle_cell_board', table_name='content_puzzle_cell')
+    op.drop_index('ix_master_base_puzzle_cell_board', table_name='master_base_puzzle_cell')
+    op.drop_index('ix_master_base_puzzle_name', table_name='master_base_puzzle')
+    for name, table, _ in reversed(FK_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,42 @@
+"""Add import_shard
+
+Revision ID: e4b9c0a7d213
+Revises: c7e2a9d41f58
+Create Date: 2026-10-17 21:05:41.630218
+
+Checkpoints of the solution ranges a --workers import splits a file into,
+so an interrupted parallel import resumes each range where it stopped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9c0a7d213'
+down_revision: Union[str, Sequence[str], None] = 'c7e2a9d41f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('import_shard',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('manifest_id', sa.UUID(), nullable=False),
+    sa.Column('start', sa.Integer(), nullable=False),
+    sa.Column('stop', sa.Integer(), nullable=False),
+    sa.Column('last_index', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['manifest_id'], ['import_manifest.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('manifest_id', 'start', name='uq_import_shard_manifest_id_start')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('import_shard')
@@ -0,0 +1,71 @@
+# ✅ tests/conftest.py
+"""
+Shared fixtures: a throwaway SQLite database holding the first PUZZLES
+6x10 solutions, imported with the real importer, CONTENT_PUZZLES content
+puzzles generated from them, and an app bound to it.
+"""
+import contextlib
+import io
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks import common
+from backend.solver.engine import Solver
+
+PUZZLES = 30
+CONTENT_PUZZLES = 12
+
+
+@pytest.fixture(scope="session")
+def database_url(tmp_path_factory):
+    json_dir = tmp_path_factory.mktemp("solutions")
+    solver = Solver("6x10")
+    solutions = [solver.to_pieces(solution) for solution in solver.solve(limit=PUZZLES)]
+    (json_dir / "solutions_6x10.json").write_text(json.dumps(solutions))
+
+    with common.throwaway_database() as url:
+        from sqlalchemy import create_engine, select
+        from sqlalchemy.orm import Session
+
+        from backend.models.all import ContentPuzzle
+        from backend.scripts import generate_content_puzzles
+        from backend.scripts import solution_data_import as importer
+
+        saved = os.environ.get("DATABASE_URL")
+        os.environ["DATABASE_URL"] = url
+        try:
+            # The importer prints a line per puzzle.
+            with contextlib.redirect_stdout(io.StringIO()):
+                importer.import_solutions(str(json_dir), "6x10", update_index=False)
+                generate_content_puzzles.generate("6x10", "Easy", CONTENT_PUZZLES, workers=1)
+        finally:
+            if saved is None:
+                os.environ.pop("DATABASE_URL")
+            else:
+                os.environ["DATABASE_URL"] = saved
+
+        # SQLite keeps func.now() to the second and compares timestamps as
+        # text; spread created_at out in microseconds so the catalogue order
+        # and its cursors are exact, as they are on PostgreSQL.
+        engine = create_engine(url)
+        with Session(engine) as session:
+            start = datetime(2024, 1, 1, 12, 0, 0, 1)
+            for model, order_by in ((importer.MasterBasePuzzle, "name"), (ContentPuzzle, "code")):
+                puzzles = session.scalars(select(model).order_by(getattr(model, order_by)))
+                for i, puzzle in enumerate(puzzles):
+                    puzzle.created_at = start + timedelta(microseconds=i * 7)
+            session.commit()
+        engine.dispose()
+        yield url
+
+
+@pytest.fixture
+def client(database_url):
+    from backend.api.puzzles import puzzle_cache
+    from backend.app import create_app
+
+    puzzle_cache.clear()
+    return create_app({"DATABASE_URL": database_url}).test_client()
@@ -0,0 +1,85 @@
+# ✅ tests/test_api_catalogue.py
+"""
+Keyset pagination of GET /puzzles and /puzzles/export.
+"""
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from backend.api.puzzles import decode_cursor, encode_cursor
+from tests.conftest import CONTENT_PUZZLES, PUZZLES
+
+
+def test_cursor_round_trip():
+    puzzle = SimpleNamespace(created_at=datetime(2024, 5, 6, 7, 8, 9, 123456), id=uuid.uuid4())
+    assert decode_cursor(encode_cursor(puzzle)) == (puzzle.created_at, puzzle.id)
+
+
+@pytest.mark.parametrize("cursor", ["", "???", "bm90IGEgY3Vyc29y", encode_cursor(
+    SimpleNamespace(created_at=datetime(2024, 1, 1), id="not-a-uuid"))])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_invalid_cursor_is_bad_request(client):
+    assert client.get("/puzzles?after=???").status_code == 400
+
+
+def test_pages_cover_the_catalogue_once(client):
+    ids, after = [], None
+    while True:
+        page = client.get("/puzzles", query_string={"limit": 7, **({"after": after} if after else {})}).get_json()
+        assert len(page["items"]) <= 7
+        ids += [item["id"] for item in page["items"]]
+        after = page["next"]
+        if after is None:
+            break
+    assert len(ids) == len(set(ids)) == PUZZLES
+
+    export = client.get("/puzzles/export")
+    lines = export.get_data(as_text=True).splitlines()
+    export.close()
+    assert [json.loads(line)["id"] for line in lines] == ids
+
+
+def test_content_pages_and_export(client):
+    ids, after = [], None
+    while True:
+        query = {"kind": "content", "limit": 5, **({"after": after} if after else {})}
+        page = client.get("/puzzles", query_string=query).get_json()
+        ids += [item["id"] for item in page["items"]]
+        after = page["next"]
+        if after is None:
+            break
+    assert len(ids) == len(set(ids)) == CONTENT_PUZZLES
+    assert {"code", "title", "base_puzzle_id", "difficulty_id"} <= set(page["items"][0])
+
+    export = client.get("/puzzles/export?kind=content")
+    puzzles = [json.loads(line) for line in export.get_data(as_text=True).splitlines()]
+    export.close()
+    assert [puzzle["id"] for puzzle in puzzles] == ids
+
+    bases = {}
+    for puzzle in puzzles:
+        assert puzzle["dims"] == [6, 10, 1]
+        base = bases.get(puzzle["base_puzzle_id"]) or client.get(f"/puzzles/{puzzle['base_puzzle_id']}").get_json()
+        bases[puzzle["base_puzzle_id"]] = base
+        # The kept cells, grouped per piece, are whole pieces of the base solution.
+        base_pieces = {piece["piece"]: sorted(piece["cells"]) for piece in base["pieces"]}
+        assert puzzle["pieces"] and len(puzzle["pieces"]) < 12
+        for piece in puzzle["pieces"]:
+            assert sorted(piece["cells"]) == base_pieces[piece["piece"]]
+
+    cursor = client.get("/puzzles?kind=content&limit=5").get_json()["next"]
+    resumed = client.get("/puzzles/export", query_string={"kind": "content", "after": cursor})
+    assert [json.loads(line)["id"] for line in resumed.get_data(as_text=True).splitlines()] == ids[5:]
+    resumed.close()
+
+
+def test_unknown_kind(client):
+    assert client.get("/puzzles?kind=nope").status_code == 400
+    assert client.get("/puzzles/export?kind=nope").status_code == 400
@@ -0,0 +1,56 @@
+# ✅ tests/test_api_etag.py
+"""
+Strong ETags and conditional GETs on /puzzles/<id>.
+"""
+import uuid
+
+
+def first_puzzle_id(client):
+    return client.get("/puzzles?limit=1").get_json()["items"][0]["id"]
+
+
+def test_etag_and_not_modified(client):
+    puzzle_id = first_puzzle_id(client)
+
+    response = client.get(f"/puzzles/{puzzle_id}")
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "MISS"
+    etag = response.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith('W/')
+    body = response.get_json()
+    assert body["id"] == puzzle_id and len(body["pieces"]) == 12
+
+    cached = client.get(f"/puzzles/{puzzle_id}")
+    assert cached.headers["X-Cache"] == "HIT"
+    assert cached.headers["ETag"] == etag
+    assert cached.get_data() == response.get_data()
+
+    not_modified = client.get(f"/puzzles/{puzzle_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.get_data() == b""
+    assert not_modified.headers["ETag"] == etag
+
+    listed = client.get(f"/puzzles/{puzzle_id}", headers={"If-None-Match": f'"other", {etag}'})
+    assert listed.status_code == 304
+
+
+def test_stale_etag_gets_body(client):
+    puzzle_id = first_puzzle_id(client)
+    response = client.get(f"/puzzles/{puzzle_id}", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.get_json()["id"] == puzzle_id
+
+
+def test_etag_survives_cache_eviction(client):
+    from backend.api.puzzles import puzzle_cache
+
+    puzzle_id = first_puzzle_id(client)
+    etag = client.get(f"/puzzles/{puzzle_id}").headers["ETag"]
+    puzzle_cache.clear()
+    response = client.get(f"/puzzles/{puzzle_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["X-Cache"] == "MISS"
+
+
+def test_unknown_puzzle(client):
+    assert client.get(f"/puzzles/{uuid.uuid4()}").status_code == 404
@@ -0,0 +1,65 @@
+# ✅ tests/test_api_hints.py
+"""
+Placement validation of POST /puzzles/<id>/hint and POST /puzzles/matching.
+"""
+import pytest
+
+from backend import metrics
+from backend.api.puzzles import hint_cache
+
+I_COLUMN = [[0, y, 0] for y in range(5)]
+# (6, y) aliases (0, y + 1) in the bit layout of a 6x10 board.
+ALIASED_I = [[0, 0, 0], [6, 0, 0], [0, 2, 0], [6, 2, 0], [0, 4, 0]]
+
+BAD_PLACEMENTS = [
+    [{"piece": "I", "cells": ALIASED_I}],
+    [{"piece": "I", "cells": [[10 ** 20, 0, 0]] + I_COLUMN[1:]}],
+    [{"piece": "I", "cells": [[-1, 0, 0]] + I_COLUMN[1:]}],
+    [{"piece": "I", "cells": [[3 * 10 ** 9, 0, 0]] + I_COLUMN[1:]}],
+    [{"piece": "I", "cells": "cells"}],
+    [{"piece": ["I"], "cells": I_COLUMN}],
+    ["I"],
+    {"piece": "I", "cells": I_COLUMN},
+]
+
+
+@pytest.fixture
+def puzzle_id(client):
+    return client.get("/puzzles?limit=1").get_json()["items"][0]["id"]
+
+
+@pytest.mark.parametrize("placements", BAD_PLACEMENTS)
+def test_hint_rejects_bad_placements(client, puzzle_id, placements):
+    hint_cache.clear()
+    response = client.post(f"/puzzles/{puzzle_id}/hint", json={"placements": placements})
+    assert response.status_code == 400
+    assert len(hint_cache) == 0
+
+
+def test_hint_rejects_non_object_body(client, puzzle_id):
+    assert client.post(f"/puzzles/{puzzle_id}/hint", json=[1, 2]).status_code == 400
+
+
+def test_hint_counts_results(client, puzzle_id):
+    def count(result):
+        return metrics.hint_results.values().get((result,), 0)
+
+    solution = client.get(f"/puzzles/{puzzle_id}").get_json()["pieces"]
+    before = count("solution")
+    response = client.post(f"/puzzles/{puzzle_id}/hint", json={"placements": solution[:1]})
+    assert response.status_code == 200
+    assert response.get_json()["source"] == "solution"
+    assert count("solution") == before + 1
+    assert client.get("/puzzles/cache-stats").get_json()["hints"]["results"]["solution"] == before + 1
+
+
+@pytest.mark.parametrize("placements", BAD_PLACEMENTS)
+def test_matching_rejects_bad_placements(client, placements):
+    response = client.post("/puzzles/matching", json={"size": "6x10", "placements": placements})
+    assert response.status_code == 400
+
+
+def test_matching_accepts_legal_placement(client):
+    response = client.post("/puzzles/matching", json={"size": "6x10", "placements": [
+        {"piece": "I", "cells": I_COLUMN}]})
+    assert response.status_code == 200
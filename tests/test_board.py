@@ -0,0 +1,83 @@
+# ✅ tests/test_board.py
+"""
+backend/board.py: canonical fingerprints and packed boards.
+"""
+import itertools
+import random
+
+import pytest
+
+from backend.board import (EMPTY, board_array, board_cells, canonical_fingerprint, pack_board, parse_size,
+                           solution_dims, solution_from_cells, unpack_board)
+from backend.solver.engine import Solver
+
+
+@pytest.fixture(scope="module")
+def solutions():
+    solver = Solver("6x10")
+    return [solver.to_pieces(solution) for solution in solver.solve(limit=2)]
+
+
+def images(solution):
+    """
+    The solution under every rotation/reflection of its box, including the
+    ones that swap width and height, with pieces and cells shuffled.
+    """
+    dims = solution_dims(solution)
+    rng = random.Random(0)
+    for axes in itertools.permutations(range(3)):
+        for flips in itertools.product((False, True), repeat=3):
+            image = []
+            for piece in solution:
+                cells = [[dims[axis] - 1 - cell[axis] if flip else cell[axis] for axis, flip in zip(axes, flips)]
+                         for cell in piece["cells"]]
+                rng.shuffle(cells)
+                image.append({"piece": piece["piece"], "cells": cells})
+            rng.shuffle(image)
+            yield image
+
+
+def test_fingerprint_ignores_symmetry(solutions):
+    solution = solutions[0]
+    expected = canonical_fingerprint(solution)
+    seen_dims = set()
+    for image in images(solution):
+        seen_dims.add(solution_dims(image))
+        assert canonical_fingerprint(image) == expected
+    assert {(6, 10, 1), (10, 6, 1)} <= seen_dims
+
+
+def test_fingerprint_tells_solutions_apart(solutions):
+    assert canonical_fingerprint(solutions[0]) != canonical_fingerprint(solutions[1])
+
+
+def _sorted(solution):
+    return sorted((piece["piece"], sorted(map(tuple, piece["cells"]))) for piece in solution)
+
+
+@pytest.mark.parametrize("size", ["6x10", "5x4x3", "8x8h"])
+def test_packed_board_round_trip(size):
+    solver = Solver(size)
+    solution = solver.to_pieces(solver.first())
+    dims = parse_size(size)
+    packed = pack_board(solution, dims)
+
+    assert len(packed) == 3 + dims[0] * dims[1] * dims[2]
+    assert unpack_board(packed)[0] == dims
+    assert _sorted(solution_from_cells(board_cells(packed))) == _sorted(solution)
+
+    array = board_array(packed)
+    assert array.shape == (dims[2], dims[1], dims[0])
+    for piece in solution:
+        for x, y, z in piece["cells"]:
+            assert chr(array[z, y, x]) == piece["piece"]
+    holes = dims[0] * dims[1] * dims[2] - sum(len(piece["cells"]) for piece in solution)
+    assert (array == ord(EMPTY)).sum() == holes
+
+
+def test_unpack_board_rejects_wrong_length():
+    packed = bytes((6, 10, 1)) + b"F" * 60
+    with pytest.raises(ValueError):
+        unpack_board(packed[:-1])
+    with pytest.raises(ValueError):
+        unpack_board(packed + b"F")
@@ -0,0 +1,72 @@
+# ✅ tests/test_import_manifest.py
+"""
+Manifest and shard bookkeeping of backend/scripts/solution_data_import.py.
+"""
+import json
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from benchmarks import common
+from backend.models.all import ImportShard
+from backend.scripts import solution_data_import as importer
+
+
+@pytest.fixture
+def session():
+    with common.throwaway_database() as url:
+        engine = create_engine(url)
+        with Session(engine) as session:
+            yield session
+        engine.dispose()
+
+
+def write(path, count, piece="I"):
+    path.write_text(json.dumps([[{"piece": piece, "cells": [[0, i, 0]]}] for i in range(count)]))
+    return str(path)
+
+
+def shard_ranges(session, manifest):
+    return session.execute(select(ImportShard.start, ImportShard.stop).where(ImportShard.manifest_id == manifest.id)
+                           .order_by(ImportShard.start)).all()
+
+
+def interrupted_run(session, filepath, serial_progress):
+    """
+    Serial progress up to serial_progress, then a parallel run that planned
+    its shards and stopped.
+    """
+    manifest, _ = importer.open_manifest(session, "6x10", filepath)
+    manifest.last_index = serial_progress
+    session.commit()
+    files = [("6x10", filepath, manifest.id, serial_progress + 1)]
+    importer.plan_shards(session, files, workers=2, min_shard_size=1)
+    return manifest
+
+
+def test_unchanged_file_keeps_its_shards(session, tmp_path):
+    filepath = write(tmp_path / "solutions_6x10.json", 20)
+    manifest = interrupted_run(session, filepath, 9)
+    assert shard_ranges(session, manifest) == [(10, 15), (15, 20)]
+
+    again, done = importer.open_manifest(session, "6x10", filepath)
+    assert (again.id, again.last_index, done) == (manifest.id, 9, False)
+    assert shard_ranges(session, manifest) == [(10, 15), (15, 20)]
+
+
+@pytest.mark.parametrize("serial_progress", [-1, 9])
+def test_changed_file_drops_its_shards(session, tmp_path, serial_progress):
+    filepath = write(tmp_path / "solutions_6x10.json", 20)
+    manifest = interrupted_run(session, filepath, serial_progress)
+    assert shard_ranges(session, manifest)
+
+    write(tmp_path / "solutions_6x10.json", 20, piece="L")
+    restarted, done = importer.open_manifest(session, "6x10", filepath)
+    assert (restarted.id, restarted.last_index, done) == (manifest.id, -1, False)
+    assert shard_ranges(session, manifest) == []
+
+    shards, totals = importer.plan_shards(session, [("6x10", filepath, manifest.id, 0)], workers=2,
+                                          min_shard_size=1)
+    assert totals == {filepath: 20}
+    assert [(shard.start, shard.stop) for shard in shards] == [(0, 10), (10, 20)]
@@ -0,0 +1,45 @@
+# ✅ tests/test_placements.py
+"""
+PlacementIndex.points_to_mask on and off the board.
+"""
+import time
+
+import pytest
+
+from backend.solver.placements import load_index
+
+# An I column at x=0 whose odd cells are given one column past the edge;
+# x*sx + y*sy folds (6, y) onto (0, y + 1).
+ALIASED_I = [[0, 0, 0], [6, 0, 0], [0, 2, 0], [6, 2, 0], [0, 4, 0]]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return load_index("6x10")
+
+
+def test_legal_placement(index):
+    mask = index.points_to_mask(tuple(cell) for cell in ([0, y, 0] for y in range(5)))
+    assert index.find("I", mask) is not None
+    assert index.points_to_mask([(0, 0), (1, 0)]) == index.points_to_mask([(0, 0, 0), (1, 0, 0)])
+
+
+@pytest.mark.parametrize("points", [
+    ALIASED_I,
+    [[0, 10, 0]],
+    [[0, 0, 1]],
+    [[-1, 0, 0]],
+    [[0, -60, 0]],
+    [[10 ** 20, 0, 0]],
+    [[3 * 10 ** 9, 0, 0]],
+    [[0.0, 0, 0]],
+    [[True, 0, 0]],
+    [["0", 0, 0]],
+    [[0]],
+    [[0, 0, 0, 0]],
+])
+def test_off_board_points_are_rejected(index, points):
+    started = time.perf_counter()
+    with pytest.raises(ValueError):
+        index.points_to_mask(tuple(cell) for cell in points)
+    assert time.perf_counter() - started < 0.1
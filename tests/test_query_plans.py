@@ -0,0 +1,31 @@
+# ✅ tests/test_query_plans.py
+"""
+Runs benchmarks/check_query_plans.py against a migrated PostgreSQL
+database; skipped unless DATABASE_URL points at one.
+
+    DATABASE_URL=postgresql://... python -m pytest tests/test_query_plans.py
+"""
+import os
+
+import pytest
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL.startswith("postgresql"),
+                                reason="needs a migrated PostgreSQL DATABASE_URL")
+
+
+def test_core_queries_use_indexes():
+    from sqlalchemy import create_engine
+
+    from benchmarks.check_query_plans import check
+
+    engine = create_engine(DATABASE_URL)
+    try:
+        with engine.connect() as connection, connection.begin() as transaction:
+            failures = check(connection)
+            # check() only reads, but leaves SET LOCAL behind; don't keep it.
+            transaction.rollback()
+    finally:
+        engine.dispose()
+    assert failures == 0
@@ -0,0 +1,60 @@
+# ✅ tests/test_rooms.py
+"""
+Drop validation in backend/realtime/rooms.py.
+"""
+import time
+
+import pytest
+
+from backend.realtime.rooms import Room, blank_room
+
+I_COLUMN = [[0, y, 0] for y in range(5)]
+
+
+@pytest.fixture
+def room():
+    return blank_room("blank:6x10")
+
+
+def test_drop_accepted(room):
+    move, reason = room.drop("p", "I", list(reversed(I_COLUMN)))
+    assert reason is None
+    assert move["piece"] == "I" and sorted(move["cells"]) == I_COLUMN
+    assert room.moves == [move]
+    assert "I" not in room.remaining()
+    assert room.drop("p", "I", [[1, y, 0] for y in range(5)]) == (None, "piece already placed")
+
+
+@pytest.mark.parametrize("cells", [
+    # (6, y) aliases (0, y + 1) in the bit layout.
+    [[0, 0, 0], [6, 0, 0], [0, 2, 0], [6, 2, 0], [0, 4, 0]],
+    [[x, 0, 0] for x in range(4, 9)],
+    [[0, y, 0] for y in range(-1, 4)],
+    [[10 ** 20, 0, 0]] + I_COLUMN[1:],
+    [[3 * 10 ** 9, 0, 0]] + I_COLUMN[1:],
+    [[0, 0, 0.5]] + I_COLUMN[1:],
+    [0, 1, 2, 3, 4],
+    "cells",
+])
+def test_bad_cells_rejected(room, cells):
+    started = time.perf_counter()
+    move, reason = room.drop("p", "I", cells)
+    assert time.perf_counter() - started < 0.1
+    assert (move, reason) == (None, "bad cells")
+    assert room.moves == [] and room.board == room.index.holes and room.used == 0
+
+
+def test_not_a_placement(room):
+    assert room.drop("p", "I", [[0, 0]] * 5) == (None, "not a placement of this piece")
+    assert room.drop("p", "X", I_COLUMN) == (None, "not a placement of this piece")
+
+
+@pytest.mark.parametrize("piece", ["Q", None, ["I"], {"I": 1}])
+def test_unknown_piece(room, piece):
+    assert room.drop("p", piece, I_COLUMN) == (None, "unknown piece")
+
+
+def test_overlap_with_preplaced_cells():
+    room = Room("test", "6x10", [(0, y, 0, "L") for y in range(4)] + [(1, 0, 0, "L")])
+    assert "L" not in room.remaining()
+    assert room.drop("p", "I", I_COLUMN) == (None, "overlaps the board")
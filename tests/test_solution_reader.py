@@ -0,0 +1,76 @@
+# ✅ tests/test_solution_reader.py
+"""
+backend/solution_reader.py on the encodings solutions files come in,
+with chunk sizes small enough to split elements and characters.
+"""
+import codecs
+import json
+
+import pytest
+
+from backend.solution_reader import detect_encoding, iter_solutions, prefetch
+
+SOLUTIONS = [
+    [{"piece": "F", "cells": [[1, 0, 0], [2, 0, 0], [0, 1, 0], [1, 1, 0], [1, 2, 0]]},
+     {"piece": "I", "cells": [[0, 0, 0], [0, 1, 0], [0, 2, 0], [0, 3, 0], [0, 4, 0]]}],
+    [],
+    [{"piece": "X", "cells": [[1, 0, 0], [0, 1, 0], [1, 1, 0], [2, 1, 0], [1, 2, 0]]}],
+    {"piece": "ü", "note": "non-ASCII"},
+    12,
+]
+
+ENCODINGS = [
+    ("utf-8", b""),
+    ("utf-8", codecs.BOM_UTF8),
+    ("utf-16-le", codecs.BOM_UTF16_LE),
+    ("utf-16-be", codecs.BOM_UTF16_BE),
+    ("utf-16-le", b""),
+    ("utf-16-be", b""),
+    ("utf-32-le", codecs.BOM_UTF32_LE),
+    ("utf-32-be", b""),
+]
+
+
+def write(tmp_path, text, encoding, bom=b""):
+    path = tmp_path / "solutions.json"
+    path.write_bytes(bom + text.encode(encoding))
+    return path
+
+
+@pytest.mark.parametrize("encoding, bom", ENCODINGS)
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64 * 1024])
+def test_reads_every_encoding(tmp_path, encoding, bom, chunk_size):
+    path = write(tmp_path, json.dumps(SOLUTIONS, indent=2, ensure_ascii=False), encoding, bom)
+    assert list(iter_solutions(path, chunk_size=chunk_size)) == SOLUTIONS
+
+
+@pytest.mark.parametrize("encoding, bom", ENCODINGS)
+def test_detect_encoding(encoding, bom):
+    head = (bom + "[]".encode(encoding))[:4]
+    assert detect_encoding(head) == (encoding, len(bom))
+
+
+@pytest.mark.parametrize("text", ["", "  ", "{}", "[1, 2", "[1, }", "[[1, 2]"])
+def test_malformed_input(tmp_path, text):
+    path = write(tmp_path, text, "utf-16-le", codecs.BOM_UTF16_LE)
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_solutions(path, chunk_size=3))
+
+
+def test_prefetch_reraises(tmp_path):
+    path = write(tmp_path, "[1, 2, oops]", "utf-8")
+    items = []
+    with pytest.raises(json.JSONDecodeError):
+        for item in prefetch(iter_solutions(path, chunk_size=2), depth=1):
+            items.append(item)
+    assert items == [1, 2]
+
+
+@pytest.mark.parametrize("encoding, bom", ENCODINGS)
+@pytest.mark.parametrize("chunk_size", [1, 5, 64 * 1024])
+def test_resume_from_offsets(tmp_path, encoding, bom, chunk_size):
+    path = write(tmp_path, json.dumps(SOLUTIONS, indent=2, ensure_ascii=False), encoding, bom)
+    offsets = list(iter_solutions(path, chunk_size=chunk_size, with_offsets=True))
+    assert [element for _, element in offsets] == SOLUTIONS
+    for i, (offset, _) in enumerate(offsets):
+        assert list(iter_solutions(path, chunk_size=chunk_size, offset=offset)) == SOLUTIONS[i:]
@@ -0,0 +1,21 @@
+# ✅ tests/test_solver.py
+"""
+Solution counts of the solver against the known pentomino results
+(symmetric solutions counted once).
+"""
+import pytest
+
+from backend.solver.engine import Solver
+
+
+@pytest.mark.parametrize("size, expected", [("3x20", 2), ("5x12", 1010), ("6x10", 2339)])
+def test_count(size, expected):
+    assert Solver(size).count() == expected
+
+
+def test_first_covers_board():
+    solver = Solver("6x10")
+    solution = solver.to_pieces(solver.first())
+    cells = [tuple(cell) for piece in solution for cell in piece["cells"]]
+    assert len(solution) == 12
+    assert sorted(cells) == sorted((x, y, 0) for x in range(6) for y in range(10))
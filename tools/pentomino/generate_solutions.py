@@ -0,0 +1,166 @@
+# ✅ tools/pentomino/generate_solutions.py
+"""
+Regenerates infra/docker/solutions_<size>.json with solver.rb.
+
+Every size is split into one shard per first placement of the anchor piece
+(`solver.rb --shards`); shards run as parallel solver.rb processes that
+stream their solutions to NDJSON files in the work directory. When all
+shards of a size are finished they are merged, deduplicated by canonical
+fingerprint and written as the [[{piece, cells}]] array that
+backend/scripts/solution_data_import.py reads.
+
+An interrupted run resumes: finished shards are skipped and a partial shard
+restarts with --skip for the solutions it already wrote.
+
+    python tools/pentomino/generate_solutions.py --sizes 6x10 5x4x3 8x8h --workers 8
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.board import board_dims, canonical_fingerprint
+
+SOLVER_RB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solver.rb")
+DEFAULT_OUT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "infra", "docker"))
+DEFAULT_WORK_DIR = os.path.join(DEFAULT_OUT_DIR, ".solutions-work")
+
+
+def solver_command(ruby, size, *args):
+    return [ruby, SOLVER_RB, "--size", size, "--every", "0", "--no-windup", *args]
+
+
+def count_shards(ruby, size):
+    output = subprocess.run(solver_command(ruby, size, "--shards"),
+                            check=True, capture_output=True, text=True).stdout
+    m = re.search(r"shards: (\d+)", output)
+    if not m:
+        raise RuntimeError(f"solver.rb --shards printed no shard count for {size}: {output!r}")
+    return int(m.group(1))
+
+
+def shard_paths(work_dir, size, shard):
+    base = os.path.join(work_dir, size, f"shard-{shard:03d}")
+    return base + ".ndjson", base + ".done", base + ".log"
+
+
+def checkpoint_lines(path):
+    """
+    Number of complete solutions in a shard file. A line cut off by an
+    interruption is truncated away so the resumed run can append cleanly.
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb+") as f:
+        data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete != len(data):
+            f.truncate(complete)
+    return data.count(b"\n", 0, complete)
+
+
+def run_shard(ruby, work_dir, size, shard):
+    """
+    Runs (or resumes) one shard. Returns (size, shard, solutions, seconds).
+    """
+    ndjson_path, done_path, log_path = shard_paths(work_dir, size, shard)
+    written = checkpoint_lines(ndjson_path)
+    started = time.perf_counter()
+    with open(log_path, "a") as log:
+        subprocess.run(
+            solver_command(ruby, size, "--shard", str(shard), "--skip", str(written),
+                           "--ndjson-out", ndjson_path),
+            check=True, stdout=log, stderr=subprocess.STDOUT,
+        )
+    elapsed = time.perf_counter() - started
+    solutions = checkpoint_lines(ndjson_path)
+    with open(done_path, "w") as f:
+        json.dump({"solutions": solutions, "seconds": elapsed}, f)
+    return size, shard, solutions, elapsed
+
+
+def merge_shards(work_dir, size, shards, out_path):
+    """
+    Concatenates the shards in order, dropping solutions whose canonical
+    fingerprint was already written. Returns (written, duplicates).
+    """
+    seen = set()
+    written = duplicates = 0
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        out.write("[")
+        for shard in range(shards):
+            ndjson_path, _, _ = shard_paths(work_dir, size, shard)
+            with open(ndjson_path, encoding="utf-8") as f:
+                for line in f:
+                    solution = json.loads(line)
+                    fingerprint = canonical_fingerprint(solution, board_dims(size, solution))
+                    if fingerprint in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(fingerprint)
+                    out.write(",\n" if written else "\n")
+                    json.dump(solution, out, separators=(",", ":"))
+                    written += 1
+        out.write("\n]\n")
+    os.replace(tmp_path, out_path)
+    return written, duplicates
+
+
+def generate(sizes, out_dir, work_dir, workers, ruby="ruby"):
+    plan = {}
+    for size in sizes:
+        os.makedirs(os.path.join(work_dir, size), exist_ok=True)
+        plan[size] = count_shards(ruby, size)
+        print(f"INFO: {size}: {plan[size]} shards")
+
+    pending = {size: set() for size in sizes}
+    tasks = []
+    for size, shards in plan.items():
+        for shard in range(shards):
+            if os.path.exists(shard_paths(work_dir, size, shard)[1]):
+                continue
+            pending[size].add(shard)
+            tasks.append((size, shard))
+    print(f"INFO: {len(tasks)} shard(s) to run on {workers} worker(s)")
+
+    def finish(size):
+        out_path = os.path.join(out_dir, f"solutions_{size}.json")
+        written, duplicates = merge_shards(work_dir, size, plan[size], out_path)
+        print(f"SUCCESS: {size}: {written} solutions written to {out_path}"
+              f" ({duplicates} duplicates dropped)")
+
+    for size in sizes:
+        if not pending[size]:
+            finish(size)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_shard, ruby, work_dir, size, shard) for size, shard in tasks]
+        for future in as_completed(futures):
+            size, shard, solutions, elapsed = future.result()
+            pending[size].discard(shard)
+            print(f"PROGRESS: {size} shard {shard}: {solutions} solutions in {elapsed:.1f} sec")
+            if not pending[size]:
+                finish(size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate solutions_<size>.json files with solver.rb in parallel.")
+    parser.add_argument("--sizes", nargs="+", default=["6x10", "5x4x3", "8x8h"],
+                        help="Board sizes to generate (solver.rb --size values).")
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR,
+                        help="Directory for the merged solutions_<size>.json files.")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR,
+                        help="Directory for the NDJSON shards and checkpoints.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Number of solver.rb processes to run at once.")
+    parser.add_argument("--ruby", default="ruby", help="Ruby interpreter to run solver.rb with.")
+    args = parser.parse_args()
+
+    generate(args.sizes, args.out_dir, args.work_dir, max(1, args.workers), args.ruby)
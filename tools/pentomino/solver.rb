@@ -5,7 +5,7 @@ require 'optparse'
 require 'json'
 
 # default options
-OPT = { size: [5,4,3], every: 1, windup: true, json_out: nil }
+OPT = { size: [5,4,3], every: 1, windup: true, json_out: nil, ndjson_out: nil, shard: nil, skip: 0 }
 
 exit(1) unless ARGV.options {|opt|
   opt.banner =<<EOT
@@ -40,7 +40,11 @@ EOT
   opt.on( '-e', '--every N',
           'display a solution every N times.',
           '(nothing when N=0)' )                { |v| OPT[:every] = v.to_i  }
-  opt.on( '--json-out FILE', 'Write the last solution as pretty-printed JSON to FILE') { |v| OPT[:json_out] = v }
+  opt.on( '--json-out FILE', 'Write all solutions as pretty-printed JSON to FILE') { |v| OPT[:json_out] = v }
+  opt.on( '--ndjson-out FILE', 'Append each solution to FILE as one JSON line') { |v| OPT[:ndjson_out] = v }
+  opt.on( '--shards', 'print the number of first-placement shards' ) { |v| OPT[:shards] = v }
+  opt.on( '--shard K', 'only search below the K-th first placement' ) { |v| OPT[:shard] = v.to_i }
+  opt.on( '--skip N', 'do not output the first N solutions (resume)' ) { |v| OPT[:skip] = v.to_i }
   opt.on( '-i', '--interactive' ) { |v| OPT[:interactive] = v }
   opt.on( '-n', '--[no-]windup' ) { |v| OPT[:windup] = v }
   opt.on( '-p', '--print', 'print piece ID' ) { |v| OPT[:print] = v }
@@ -409,6 +413,13 @@ class Solver
   end   # initialize
 
 
+  # 最初の Piece の配置候補（シャード）
+  def first_figs
+    anchor = @Unused.next
+    anchor.anchor_figs[ @grid.symms ].select{ |fig| @grid.check( fig ) }
+  end
+
+
   def show_solution( figs )
     printf( "\033[%dA", @printed_lines ) if @o[:windup] && @printed_lines != 0
 
@@ -432,14 +443,21 @@ class Solver
     @printed_lines = 0
     @try_count     = 0
     @all_solutions = []
+    ndjson = @o[:ndjson_out] && File.open( @o[:ndjson_out], 'a' )
+    @shard_fig = @o[:shard] && ( first_figs[ @o[:shard] ] or raise "no shard #{@o[:shard]}" )
 
     # 最初のPiece として 座標を持たない Fig を使う
     nil_fig  = Piece[ '@' ].figs_at[0][0]
 
     solve( nil_fig, @grid.symms, [] ) do |solution_figs|
       @solutions += 1
-      @all_solutions << solution_figs.clone # Store a copy
-      
+      @all_solutions << solution_figs.clone if @o[:json_out] # Store a copy
+
+      if ndjson && @solutions > @o[:skip]
+        ndjson.puts( JSON.generate( Solver.to_json_pieces( solution_figs ) ) )
+        ndjson.flush
+      end
+
       if @o[:every] != 0 && ( @solutions % @o[:every] == 0 || @solutions == 1 )
         show_solution( solution_figs )
       end
@@ -451,10 +469,23 @@ class Solver
 ",
             delim3(@solutions), Time.now - @start_time,
             delim3(@try_count) )
+    ndjson.close if ndjson
     return @all_solutions
   end
 
 
+  def self.to_json_pieces( figs )
+    figs.map do |fig|
+      # Skip the dummy piece
+      next if fig.pc.id == '@'
+      {
+        "piece" => fig.pc.id,
+        "cells" => fig.pts
+      }
+    end.compact # remove nil entries
+  end
+
+
   def solve( _fig, _symms = [], current_solution = [], &block )
     @try_count += 1
 
@@ -468,6 +499,8 @@ class Solver
       anchor    = @Unused.next
       @Unused.next = anchor.next # Remove from list
       anchor.anchor_figs[ _symms ].each do |fig|
+        # --shard K : 最初の配置を K 番目の候補に固定する
+        next if @shard_fig && current_solution.size == 1 && fig != @shard_fig
         if @grid.check( fig )
           solve( fig, _symms & fig.symms, current_solution, &block )
         end
@@ -508,19 +541,14 @@ def main
   OPT[:print] ||= true   if OPT[:size][2] != 1
 
   solver = Solver.new( OPT )
+  if OPT[:shards]
+    puts "shards: #{solver.first_figs.size}"
+    return
+  end
   all_solutions = solver.run()
 
   if OPT[:json_out] && all_solutions
-    all_solutions_for_json = all_solutions.map do |solution|
-      solution.map do |fig|
-        # Skip the dummy piece
-        next if fig.pc.id == '@'
-        {
-          "piece" => fig.pc.id,
-          "cells" => fig.pts
-        }
-      end.compact # remove nil entries
-    end
+    all_solutions_for_json = all_solutions.map { |solution| Solver.to_json_pieces( solution ) }
 
     File.open(OPT[:json_out], "w") do |f|
       f.write(JSON.pretty_generate(all_solutions_for_json))